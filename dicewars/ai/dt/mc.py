@@ -0,0 +1,184 @@
+import logging
+import math
+import random
+import time
+
+from ..utils import BATTLE_WIN_PROBABILITY_ROWS
+
+from dicewars.client.ai_driver import BattleCommand, EndTurnCommand
+
+
+class AI:
+    """Agent using Monte-Carlo (MC) rollouts
+
+    Every candidate move is evaluated by simulated continuations of the game,
+    played out on the board by its forward model. The rest of the turn of the
+    agent and the following turns of all opponents are played by the Strength
+    Difference Checking policy of dt.sdc, battles are decided by their exact
+    probabilities. Rollouts are spread over candidates by the UCB1 rule and the
+    most explored candidate is played.
+
+    The search is anytime, it stops when a share of the remaining time runs out,
+    or after a fixed number of rollouts, which makes the agent independent of
+    the speed of the machine. Rollouts draw from a generator seeded from the
+    global one, i.e. by the seed of the client.
+    """
+    time_share = 0.1
+    max_time = 1.0
+    max_rollouts = None
+    exploration = 0.5
+    horizon = 1
+    clock = staticmethod(time.perf_counter)
+
+    def __init__(self, player_name, board, players_order):
+        """
+        Parameters
+        ----------
+        player_name : int
+        board : Board
+        players_order : list of int
+
+        Attributes
+        ----------
+        time_share : float
+            Share of the remaining time spent on a single move
+        max_time : float
+            Longest time spent on a single move, in seconds
+        max_rollouts : int
+            Number of rollouts per move, the time is not watched if set
+        exploration : float
+            Exploration constant of UCB1
+        horizon : int
+            Number of rounds of all players simulated after the current turn
+        clock : callable
+            Source of time in seconds
+        """
+        self.player_name = player_name
+        self.players_order = players_order
+        self.logger = logging.getLogger('AI')
+        self.rng = random.Random(random.getrandbits(64))
+
+    def ai_turn(self, board, nb_moves_this_turn, nb_turns_this_game, time_left):
+        """AI agent's turn
+
+        Candidates are ending the turn and attacks which the SDC policy would consider,
+        i.e. on areas with at most as many dice as the attacker. If there is no such
+        attack, the turn is ended right away.
+        """
+        if self.max_rollouts is None:
+            deadline = self.clock() + min(self.max_time, self.time_share * time_left)
+        self.neighbours = board.topology.neighbours
+        self.area_names = [area.name for area in board.area_list]
+
+        candidates = [None] + self.sdc_attacks(board, self.player_name)
+        if len(candidates) == 1:
+            return EndTurnCommand()
+
+        visits = [0] * len(candidates)
+        values = [0.0] * len(candidates)
+        nb_rollouts = 0
+        while True:
+            if nb_rollouts < len(candidates):
+                i = nb_rollouts
+            else:
+                if self.max_rollouts is not None:
+                    if nb_rollouts >= self.max_rollouts:
+                        break
+                elif self.clock() > deadline:
+                    break
+                log_total = math.log(nb_rollouts)
+                i = max(
+                    range(len(candidates)),
+                    key=lambda j: values[j] / visits[j] + self.exploration * math.sqrt(log_total / visits[j])
+                )
+            values[i] += self.rollout(board, candidates[i])
+            visits[i] += 1
+            nb_rollouts += 1
+
+        best = max(range(len(candidates)), key=lambda j: (visits[j], values[j]))
+        self.logger.debug("Played {} after {} rollouts, visits {}".format(candidates[best], nb_rollouts, visits))
+        if candidates[best] is None:
+            return EndTurnCommand()
+        return BattleCommand(*candidates[best])
+
+    def rollout(self, board, move):
+        """Play out a game from a move and evaluate the reached state
+
+        Parameters
+        ----------
+        board : Board
+        move : (int, int)
+            Names of attacking and attacked areas, None for ending the turn
+
+        Returns
+        -------
+        float
+            Value of the reached state for the agent
+        """
+        mark = len(board.history)
+
+        if move is None:
+            board.apply_end_turn(self.player_name, self.rng)
+        else:
+            self.simulate_battle(board, *move)
+            self.sdc_turn(board, self.player_name)
+
+        start = self.players_order.index(self.player_name)
+        for i in range(1, self.horizon * len(self.players_order) + 1):
+            player = self.players_order[(start + i) % len(self.players_order)]
+            if board.get_player_score(player):
+                self.sdc_turn(board, player)
+
+        value = self.evaluate(board)
+        while len(board.history) > mark:
+            board.undo()
+        return value
+
+    def evaluate(self, board):
+        """Share of the agent on the largest regions of all players, i.e. on reinforcements
+        """
+        scores = [board.get_player_score(player) for player in self.players_order]
+        total = sum(scores)
+        if not total:
+            return 0.0
+        return board.get_player_score(self.player_name) / total
+
+    def sdc_attacks(self, board, player_name):
+        """Attacks on areas with at most as many dice, sorted by the difference of dice
+        """
+        owners = board.owners
+        dice = board.dice
+        attacks = []
+        for name in self.area_names:
+            if owners[name] == player_name and dice[name] >= 2:
+                for neighbour in self.neighbours[name]:
+                    if owners[neighbour] != player_name and dice[neighbour] <= dice[name]:
+                        attacks.append((dice[name] - dice[neighbour], name, neighbour))
+        attacks.sort(reverse=True)
+        return [(source, target) for _, source, target in attacks]
+
+    def sdc_turn(self, board, player_name):
+        """Play the rest of a turn by the SDC policy and end it
+        """
+        owners = board.owners
+        dice = board.dice
+        neighbours = self.neighbours
+        area_names = self.area_names
+
+        while True:
+            best_difference = -1
+            for name in area_names:
+                if owners[name] == player_name and dice[name] >= 2:
+                    for neighbour in neighbours[name]:
+                        if owners[neighbour] != player_name and dice[name] - dice[neighbour] > best_difference:
+                            best_difference = dice[name] - dice[neighbour]
+                            source, target = name, neighbour
+            if best_difference < 0:
+                break
+            self.simulate_battle(board, source, target)
+
+        board.apply_end_turn(player_name, self.rng)
+
+    def simulate_battle(self, board, source, target):
+        win_probability = BATTLE_WIN_PROBABILITY_ROWS[board.dice[source]][board.dice[target]]
+        board.apply_battle(source, target, self.rng.random() < win_probability)
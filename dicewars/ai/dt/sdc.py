@@ -1,7 +1,6 @@
 import logging
-from ..utils import possible_attacks
 
-from dicewars.client.ai_driver import BattleCommand, EndTurnCommand
+from dicewars.client.ai_driver import BattleCommand, EndTurnCommand, TurnPlan
 
 
 class AI:
@@ -30,18 +29,52 @@ class AI:
         difference. The list is then sorted in descending order with respect to
         the SD. A move with the highest SD is then made unless the highest
         SD is lower than zero - in this case, the agent ends its turn.
+
+        The whole turn is planned at once, see plan_turn().
+        """
+        return TurnPlan(self.plan_turn(board), replan_on_loss=False)
+
+    def plan_turn(self, board):
+        """Make the moves of the turn, keeping the possible attacks up to date
+
+        After every battle, only attacks from and on the areas which took part
+        in it are updated, instead of listing all attacks on the board again.
+        Ties of the SD are broken in the order of possible_attacks().
         """
+        owners = board.owners
+        dice = board.dice
+        positions = {area.get_name(): i for i, area in enumerate(board.area_list)}
 
-        attacks = []
-        for source, target in possible_attacks(board, self.player_name):
-            area_dice = source.get_dice()
-            strength_difference = area_dice - target.get_dice()
-            attack = [source.get_name(), target.get_name(), strength_difference]
-            attacks.append(attack)
+        attacks = {}
+        for area in board.get_player_border(self.player_name):
+            self.add_attacks(attacks, board, area, positions)
 
-        attacks = sorted(attacks, key=lambda attack: attack[2], reverse=True)
+        while True:
+            best = None
+            for (source, target), position in attacks.items():
+                strength_difference = dice[source] - dice[target]
+                if strength_difference >= 0 and (best is None or (strength_difference, -position) > best[0]):
+                    best = ((strength_difference, -position), (source, target))
 
-        if attacks and attacks[0][2] >= 0:
-            return BattleCommand(attacks[0][0], attacks[0][1])
+            if best is None:
+                yield EndTurnCommand()
+                return
 
-        return EndTurnCommand()
+            source, target = best[1]
+            won = yield BattleCommand(source, target)
+            board.apply_battle(source, target, won)
+
+            for attack in list(attacks):
+                if attack[0] == source or (won and attack[1] == target):
+                    del attacks[attack]
+            if won and owners[target] == self.player_name:
+                self.add_attacks(attacks, board, board.get_area(target), positions)
+
+    def add_attacks(self, attacks, board, area, positions):
+        """Add attacks from an area, keyed by their position in the order of possible_attacks()
+        """
+        if not area.can_attack():
+            return
+        for i, neighbour in enumerate(area.get_adjacent_areas()):
+            if board.owners[neighbour] != self.player_name:
+                attacks[(area.get_name(), neighbour)] = positions[area.get_name()] * len(positions) + i
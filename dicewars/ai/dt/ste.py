@@ -1,6 +1,7 @@
 import logging
-from ..utils import possible_attacks
-from ..utils import probability_of_holding_area, probability_of_successful_attack
+import numpy
+
+from ..utils import BATTLE_WIN_PROBABILITY, probability_of_holding_areas
 
 from dicewars.client.ai_driver import BattleCommand, EndTurnCommand
 
@@ -50,14 +51,16 @@ class AI:
         It includes all moves that either have hold probability higher or equal to 20 %
         or have strength of eight dice.
         """
-        turns = []
-
-        for source, target in possible_attacks(self.board, self.player_name):
-            area_name = source.get_name()
-            atk_power = source.get_dice()
-            atk_prob = probability_of_successful_attack(self.board, area_name, target.get_name())
-            hold_prob = atk_prob * probability_of_holding_area(self.board, target.get_name(), atk_power - 1, self.player_name)
-            if hold_prob >= 0.2 or atk_power == 8:
-                turns.append([area_name, target.get_name(), hold_prob])
+        sources, targets = self.board.get_possible_attacks(self.player_name)
+        dice = numpy.frombuffer(self.board.dice, dtype=numpy.int8)
+        atk_power = dice[sources]
+        atk_prob = BATTLE_WIN_PROBABILITY[atk_power, dice[targets]]
+        hold_prob = atk_prob * probability_of_holding_areas(self.board, targets, atk_power - 1, self.player_name)
+        preferred = (hold_prob >= 0.2) | (atk_power == 8)
 
+        turns = [
+            [area_name, target_name, prob] for area_name, target_name, prob in zip(
+                sources[preferred].tolist(), targets[preferred].tolist(), hold_prob[preferred].tolist()
+            )
+        ]
         return sorted(turns, key=lambda turn: turn[2], reverse=True)
@@ -1,6 +1,7 @@
 import logging
-from ..utils import probability_of_holding_area, probability_of_successful_attack
-from ..utils import possible_attacks
+import numpy
+
+from ..utils import BATTLE_WIN_PROBABILITY, probability_of_holding_areas
 
 from dicewars.client.ai_driver import BattleCommand, EndTurnCommand
 
@@ -71,16 +72,21 @@ class AI:
         the preference of these moves. The list is sorted in descending order with
         respect to preference * hold probability
         """
+        sources, targets = self.board.get_possible_attacks(self.player_name)
+        dice = numpy.frombuffer(self.board.dice, dtype=numpy.int8)
+        atk_power = dice[sources]
+        atk_prob = BATTLE_WIN_PROBABILITY[atk_power, dice[targets]]
+        hold_prob = atk_prob * probability_of_holding_areas(self.board, targets, atk_power - 1, self.player_name)
+        preferred = (hold_prob >= self.treshold) | (atk_power == 8)
+
         turns = []
-        for source, target in possible_attacks(self.board, self.player_name):
-            atk_power = source.get_dice()
-            atk_prob = probability_of_successful_attack(self.board, source.get_name(), target.get_name())
-            hold_prob = atk_prob * probability_of_holding_area(self.board, target.get_name(), atk_power - 1, self.player_name)
-            if hold_prob >= self.treshold or atk_power == 8:
-                preference = hold_prob
-                if source.get_name() in self.largest_region:
-                    preference *= self.score_weight
-                turns.append([source.get_name(), target.get_name(), preference, hold_prob])
+        for area_name, target_name, prob in zip(
+            sources[preferred].tolist(), targets[preferred].tolist(), hold_prob[preferred].tolist()
+        ):
+            preference = prob
+            if area_name in self.largest_region:
+                preference *= self.score_weight
+            turns.append([area_name, target_name, preference, prob])
 
         return sorted(turns, key=lambda turn: turn[2], reverse=True)
 
@@ -97,11 +103,5 @@ class AI:
         int
             Number of areas in the largest region
         """
-        self.largest_region = []
-
-        players_regions = self.board.get_players_regions(self.player_name)
-        max_region_size = max(len(region) for region in players_regions)
-        max_sized_regions = [region for region in players_regions if len(region) == max_region_size]
-
-        self.largest_region = max_sized_regions[0]
-        return max_region_size
+        self.largest_region = self.board.get_largest_region(self.player_name)
+        return len(self.largest_region)
@@ -1,8 +1,7 @@
 import numpy
 import logging
 
-from ..utils import probability_of_successful_attack, sigmoid
-from ..utils import possible_attacks
+from ..utils import BATTLE_WIN_PROBABILITY, adjacency_mask, linear_scores, player_dice, sigmoid
 
 from dicewars.client.ai_driver import BattleCommand, EndTurnCommand
 
@@ -49,7 +48,6 @@ class AI:
             7: numpy.array([0.72382109, -0.39171476, -0.39423241, -0.38390144, -0.38401564, -0.36980703, -0.36138501]),
             8: numpy.array([0.72340846, -0.35936507, -0.38758583, -0.35487285, -0.37616735, -0.37974499, -0.34989554, -0.37451491]),
         }[self.players]
-        numpy.warnings.filterwarnings('ignore')
 
     def ai_turn(self, board, nb_moves_this_turn, nb_turns_this_game, time_left):
         """AI agent's turn
@@ -86,88 +84,53 @@ class AI:
         """Get list of possible turns with the associated improvement
         in estimated win probability. The list is sorted in descending order
         with respect to the improvement.
+
+        Features of all attacks are put in a matrix, a row per attack, and
+        scored at once for both outcomes of the attacks.
         """
-        turns = []
         name = self.player_name
-
-        features = []
-        for p in self.players_order:
-            dice = numpy.log(self.board.get_player_dice(p))
-            if numpy.isinf(dice):
-                dice = 0
-            features.append(dice)
-
-        wp_start = numpy.log(sigmoid(numpy.dot(numpy.array(features), self.weights)))
-
-        end_features = [d for d in features]
-        end_features[0] = numpy.log(self.board.get_player_dice(name) + self.get_score_by_player(name))
-        if numpy.isinf(end_features[0]):
-            end_features[0] = 0
-        wp_end = numpy.log(sigmoid(numpy.dot(numpy.array(end_features), self.weights)))
-        improvement = wp_end - wp_start
-
-        turns.append(['end', 0, improvement])
-
-        for source, target in possible_attacks(self.board, self.player_name):
-            area_name = source.get_name()
-            atk_power = source.get_dice()
-            def_power = target.get_dice()
-            opponent_name = target.get_owner_name()
-            # check whether the attack would expand the largest region
-            increase_score = False
-            if area_name in self.largest_region:
-                increase_score = True
-            else:
-                for n in target.get_adjacent_areas():
-                    if n in self.largest_region:
-                        increase_score = True
-                        break
-
-            a_dice = self.board.get_player_dice(name)
-            a_score = self.get_score_by_player(name)
-            if increase_score:
-                a_score += 1
-
-            atk_dice = {
-                "current": a_dice,
-                "win": a_dice + a_score,
-                "loss": a_dice + a_score - atk_power + 1,
-            }
-
-            d_dice = self.board.get_player_dice(opponent_name)
-            def_dice = {
-                "loss": d_dice,
-                "win": d_dice - def_power,
-            }
-
-            atk_prob = probability_of_successful_attack(self.board, area_name, target.get_name())
-            opponent_idx = self.players_order.index(opponent_name)
-            win_features = [d for d in features]
-            win_features[0] = numpy.log(atk_dice["win"])
-            if numpy.isinf(win_features[0]):
-                win_features[0] = 0
-            win_features[opponent_idx] = numpy.log(def_dice["win"])
-            if numpy.isinf(win_features[opponent_idx]):
-                win_features[opponent_idx] = 0
-
-            loss_features = [d for d in features]
-            loss_features[0] = numpy.log(atk_dice["loss"])
-            if numpy.isinf(loss_features[0]):
-                loss_features[0] = 0
-            loss_features[opponent_idx] = numpy.log(def_dice["loss"])
-            if numpy.isinf(loss_features[opponent_idx]):
-                loss_features[opponent_idx] = 0
-
-            wp_win = sigmoid(numpy.dot(numpy.array(win_features), self.weights))
-            wp_loss = sigmoid(numpy.dot(numpy.array(loss_features), self.weights))
-
-            wp_win = sigmoid(numpy.dot(numpy.array(win_features), self.weights))
-            wp_loss = sigmoid(numpy.dot(numpy.array(loss_features), self.weights))
-            total_prob = (wp_win * atk_prob) + (wp_loss * (1.0 - atk_prob))
-            wp_atk = numpy.log(total_prob)
-
-            improvement = wp_atk - wp_start
-            turns.append([area_name, target.get_name(), improvement])
+        owners = numpy.frombuffer(self.board.owners, dtype=numpy.int8)
+        board_dice = numpy.frombuffer(self.board.dice, dtype=numpy.int8)
+        dice = player_dice(self.board, self.players_order)
+        score = self.get_score_by_player(name)
+
+        features = log_or_zero(dice[self.players_order])
+        end_features = features.copy()
+        end_features[0] = log_or_zero(dice[name] + score)
+        wp_start, wp_end = numpy.log(sigmoid(linear_scores(numpy.array([features, end_features]), self.weights)))
+
+        turns = [['end', 0, wp_end - wp_start]]
+
+        sources, targets = self.board.get_possible_attacks(name)
+        if len(sources):
+            atk_power = board_dice[sources]
+            def_power = board_dice[targets]
+            opponents = owners[targets]
+            # attacks expanding the largest region increase the score
+            a_score = score + adjacency_mask(self.board, self.largest_region)[targets]
+
+            player_index = numpy.zeros(len(dice), dtype=int)
+            player_index[self.players_order] = numpy.arange(len(self.players_order))
+            rows = numpy.arange(len(sources))
+            opponent_columns = player_index[opponents]
+
+            win_features = numpy.repeat(features[None, :], len(sources), axis=0)
+            win_features[:, 0] = log_or_zero(dice[name] + a_score)
+            win_features[rows, opponent_columns] = log_or_zero(dice[opponents] - def_power)
+
+            loss_features = numpy.repeat(features[None, :], len(sources), axis=0)
+            loss_features[:, 0] = log_or_zero(dice[name] + a_score - atk_power + 1)
+            loss_features[rows, opponent_columns] = log_or_zero(dice[opponents])
+
+            atk_prob = BATTLE_WIN_PROBABILITY[atk_power, def_power]
+            wp_win = sigmoid(linear_scores(win_features, self.weights))
+            wp_loss = sigmoid(linear_scores(loss_features, self.weights))
+            improvements = numpy.log(wp_win * atk_prob + wp_loss * (1.0 - atk_prob)) - wp_start
+
+            turns.extend(
+                [source, target, improvement]
+                for source, target, improvement in zip(sources.tolist(), targets.tolist(), improvements.tolist())
+            )
 
         return sorted(turns, key=lambda turn: turn[2], reverse=True)
 
@@ -213,3 +176,19 @@ class AI:
             for area in region:
                 self.largest_region.append(area)
         return max_region_size
+
+
+def log_or_zero(x):
+    """Natural logarithm, zero for zero
+
+    Parameters
+    ----------
+    x : float or numpy.ndarray
+
+    Returns
+    -------
+    float or numpy.ndarray
+    """
+    with numpy.errstate(divide='ignore'):
+        y = numpy.log(x)
+    return numpy.where(numpy.isinf(y), 0.0, y)
@@ -1,8 +1,7 @@
 import numpy
 import logging
 
-from ..utils import probability_of_successful_attack, sigmoid
-from ..utils import possible_attacks
+from ..utils import BATTLE_WIN_PROBABILITY, adjacency_mask, linear_scores, sigmoid
 
 from dicewars.client.ai_driver import BattleCommand, EndTurnCommand
 
@@ -76,47 +75,35 @@ class AI:
     def possible_turns(self):
         """Get list of possible turns with the associated improvement
         in estimated win probability
-        """
-        turns = []
 
-        features = []
-        for p in self.players_order:
-            features.append(self.get_score_by_player(p))
-        win_prob = numpy.log(sigmoid(numpy.dot(numpy.array(features), self.weights)))
+        Features of all attacks are put in a matrix, a row per attack, and
+        scored at once.
+        """
+        score = self.get_score_by_player(self.player_name)
+        features = numpy.full(len(self.players_order), score, dtype=float)
+        win_prob = numpy.log(sigmoid(features @ self.weights))
 
         self.get_largest_region()
 
-        for source, target in possible_attacks(self.board, self.player_name):
-            area_name = source.get_name()
-            atk_power = source.get_dice()
-
-            opponent_name = target.get_owner_name()
-
-            increase_score = False
-            if area_name in self.largest_region:
-                increase_score = True
-            else:
-                for n in target.get_adjacent_areas():
-                    if n in self.largest_region:
-                        increase_score = True
-                        break
-
-            if increase_score or atk_power == 8:
-                atk_prob = numpy.log(probability_of_successful_attack(self.board, area_name, target.get_name()))
-                new_features = []
-                for p in self.players_order:
-                    idx = self.players_order.index(p)
-                    if p == self.player_name:
-                        new_features.append(features[idx] + 1 if increase_score else features[idx])
-                    elif p == opponent_name:
-                        new_features.append(self.get_score_by_player(p, skip_area=target.get_name()))
-                    else:
-                        new_features.append(features[idx])
-                new_win_prob = numpy.log(sigmoid(numpy.dot(numpy.array(new_features), self.weights)))
-                total_prob = new_win_prob + atk_prob
-                improvement = total_prob - win_prob
-                if improvement >= -1:
-                    turns.append([area_name, target.get_name(), improvement])
+        turns = []
+        sources, targets = self.board.get_possible_attacks(self.player_name)
+        if len(sources):
+            board_dice = numpy.frombuffer(self.board.dice, dtype=numpy.int8)
+            atk_power = board_dice[sources]
+            increase_score = adjacency_mask(self.board, self.largest_region)[targets]
+
+            new_features = numpy.repeat(features[None, :], len(sources), axis=0)
+            new_features[:, 0] += increase_score
+            atk_prob = numpy.log(BATTLE_WIN_PROBABILITY[atk_power, board_dice[targets]])
+            improvements = numpy.log(sigmoid(linear_scores(new_features, self.weights))) + atk_prob - win_prob
+
+            considered = (increase_score | (atk_power == 8)) & (improvements >= -1)
+            turns.extend(
+                [source, target, improvement]
+                for source, target, improvement in zip(
+                    sources[considered].tolist(), targets[considered].tolist(), improvements[considered].tolist()
+                )
+            )
 
         return sorted(turns, key=lambda turn: turn[2], reverse=True)
 
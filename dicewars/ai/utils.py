@@ -1,9 +1,83 @@
 import numpy
+from dicewars.client.game.area import Area
 from dicewars.client.game.board import Board
+from dicewars.common.reinforcements import MAX_DICE
 from typing import Iterator, Tuple
 import pickle
 
 
+def battle_tables(max_dice):
+    """Compute exact distributions of sums of dice and probabilities of winning battles
+
+    Parameters
+    ----------
+    max_dice : int
+        Largest number of dice to cover
+
+    Returns
+    -------
+    numpy.ndarray
+        Sums of dice, [n, s] is the probability that n dice show s in total
+    numpy.ndarray
+        Battle outcomes, [a, d] is the probability that a dice beat d dice
+    """
+    die = numpy.ones(7) / 6
+    die[0] = 0.0
+    sums = numpy.zeros((max_dice + 1, 6 * max_dice + 1))
+    sums[0, 0] = 1.0
+    for n in range(1, max_dice + 1):
+        sums[n] = numpy.convolve(sums[n - 1], die)[:6 * max_dice + 1]
+
+    # the attacker wins if it rolls more than the defender, ties go to the defender
+    lower_sums = numpy.cumsum(sums, axis=1) - sums
+    return sums, sums @ lower_sums.T
+
+
+def chain_tables(win_probability):
+    """Compute probabilities of chains of attacks by a single stack of dice
+
+    Parameters
+    ----------
+    win_probability : numpy.ndarray
+        Battle outcomes as given by battle_tables()
+
+    Returns
+    -------
+    numpy.ndarray
+        Chains, [a, d, k] is the probability that a stack of a dice conquers k areas
+        of d dice one after another, it has a - i dice for the attack on the (i+1)-th of them
+    numpy.ndarray
+        Survivors, [a, d, s] is the probability that the attacker has s dice in the attacked
+        area after a battle of a dice against d dice, i.e. a - 1 when it wins and none when it loses
+    """
+    max_dice = len(win_probability) - 1
+    chains = numpy.ones((max_dice + 1, max_dice + 1, max_dice + 1))
+    for k in range(1, max_dice + 1):
+        stacks = numpy.arange(max_dice + 1) - (k - 1)
+        step = numpy.where((stacks >= 2)[:, None], win_probability[numpy.clip(stacks, 0, max_dice)], 0.0)
+        chains[:, :, k] = chains[:, :, k - 1] * step
+
+    survivors = numpy.zeros((max_dice + 1, max_dice + 1, max_dice + 1))
+    for a in range(2, max_dice + 1):
+        survivors[a, :, a - 1] = win_probability[a]
+        survivors[a, :, 0] = 1.0 - win_probability[a]
+    return chains, survivors
+
+
+# [n, s] is the probability that n dice show s in total,
+# [a, d] is the probability that an attack by a dice on d dice succeeds
+DICE_SUM_DISTRIBUTION, BATTLE_WIN_PROBABILITY = battle_tables(MAX_DICE)
+BATTLE_WIN_PROBABILITY_ROWS = BATTLE_WIN_PROBABILITY.tolist()
+
+# [e, d] is the probability that an area of d dice is not conquered by a neighbour of e dice,
+# neighbours with a single die cannot attack and there is no neighbour with none
+HOLD_PROBABILITY = 1.0 - BATTLE_WIN_PROBABILITY
+HOLD_PROBABILITY[:2] = 1.0
+
+# see chain_tables()
+CHAIN_WIN_PROBABILITY, SURVIVING_DICE_PROBABILITY = chain_tables(BATTLE_WIN_PROBABILITY)
+
+
 def sigmoid(a):
     """Logistic sigmoid
 
@@ -20,6 +94,27 @@ def sigmoid(a):
     return 1 / (1 + numpy.exp(-a))
 
 
+def linear_scores(features, weights):
+    """Multiply rows of a feature matrix by weights
+
+    Unlike ``features @ weights``, which rounds differently depending on
+    the position of a row, every row is summed the same way, so that equal
+    features always get equal scores and ties stay ties.
+
+    Parameters
+    ----------
+    features : numpy.ndarray
+        Matrix with a row of features per sample
+    weights : numpy.ndarray
+
+    Returns
+    -------
+    numpy.ndarray
+        Score of every sample
+    """
+    return (features * weights).sum(axis=1)
+
+
 def probability_of_holding_area(board, area_name, area_dice, player_name):
     """Estimate probability of holding an area until next turn
 
@@ -50,6 +145,36 @@ def probability_of_holding_area(board, area_name, area_dice, player_name):
     return probability
 
 
+def probability_of_holding_areas(board, area_names, area_dice, player_names):
+    """Estimate probabilities of holding many areas until next turn at once
+
+    The i-th probability is the one probability_of_holding_area() gives for
+    ``area_names[i]`` with ``area_dice[i]`` dice held by ``player_names[i]``.
+
+    Parameters
+    ----------
+    board : Board
+    area_names : array of int
+    area_dice : array of int or int
+        Numbers of dice of the areas, at most MAX_DICE
+    player_names : array of int or int
+        Owners of the areas
+
+    Returns
+    -------
+    numpy.ndarray
+        Estimated probabilities
+    """
+    owners = numpy.frombuffer(board.owners, dtype=numpy.int8)
+    dice = numpy.frombuffer(board.dice, dtype=numpy.int8)
+    adjacent = board.topology.neighbour_table[numpy.asarray(area_names, dtype=numpy.intp)]
+    # factors of neighbours which cannot attack are ones, so that the products
+    # are the same as the ones of probability_of_holding_area()
+    enemies = owners[adjacent] != numpy.asarray(player_names)[..., None]
+    hold_prob = HOLD_PROBABILITY[dice[adjacent], numpy.asarray(area_dice, dtype=numpy.intp)[..., None]]
+    return numpy.where(enemies, hold_prob, 1.0).prod(axis=1)
+
+
 def probability_of_successful_attack(board, atk_area, target_area):
     """Calculate probability of attack success
 
@@ -72,7 +197,7 @@ def probability_of_successful_attack(board, atk_area, target_area):
 
 
 def attack_succcess_probability(atk, df):
-    """Dictionary with pre-calculated probabilities for each combination of dice
+    """Probability that the attacker rolls a higher sum than the defender
 
     Parameters
     ----------
@@ -85,91 +210,96 @@ def attack_succcess_probability(atk, df):
     -------
     float
     """
-    return {
-        2: {
-            1: 0.83796296,
-            2: 0.44367284,
-            3: 0.15200617,
-            4: 0.03587963,
-            5: 0.00610497,
-            6: 0.00076625,
-            7: 0.00007095,
-            8: 0.00000473,
-        },
-        3: {
-            1: 0.97299383,
-            2: 0.77854938,
-            3: 0.45357510,
-            4: 0.19170096,
-            5: 0.06071269,
-            6: 0.01487860,
-            7: 0.00288998,
-            8: 0.00045192,
-        },
-        4: {
-            1: 0.99729938,
-            2: 0.93923611,
-            3: 0.74283050,
-            4: 0.45952825,
-            5: 0.22044235,
-            6: 0.08342284,
-            7: 0.02544975,
-            8: 0.00637948,
-        },
-        5: {
-            1: 0.99984997,
-            2: 0.98794010,
-            3: 0.90934714,
-            4: 0.71807842,
-            5: 0.46365360,
-            6: 0.24244910,
-            7: 0.10362599,
-            8: 0.03674187,
-        },
-        6: {
-            1: 0.99999643,
-            2: 0.99821685,
-            3: 0.97529981,
-            4: 0.88395347,
-            5: 0.69961639,
-            6: 0.46673060,
-            7: 0.25998382,
-            8: 0.12150697,
-        },
-        7: {
-            1: 1.00000000,
-            2: 0.99980134,
-            3: 0.99466336,
-            4: 0.96153588,
-            5: 0.86237652,
-            6: 0.68516499,
-            7: 0.46913917,
-            8: 0.27437553,
-        },
-        8: {
-            1: 1.00000000,
-            2: 0.99998345,
-            3: 0.99906917,
-            4: 0.98953404,
-            5: 0.94773146,
-            6: 0.84387382,
-            7: 0.67345564,
-            8: 0.47109073,
-        },
-    }[atk][df]
-
-
-def possible_attacks(board: Board, player_name: int) -> Iterator[Tuple[int, int]]:
+    if atk <= MAX_DICE and df <= MAX_DICE:
+        return BATTLE_WIN_PROBABILITY_ROWS[atk][df]
+    return float(battle_tables(max(atk, df))[1][atk, df])
+
+
+def chain_success_probability(atk, defenders):
+    """Probability of conquering areas one after another by a single stack of dice
+
+    The first area is attacked by all ``atk`` dice, every next one from the area
+    conquered last, i.e. by one die less. A stack of a single die cannot attack.
+    Stacks of more than MAX_DICE dice, which do not occur in the game, are
+    computed exactly like by attack_succcess_probability().
+
+    Parameters
+    ----------
+    atk : int
+        Number of dice in the first attacking area
+    defenders : list of int
+        Numbers of dice in the attacked areas, in the order of attacks
+
+    Returns
+    -------
+    float
+    """
+    defenders = numpy.asarray(defenders, dtype=int)
+    stacks = atk - numpy.arange(len(defenders))
+    if len(defenders) and stacks[-1] < 2:
+        return 0.0
+    win_probability = BATTLE_WIN_PROBABILITY
+    largest = max(atk, defenders.max(initial=0))
+    if largest > MAX_DICE:
+        win_probability = battle_tables(largest)[1]
+    return float(numpy.prod(win_probability[stacks, defenders]))
+
+
+def possible_attacks(board: Board, player_name: int) -> Iterator[Tuple[Area, Area]]:
+    """Yield pairs of attacking and attacked Areas
+
+    The attacks come in the order of Board.get_possible_attacks(), which gives
+    them as arrays of names.
+    """
+    owners = board.owners
+    dice = board.dice
+    area_index = board.area_index
     for area in board.get_player_border(player_name):
-        if not area.can_attack():
+        if dice[area.name] < 2:
             continue
+        for adj in area.neighbours:
+            if owners[adj] != player_name:
+                yield (area, area_index[adj])
+
+
+def player_dice(board: Board, players) -> numpy.ndarray:
+    """Get numbers of dice of all players at once
+
+    Parameters
+    ----------
+    board : Board
+    players : list of int
+        Names of players to cover, including those without any areas
 
-        neighbours = area.get_adjacent_areas()
+    Returns
+    -------
+    numpy.ndarray
+        Total dice of players indexed by their names, as floats
+    """
+    owners = numpy.frombuffer(board.owners, dtype=numpy.int8)
+    dice = numpy.frombuffer(board.dice, dtype=numpy.int8)
+    return numpy.bincount(owners, weights=dice, minlength=max(players) + 1)
 
-        for adj in neighbours:
-            adjacent_area = board.get_area(adj)
-            if adjacent_area.get_owner_name() != player_name:
-                yield (area, adjacent_area)
+
+def adjacency_mask(board: Board, area_names) -> numpy.ndarray:
+    """Find areas adjacent to any of given areas
+
+    Parameters
+    ----------
+    board : Board
+    area_names : list of int
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean mask indexed by area names
+    """
+    topology = board.topology
+    given = numpy.zeros(topology.nb_slots, dtype=bool)
+    given[list(area_names)] = True
+    adjacent = numpy.zeros(topology.nb_slots, dtype=bool)
+    adjacent[topology.edge_sources[given[topology.edge_targets]]] = True
+    return adjacent
 
 
 def save_state(f, board, player_name, players_order):
@@ -1,16 +1,23 @@
 import logging
-import torch
-import torch.nn as nn
+import numpy
 from os.path import dirname
 
+try:
+    import torch
+    import torch.nn as nn
+except ImportError:
+    torch = None
+
 from dicewars.client.ai_driver import BattleCommand, EndTurnCommand
 from ..utils import possible_attacks
-from .utils import get_features_client
+from .utils import get_features_batch
 
 class AI:
     def __init__(self, player_name, board, players_order):
         self.player_name = player_name
         self.logger = logging.getLogger('AI')
+        if torch is None:
+            raise ImportError("AI xzaryb00 requires the torch package")
         self.model = nn.Sequential(
             nn.Linear(21, 13),
             nn.PReLU(),
@@ -23,21 +30,20 @@ class AI:
         self.model.eval()
 
     def ai_turn(self, board, nb_moves_this_turn, nb_turns_this_game, time_left):
-        attacks = list(
-            (self.model(torch.tensor(
-                get_features_client(board, attack[0].get_name(), attack[1].get_name())[0]
-            )), attack)
-            for attack in possible_attacks(board, self.player_name)
-        )
-        # for a in attacks:
-        #     print(a[0], get_features_client(board, a[1][0].get_name(), a[1][1].get_name())[0])
-        # P(hold source) > 50%
-        attacks = filter(lambda x: x[0][0] > .4 and x[0][1] > .4, attacks)
-        # sort by P(hold target)
-        attacks = sorted(attacks, key=lambda x: x[0][0] ** 2 * x[0][1], reverse=True)
+        attacks = list(possible_attacks(board, self.player_name))
+        if not attacks:
+            return EndTurnCommand()
+
+        features = get_features_batch(board, [(source.get_name(), target.get_name()) for source, target in attacks])
+        with torch.no_grad():
+            predictions = self.model(torch.from_numpy(features).float()).numpy()
+
+        # P(hold source) > 40% and P(hold target) > 40%
+        acceptable = (predictions[:, 0] > .4) & (predictions[:, 1] > .4)
+        if not acceptable.any():
+            return EndTurnCommand()
 
-        if attacks:
-            attack = attacks[0]
-            # print('Win', attack[0][0].item(), attack[0][1].item())
-            return BattleCommand(attack[1][0].get_name(), attack[1][1].get_name())
-        return EndTurnCommand()
+        # the first of the best attacks, as by a stable sort
+        preference = numpy.where(acceptable, predictions[:, 0] ** 2 * predictions[:, 1], -1)
+        source, target = attacks[int(numpy.argmax(preference))]
+        return BattleCommand(source.get_name(), target.get_name())
@@ -1,11 +1,12 @@
 from dicewars.client.ai_driver import AIDriver
+from dicewars.ai.xzaryb00.training_data import AttacksFile
 
 class RecordingAIDriver(AIDriver):
 
     def __init__(self, game, ai_constructor):
         super().__init__(game, ai_constructor)
         self.attacks = {}
-        self.handle = open('turns.csv', 'a')
+        self.attacks_file = AttacksFile('turns.bin')
 
     def attack(self, atk_name, def_name):
         features = get_features(self.game.board, atk_name, def_name)
@@ -27,10 +28,7 @@ class RecordingAIDriver(AIDriver):
                     a[1][1] = 0
             if (turn_no + self.area_kept_turns) <= self.turns_finished:
                 # Flush too-old attacks
-                for a in attacks:
-                    self.handle.write('%s,%s,%s\n' %
-                        (','.join(str(n) for n in a[0]), a[1][0], a[1][1]))
-                self.handle.flush()
+                self.attacks_file.append(attacks)
             else:
                 # Avoid "dictionary changed size during iteration" exception
                 new_attacks[(turn_no, player)] = attacks
@@ -46,7 +44,7 @@ class RecordingAIDriver(AIDriver):
             elif msg['type'] == 'game_end':
                 # Flush remaining attacks
                 self.age(-1)
-                self.handle.close()
+                self.attacks_file.close()
         except Exception as e:
             print(e)
             raise e
@@ -1,19 +1,21 @@
 from os.path import dirname
 
 from dicewars.server.game.game import Game
+from dicewars.ai.xzaryb00.training_data import AttacksFile
 from dicewars.ai.xzaryb00.utils import get_features
 
 class RecordingGame(Game):
-    def __init__(self, board, area_ownership, players, addr, port, nicknames_order):
-        super().__init__(board, area_ownership, players, addr, port, nicknames_order)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.attacks = {}
-        self.handle = open(dirname(__file__) + '/turns.csv', 'a')
+        self.attacks_file = AttacksFile(dirname(__file__) + '/turns.bin')
         self.turn_counter = 0
 
     def run(self):
         super().run()
         self.turn_counter += len(self.players_order) * 4
         self.flush_attacks()
+        self.attacks_file.close()
 
     def attack(self, atk_name, def_name):
         features = get_features(self.board, atk_name, def_name)
@@ -30,34 +32,19 @@ class RecordingGame(Game):
                 if a[1][1] and a[2][0] != a[2][2].owner_name:
                     a[1][1] = 0
             if target_turn <= self.turn_counter:
-                for a in attacks:
-                    self.handle.write('%s,%s,%s\n' %
-                        (','.join(str(n) for n in a[0]), a[1][0], a[1][1]))
-                self.handle.flush()
+                self.attacks_file.append(attacks)
             else:
                 # Avoid "dictionary changed size during iteration" exception
                 new_attacks[target_turn] = attacks
         self.attacks = new_attacks
 
-    def handle_player_turn(self):
-        self.logger.debug("Handling player {} ({}) turn".format(self.current_player.get_name(), self.current_player.nickname))
-        player = self.current_player.get_name()
-        msg = self.get_message(player)
+    def battle(self, attacker, defender):
+        # Record the attack
+        self.attack(attacker.get_name(), defender.get_name())
+        return super().battle(attacker, defender)
 
-        if msg['type'] == 'battle':
-            self.nb_consecutive_end_of_turns = 0
-            # Record the attack
-            self.attack(msg['atk'], msg['def'])
-            battle = self.battle(self.board.get_area_by_name(msg['atk']), self.board.get_area_by_name(msg['def']))
-            self.summary.add_battle()
-            self.logger.debug("Battle result: {}".format(battle))
-            for p in self.players:
-                self.send_message(self.players[p], 'battle', battle=battle)
-        elif msg['type'] == 'end_turn':
-            # Flush old attacks
-            self.nb_consecutive_end_of_turns += 1
-            self.flush_attacks()
-            self.turn_counter += 1
-            affected_areas = self.end_turn()
-            for p in self.players:
-                self.send_message(self.players[p], 'end_turn', areas=affected_areas)
+    def end_turn(self):
+        # Flush old attacks
+        self.flush_attacks()
+        self.turn_counter += 1
+        return super().end_turn()
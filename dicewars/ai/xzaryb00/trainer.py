@@ -6,9 +6,13 @@ import torch.optim as optim
 from torch.autograd import Variable
 from torch.utils.data import Dataset, DataLoader
 
+from dicewars.ai.xzaryb00.training_data import NB_INPUTS, load_attacks
+
 class AttacksDataset(Dataset):
-    def __init__(self, csv_file):
-        self.data = np.genfromtxt(csv_file, delimiter=',')
+    """Recorded attacks read from the memory-mapped file as they are needed
+    """
+    def __init__(self, path):
+        self.data = load_attacks(path)
 
     def __len__(self):
         return len(self.data)
@@ -16,8 +20,9 @@ class AttacksDataset(Dataset):
     def __getitem__(self, idx):
         if torch.is_tensor(idx):
             idx = idx.tolist()
-        return (torch.from_numpy(self.data[idx, :-2]).float(),
-                torch.from_numpy(self.data[idx, -2:]).float())
+        rows = np.array(self.data[idx])
+        return (torch.from_numpy(rows[..., :NB_INPUTS]),
+                torch.from_numpy(rows[..., NB_INPUTS:]))
 
 def main():
     model = nn.Sequential(
@@ -28,7 +33,7 @@ def main():
         nn.Linear(8, 2),
         nn.Sigmoid(),
     )
-    dataset = AttacksDataset(dirname(__file__) + '/turns.csv')
+    dataset = AttacksDataset(dirname(__file__) + '/turns.bin')
 #    optimizer = optim.Adam(model.parameters())
     optimizer = optim.RMSprop(model.parameters())
     loss_fn = nn.BCELoss()
@@ -0,0 +1,151 @@
+"""Recorded attacks for training the local predictor, in a single memory-mapped file
+
+The file starts with a header holding the numbers of inputs and outputs of the
+predictor, followed by rows of little-endian float32 numbers, one row per
+attack: inputs of get_features() followed by its outputs. Rows are only ever
+appended, each batch of them by a single write, so that several recording
+processes can share a file. The trainer maps the file instead of loading it.
+"""
+import itertools
+import os
+import struct
+import sys
+import tempfile
+
+import numpy
+
+
+MAGIC = b'DWT1'
+HEADER = struct.Struct('<4sHH8x')
+VALUE = numpy.dtype('<f4')
+NB_INPUTS = 21
+NB_OUTPUTS = 2
+
+
+class AttacksFile(object):
+    """Writer appending recorded attacks to a file
+    """
+    def __init__(self, path):
+        """
+        Parameters
+        ----------
+        path : str
+            Path to the file, it is created with its header if it does not exist
+        """
+        self.path = path
+        if not os.path.exists(path):
+            create(path)
+        self.fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+
+    def append(self, attacks):
+        """Append attacks as returned by get_features()
+
+        Parameters
+        ----------
+        attacks : list of tuple
+            Inputs, outputs and helper data of every attack
+        """
+        if not attacks:
+            return
+        rows = numpy.empty((len(attacks), NB_INPUTS + NB_OUTPUTS), dtype=VALUE)
+        rows[:, :NB_INPUTS] = [attack[0] for attack in attacks]
+        rows[:, NB_INPUTS:] = [attack[1] for attack in attacks]
+        self.append_rows(rows)
+
+    def append_rows(self, rows):
+        """Append rows of inputs followed by outputs
+
+        Parameters
+        ----------
+        rows : numpy.ndarray
+        """
+        os.write(self.fd, numpy.ascontiguousarray(rows, dtype=VALUE).tobytes())
+
+    def close(self):
+        os.close(self.fd)
+
+
+def create(path):
+    """Create an empty file with just the header
+
+    The header is written to a temporary file, which is then linked to the path,
+    so that no other process ever sees the file without its header.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        os.write(fd, HEADER.pack(MAGIC, NB_INPUTS, NB_OUTPUTS))
+        os.close(fd)
+        os.link(tmp_path, path)
+    except FileExistsError:
+        pass  # created by another process meanwhile
+    finally:
+        os.unlink(tmp_path)
+
+
+def load_attacks(path):
+    """Map recorded attacks into memory
+
+    Parameters
+    ----------
+    path : str
+
+    Returns
+    -------
+    numpy.ndarray
+        Read-only matrix with a row per attack, inputs followed by outputs
+    """
+    with open(path, 'rb') as f:
+        magic, nb_inputs, nb_outputs = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or (nb_inputs, nb_outputs) != (NB_INPUTS, NB_OUTPUTS):
+        raise ValueError("{} is not a file of recorded attacks".format(path))
+
+    nb_columns = nb_inputs + nb_outputs
+    nb_rows = (os.path.getsize(path) - HEADER.size) // (VALUE.itemsize * nb_columns)
+    if nb_rows == 0:
+        return numpy.empty((0, nb_columns), dtype=VALUE)
+    return numpy.memmap(path, dtype=VALUE, mode='r', offset=HEADER.size, shape=(nb_rows, nb_columns))
+
+
+def convert_csv(csv_path, path, chunk_size=100000):
+    """Convert attacks recorded in the former CSV format, chunk by chunk
+
+    Parameters
+    ----------
+    csv_path : str
+        File with a line of comma-separated inputs and outputs per attack
+    path : str
+        File to write the attacks to, it must not hold any attacks yet
+    chunk_size : int
+        Number of lines to hold in memory at once
+
+    Raises
+    ------
+    ValueError
+        If the file already holds attacks, e.g. converted before
+    """
+    if os.path.exists(path) and len(load_attacks(path)) > 0:
+        raise ValueError("{} already holds attacks, not converting {} into it".format(path, csv_path))
+
+    attacks_file = AttacksFile(path)
+    try:
+        with open(csv_path) as f:
+            while True:
+                lines = list(itertools.islice(f, chunk_size))
+                if not lines:
+                    break
+                attacks_file.append_rows(numpy.loadtxt(lines, delimiter=',', dtype=VALUE, ndmin=2))
+    finally:
+        attacks_file.close()
+
+
+def main():
+    """Convert a CSV file of recorded attacks once: training_data.py turns.csv [turns.bin]
+    """
+    csv_path = sys.argv[1]
+    path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(os.path.dirname(__file__), 'turns.bin')
+    convert_csv(csv_path, path)
+    print('{} attacks in {}'.format(len(load_attacks(path)), path))
+
+
+if __name__ == '__main__':
+    main()
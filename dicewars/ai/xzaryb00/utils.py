@@ -1,6 +1,10 @@
+import numpy
+
 from dicewars.ai.utils import (
+    BATTLE_WIN_PROBABILITY,
     attack_succcess_probability,
-    probability_of_holding_area as probability_of_holding_area_client
+    probability_of_holding_area as probability_of_holding_area_client,
+    probability_of_holding_areas,
 )
 
 def get_features(board, atk_name, def_name):
@@ -58,22 +62,22 @@ def k_neighbors(board, neighborhood_size, start, owner):
     for i in range(neighborhood_size):
         new_areas = set()
         for a in current_areas:
-            for an in board.get_area_by_name(a).adjacent_areas_names:
-                if an not in neighbors and board.get_area_by_name(an).owner_name == owner:
+            for adjacent_area in board.areas[a].adjacent_areas:
+                an = adjacent_area.name
+                if an not in neighbors and adjacent_area.owner_name == owner:
                     neighbors.add(an)
                     new_areas.add(an)
         current_areas = new_areas
     if start in neighbors:
         neighbors.remove(start)
-    return [board.get_area_by_name(i).dice / 8 for i in neighbors]
+    return [board.areas[i].dice / 8 for i in neighbors]
 
 
 def probability_of_holding_area(board, area_name, area_dice, player_name):
     """Copied over from AI utils, adapted for the server"""
     area = board.get_area_by_name(area_name)
     probability = 1.0
-    for adj in area.adjacent_areas_names:
-        adjacent_area = board.get_area_by_name(adj)
+    for adjacent_area in area.adjacent_areas:
         if adjacent_area.get_owner_name() != player_name:
             enemy_dice = adjacent_area.get_dice()
             if enemy_dice == 1:
@@ -147,3 +151,70 @@ def k_neighbors_client(board, neighborhood_size, start, owner):
     if start in neighbors:
         neighbors.remove(start)
     return [board.get_area(i).dice / 8 for i in neighbors]
+
+
+def get_features_batch(board, attacks):
+    """Get inputs of get_features_client() for many attacks at once
+
+    The neighbourhoods of all attacks are found by products with
+    the adjacency matrix of the board instead of per-area searches.
+
+    Parameters
+    ----------
+    board : Board
+        Client board
+    attacks : list of (int, int)
+        Names of the source and the target area of each attack
+
+    Returns
+    -------
+    numpy.ndarray
+        Matrix of shape (len(attacks), 21), a row of features for every attack
+    """
+    owners = numpy.frombuffer(board.owners, dtype=numpy.int8).astype(numpy.int64)
+    dice = numpy.frombuffer(board.dice, dtype=numpy.int8).astype(numpy.int64)
+    nb_slots = len(owners)
+
+    degrees = numpy.diff(board.adjacency_offsets)
+    area_rows = numpy.repeat(numpy.arange(nb_slots), degrees)
+    adjacency = numpy.zeros((nb_slots, nb_slots), dtype=bool)
+    adjacency[area_rows, board.adjacency_names] = True
+
+    sources = numpy.array([attack[0] for attack in attacks], dtype=numpy.int64)
+    targets = numpy.array([attack[1] for attack in attacks], dtype=numpy.int64)
+    atk_owners = owners[sources]
+    def_owners = owners[targets]
+    atk_dice = dice[sources]
+    def_dice = dice[targets]
+    nb_attacks = len(attacks)
+
+    features = numpy.empty((nb_attacks, 21))
+    features[:, 0] = atk_dice / 8
+    features[:, 1] = def_dice / 8
+    features[:, 2] = BATTLE_WIN_PROBABILITY[atk_dice, def_dice]
+
+    # holding the source with all its dice and with one die
+    features[:, 3] = probability_of_holding_areas(board, sources, atk_dice, atk_owners)
+    features[:, 4] = probability_of_holding_areas(board, sources, 1, atk_owners)
+
+    # 1- and 2-neighbourhoods of (source, attacker), (source, defender),
+    # (target, defender) and (target, attacker), stacked one after another
+    starts = numpy.concatenate([sources, sources, targets, targets])
+    owned = owners[None, :] == numpy.concatenate([atk_owners, def_owners, def_owners, atk_owners])[:, None]
+    first = adjacency[starts] & owned
+    second = (first | (first @ adjacency)) & owned
+    second[numpy.arange(len(starts)), starts] = False
+
+    sum_1 = ((first @ dice) / 8).reshape(4, nb_attacks).T
+    sum_2 = ((second @ dice) / 8).reshape(4, nb_attacks).T
+    count_1 = first.sum(axis=1).reshape(4, nb_attacks).T
+    count_2 = second.sum(axis=1).reshape(4, nb_attacks).T
+
+    columns = [5, 6, 9, 10]
+    features[:, columns] = numpy.where(count_1 > 0, sum_1 / numpy.maximum(count_1, 1), 0)
+    ring = count_2 - count_1
+    features[:, [c + 2 for c in columns]] = numpy.where(ring > 0, (sum_2 - sum_1) / numpy.maximum(ring, 1), 0)
+    features[:, [c + 8 for c in columns]] = count_1 / 10
+    features[:, [c + 10 for c in columns]] = count_2 / 10 - count_1 / 10
+
+    return features
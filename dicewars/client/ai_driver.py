@@ -1,5 +1,3 @@
-import copy
-import json
 from json.decoder import JSONDecodeError
 import logging
 import signal
@@ -30,6 +28,54 @@ class EndTurnCommand:
     pass
 
 
+class TurnPlan:
+    """Commands an AI plans to issue one after another in its turn
+
+    The driver keeps taking commands from the plan instead of calling
+    ``ai_turn()`` until the plan is exhausted or a battle of the plan is lost
+    (unless ``replan_on_loss`` is False). The AI is then asked again. The plan
+    is dropped when the turn ends.
+
+    If the commands are given by a generator, the generator receives the
+    outcome of each of its battles (True if the attacker has won) as the
+    value of its ``yield``. It can keep its own state between the moves,
+    e.g. a board updated by ``Board.apply_battle()``, and stop early to have
+    ``ai_turn()`` called again.
+    """
+    def __init__(self, commands, replan_on_loss=True):
+        """
+        Parameters
+        ----------
+        commands : iterable of BattleCommand or EndTurnCommand
+        replan_on_loss : bool
+            Drop the plan when one of its battles is lost
+        """
+        self.commands = iter(commands)
+        self.replan_on_loss = replan_on_loss
+        self.started = False
+
+    def next_command(self, outcome=None):
+        """Get the next planned command
+
+        Parameters
+        ----------
+        outcome : bool
+            Outcome of the previous battle of the plan, None if there was none
+
+        Returns
+        -------
+        BattleCommand or EndTurnCommand
+            None if the plan is exhausted
+        """
+        try:
+            if self.started and hasattr(self.commands, 'send'):
+                return self.commands.send(outcome)
+            self.started = True
+            return next(self.commands)
+        except StopIteration:
+            return None
+
+
 class AIDriver:
     """Basic AI agent implementation
     """
@@ -44,6 +90,10 @@ class AIDriver:
         board : Board
         waitingForResponse : bool
            Indicates whether agent is waiting for a response from the server
+        plan : TurnPlan
+            Commands planned by the AI for the rest of its turn, None if there are none
+        last_outcome : bool
+            Whether the last battle of the AI was won, None if it has not attacked in this turn
         """
         self.logger = logging.getLogger('AI')
         self.game = game
@@ -55,7 +105,7 @@ class AIDriver:
         self.ai_disabled = False
         try:
             with FixedTimer(TIME_LIMIT_CONSTRUCTOR):
-                self.ai = ai_constructor(self.player_name, copy.deepcopy(self.board), copy.deepcopy(self.game.players_order))
+                self.ai = ai_constructor(self.player_name, self.board.snapshot(), list(self.game.players_order))
         except TimeoutError:
             self.logger.error("The AI failed to construct itself in {}s. Disabling it.".format(TIME_LIMIT_CONSTRUCTOR))
             self.ai_disabled = True
@@ -66,6 +116,8 @@ class AIDriver:
         self.waitingForResponse = False
         self.moves_this_turn = 0
         self.turns_finished = 0
+        self.plan = None
+        self.last_outcome = None
 
         self.timer = FischerTimer(FISCHER_INIT, FISCHER_INCREMENT)
 
@@ -82,34 +134,68 @@ class AIDriver:
             except JSONDecodeError:
                 self.logger.error("Invalid message from server.")
                 exit(1)
-            self.current_player_name = game.current_player.get_name()
-            if self.current_player_name == self.player_name and not self.waitingForResponse:
-                if self.ai_disabled:
-                    self.logger.warning("The AI has already misbehaved, just end-turning.")
-                    self.send_message('end_turn')
-                    continue
-
-                try:
-                    with self.timer as time_left:
-                        command = self.ai.ai_turn(
-                            copy.deepcopy(self.board),
-                            self.moves_this_turn,
-                            self.turns_finished,
-                            time_left
-                        )
-                    self.process_command(command)
-                except TimeoutError:
-                    self.logger.warning("Forced 'end_turn' because of timeout")
-                    self.send_message('end_turn')
-                    self.time_left_last_time = -1.0
-                except Exception:
-                    self.logger.error("The AI crashed during attempt to make a move:\n", exc_info=True)
-                    self.send_message('end_turn')
-                    self.ai_disabled = True
-
-                if not self.waitingForResponse:
-                    self.logger.warning("Forced 'end_turn' because the implementation did nothing")
-                    self.send_message('end_turn')
+            if self.is_on_turn():
+                self.make_turn()
+
+    def is_on_turn(self):
+        """Check whether the server waits for a command of this AI
+        """
+        return self.game.current_player.get_name() == self.player_name and not self.waitingForResponse
+
+    def make_turn(self):
+        """Let the AI decide and send its command to the server
+        """
+        if self.ai_disabled:
+            self.logger.warning("The AI has already misbehaved, just end-turning.")
+            self.send_message('end_turn')
+            return
+
+        try:
+            with self.timer as time_left:
+                command = self.continue_plan()
+                if command is None:
+                    command = self.ai.ai_turn(
+                        self.board.snapshot(),
+                        self.moves_this_turn,
+                        self.turns_finished,
+                        time_left
+                    )
+                    if isinstance(command, TurnPlan):
+                        self.plan = command
+                        command = self.plan.next_command() or EndTurnCommand()
+            self.process_command(command)
+        except TimeoutError:
+            self.logger.warning("Forced 'end_turn' because of timeout")
+            self.send_message('end_turn')
+            self.time_left_last_time = -1.0
+        except Exception:
+            self.logger.error("The AI crashed during attempt to make a move:\n", exc_info=True)
+            self.send_message('end_turn')
+            self.ai_disabled = True
+
+        if not self.waitingForResponse:
+            self.logger.warning("Forced 'end_turn' because the implementation did nothing")
+            self.send_message('end_turn')
+
+    def continue_plan(self):
+        """Take the next command from the plan of the AI
+
+        Returns
+        -------
+        BattleCommand or EndTurnCommand
+            None if the AI has to be asked for a new command
+        """
+        if self.plan is None:
+            return None
+
+        if self.last_outcome is False and self.plan.replan_on_loss:
+            command = None
+        else:
+            command = self.plan.next_command(self.last_outcome)
+
+        if command is None:
+            self.plan = None
+        return command
 
     def handle_server_message(self, msg):
         """Process message from the server
@@ -125,16 +211,15 @@ class AIDriver:
             def_data = msg['result']['def']
             attacker = self.game.board.get_area(str(atk_data['name']))
             attacker.set_dice(atk_data['dice'])
-            atk_name = attacker.get_owner_name()
 
             defender = self.game.board.get_area(def_data['name'])
             defender.set_dice(def_data['dice'])
-            def_name = defender.get_owner_name()
 
             if def_data['owner'] == atk_data['owner']:
                 defender.set_owner(atk_data['owner'])
-                self.game.players[atk_name].set_score(msg['score'][str(atk_name)])
-                self.game.players[def_name].set_score(msg['score'][str(def_name)])
+            if atk_data['owner'] == self.player_name:
+                self.last_outcome = def_data['owner'] == atk_data['owner']
+            self.game.update_scores(msg['score'])
 
             self.waitingForResponse = False
 
@@ -148,6 +233,8 @@ class AIDriver:
 
                 area_object.set_owner(owner_name)
                 area_object.set_dice(msg['areas'][area]['dice'])
+            self.game.update_scores(msg['score'])
+            self.game.update_reserves(msg['reserves'])
 
             current_player.deactivate()
             self.game.current_player_name = msg['current_player']
@@ -157,7 +244,7 @@ class AIDriver:
 
         elif msg['type'] == 'game_end':
             self.logger.info("Player {} has won".format(msg['winner']))
-            self.game.socket.close()
+            self.game.close_connection()
             return False
 
         return True
@@ -195,16 +282,13 @@ class AIDriver:
             self.logger.debug("Sending end_turn message.")
             self.moves_this_turn = 0
             self.turns_finished += 1
+            self.plan = None
+            self.last_outcome = None
         else:
             raise RuntimeError("Attempt to send unexpected message type {}".format(type))
 
         self.waitingForResponse = True
-
-        try:
-            self.game.socket.send(str.encode(json.dumps(msg)))
-        except BrokenPipeError:
-            self.logger.error("Connection to server broken.")
-            exit(1)
+        self.game.transmit(msg)
 
     def battle_is_valid(self, battle):
         try:
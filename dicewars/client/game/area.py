@@ -1,28 +1,51 @@
+import copy
 import hexutil
-from typing import List
+from typing import Tuple
 
 
 class Area(object):
     """Game board area
+
+    Neighbours and hexes of the area belong to the topology of the Board,
+    owner and dice to its state, the Area only provides access to them.
     """
-    def __init__(self, name, owner, dice, neighbours, hexes):
+    __slots__ = ('board', 'name', 'neighbours')
+
+    def __init__(self, board, name):
         """
         Parameters
         ----------
+        board : Board
+            Board holding the area
         name : int
-        owner : int
-        dice : int
-        neighbours : list of int
-        hexes : list of list of int
-            Hex coordinates of for all Area's hexes
+
+        Attributes
+        ----------
+        neighbours : tuple of int
+            Names of adjacent areas
         """
+        self.board = board
         self.name = int(name)
-        self.owner_name = int(owner)
-        self.dice = int(dice)
-        self.neighbours = [int(n) for n in neighbours]
-        self.hexes = [[int(i) for i in h] for h in hexes]
+        self.neighbours = board.topology.neighbours[self.name]
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(self.board, memo).area_index[self.name]
+
+    @property
+    def hexes(self):
+        """Hex coordinates of all Area's hexes
+        """
+        return self.board.topology.hexes[self.name]
+
+    @property
+    def owner_name(self) -> int:
+        return self.board.owners[self.name]
+
+    @property
+    def dice(self) -> int:
+        return self.board.dice[self.name]
 
-    def get_adjacent_areas(self) -> List[int]:
+    def get_adjacent_areas(self) -> Tuple[int, ...]:
         """Return names of adjacent areas
         """
         return self.neighbours
@@ -30,7 +53,7 @@ class Area(object):
     def get_dice(self) -> int:
         """Return number of dice in the Area
         """
-        return self.dice
+        return self.board.dice[self.name]
 
     def get_name(self) -> int:
         """Return Area's name
@@ -40,12 +63,12 @@ class Area(object):
     def get_owner_name(self) -> int:
         """Return Area's owner's name
         """
-        return self.owner_name
+        return self.board.owners[self.name]
 
     def can_attack(self) -> bool:
         """Return True if area has enough dice to attack
         """
-        return self.dice >= 2
+        return self.board.dice[self.name] >= 2
 
     def set_dice(self, dice: int) -> None:
         """Set area's dice
@@ -53,12 +76,13 @@ class Area(object):
         if dice < 1 or dice > 8:
             raise ValueError("Attempted to assign {} dice to Area {}".format(dice, self.name))
 
-        self.dice = dice
+        self.board.dice[self.name] = dice
 
     def set_owner(self, name: int) -> None:
         """Set owner name
         """
-        self.owner_name = int(name)
+        self.board.owners[self.name] = int(name)
+        self.board.regions.change_owner(self.name, int(name))
 
     ##############
     # UI METHODS #
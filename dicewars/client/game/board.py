@@ -1,43 +1,166 @@
+from array import array
+import copy
+
+import numpy
+
+from dicewars.common import RegionTracker, distribute_dice, nb_reinforcements
+from dicewars.common.reinforcements import MAX_DICE
+
 from .area import Area
-from typing import List, Optional
+from .state import BoardState
+from .topology import BoardTopology
+from typing import List, Optional, Tuple
 
 
 class Board(object):
     """Game board
+
+    The board is made of its topology, which is immutable and shared by all copies
+    of the board, and of its state, which is copied. Areas only give access to both.
     """
     def __init__(self, areas, board):
         """
         Parameters
         ----------
-        areas : dict of int: list of int
-            Dictionary of game areas and their neighbours
+        areas : dict of str: dict
+            Owner and dice of game areas
         board : dict
             Dictionary describing the game's board
+
+        Attributes
+        ----------
+        topology : BoardTopology
+        state : BoardState
+        areas : dict of str: Area
+            Areas keyed by their names as received from the server
+        area_list : list of Area
+            Areas in the order of the board
+        area_index : dict of int or str: Area
+            Areas keyed by their names, both as integers and strings
+        owners, dice, regions, reserves, history
+            Parts of the state, see BoardState
+        adjacency_offsets, adjacency_names : numpy.ndarray
+            Adjacency arrays of the topology, see BoardTopology
+        """
+        topology = BoardTopology({key: board[key] for key in areas})
+        owners = array('b', [0]) * topology.nb_slots
+        dice = array('b', [0]) * topology.nb_slots
+        for key, area in areas.items():
+            owners[int(key)] = int(area['owner'])
+            dice[int(key)] = int(area['dice'])
+
+        self.set_up(topology, create_state(topology, owners, dice, {}, []))
+
+    def set_up(self, topology, state):
+        """Assemble the board of its topology and state
+
+        Parameters
+        ----------
+        topology : BoardTopology
+        state : BoardState
+        """
+        self.topology = topology
+        self.state = state
+        self.owners = state.owners
+        self.dice = state.dice
+        self.regions = state.regions
+        self.reserves = state.reserves
+        self.history = state.history
+        self.adjacency_offsets = topology.adjacency_offsets
+        self.adjacency_names = topology.adjacency_names
+
+    def __getattr__(self, name):
+        """Create Area objects when they are first needed
+
+        Copies of the board used only through its arrays never create them.
         """
+        if name not in ('area_list', 'areas', 'area_index') or 'topology' not in self.__dict__:
+            raise AttributeError("'Board' object has no attribute '{}'".format(name))
+
+        self.area_list = [Area(self, area_name) for area_name in self.topology.names]
         self.areas = {}
-        for area in areas:
-            self.areas[area] = Area(area, areas[area]['owner'], areas[area]['dice'],
-                                    board[area]['neighbours'], board[area]['hexes'])
+        self.area_index = {}
+        for area in self.area_list:
+            self.areas[str(area.name)] = area
+            self.area_index[area.name] = area
+            self.area_index[str(area.name)] = area
+        return getattr(self, name)
+
+    def __deepcopy__(self, memo):
+        board = self.snapshot()
+        memo[id(self)] = board
+        if 'area_list' in self.__dict__:
+            for area, area_copy in zip(self.area_list, board.area_list):
+                memo[id(area)] = area_copy
+        return board
+
+    def __reduce__(self):
+        state = self.state
+        return (restore_board, (self.topology, state.owners, state.dice, state.reserves, state.history))
+
+    def snapshot(self):
+        """Get an independent copy of the board
+
+        Only the state is copied, the topology is shared with the copy.
+
+        Returns
+        -------
+        Board
+        """
+        board = Board.__new__(Board)
+        board.set_up(self.topology, self.state.copy())
+        return board
 
     def get_area(self, idx: int):
         """Get Area given its name
         """
-        return self.areas[str(idx)]
+        return self.area_index[idx]
 
     def get_player_areas(self, player_name: int) -> List[Area]:
         """Get all Areas belonging to a player
         """
-        return [area for area in self.areas.values() if area.get_owner_name() == player_name]
+        owners = self.owners
+        return [area for area in self.area_list if owners[area.name] == player_name]
 
     def get_player_border(self, player_name: int) -> List[Area]:
         """Get all Areas belonging to a player which border other players' Areas
         """
-        return [area for area in self.get_player_areas(player_name) if self.is_at_border(area)]
+        owners = self.owners
+        foreign_neighbours = self.regions.foreign_neighbours
+        return [
+            area for area in self.area_list
+            if owners[area.name] == player_name and foreign_neighbours[area.name]
+        ]
+
+    def get_possible_attacks(self, player_name: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Get all attacks a player can make
+
+        Returns names of attacking areas and of their targets as two arrays, ordered
+        by attacking areas in the order of the board and then by their neighbours.
+        """
+        owners = numpy.frombuffer(self.owners, dtype=numpy.int8)
+        dice = numpy.frombuffer(self.dice, dtype=numpy.int8)
+        sources = self.topology.edge_sources
+        targets = self.topology.edge_targets
+        possible = (owners[sources] == player_name) & (owners[targets] != player_name) & (dice[sources] >= 2)
+        return sources[possible], targets[possible]
 
     def get_player_dice(self, player_name: int) -> int:
         """Get the number of all dice of a given player
         """
-        return sum([area.get_dice() for area in self.get_player_areas(player_name)])
+        return sum(dice for dice, owner in zip(self.dice, self.owners) if owner == player_name)
+
+    def get_player_score(self, player_name: int) -> int:
+        """Get the size of the largest region of a player
+        """
+        return self.regions.get_score(player_name)
+
+    def get_largest_region(self, player_name: int) -> List[int]:
+        """Get names of areas in the largest region of a player
+
+        Of equally large regions, the one containing the area with the lowest name is returned.
+        """
+        return self.regions.get_largest_region(player_name)
 
     def get_players_regions(self, player_name: int, skip_area: Optional[int] = None) -> List[List[int]]:
         """Get all unbroken regions belonging to a player.
@@ -45,6 +168,9 @@ class Board(object):
         Returns them as a list of regions, where every region a list of names of area in the region.
         If skip_area is given, it is treated as not belonging to the player.
         """
+        if skip_area is None:
+            return self.regions.get_regions(player_name) or [[]]
+
         area_names_to_test = [area.get_name() for area in self.get_player_areas(player_name) if area.get_name() != skip_area]
 
         if not area_names_to_test:
@@ -89,15 +215,129 @@ class Board(object):
         return current_region
 
     def is_at_border(self, area: Area) -> bool:
-        owner = area.get_owner_name()
-        neighbourhood_names = area.get_adjacent_areas()
+        return self.regions.foreign_neighbours[area.name] > 0
+
+    def nb_players_alive(self) -> int:
+        owners = self.owners
+        return len(set(owners[area.name] for area in self.area_list))
 
-        for neighbour_name in neighbourhood_names:
-            neighbour = self.get_area(neighbour_name)
-            if neighbour.get_owner_name() != owner:
-                return True
+    #################
+    # FORWARD MODEL #
+    #################
+    def apply_battle(self, source: int, target: int, outcome: bool) -> None:
+        """Carry out a battle with a known outcome, following the rules of the server
 
-        return False
+        The attacker is left with a single die. If it wins, the target is taken over
+        and gets all other dice of the attacker.
 
-    def nb_players_alive(self) -> int:
-        return len(set(area.get_owner_name() for area in self.areas.values()))
+        Parameters
+        ----------
+        source : int
+            Name of the attacking area
+        target : int
+            Name of the attacked area
+        outcome : bool
+            True if the attacker wins
+        """
+        owners = self.owners
+        dice = self.dice
+        atk_owner = owners[source]
+        def_owner = owners[target]
+        atk_dice = dice[source]
+        def_dice = dice[target]
+
+        if atk_dice < 2 or atk_owner == def_owner or target not in self.area_index[source].neighbours:
+            raise ValueError("Invalid attack from area {} to area {}".format(source, target))
+
+        self.history.append((source, target, atk_dice, def_dice, def_owner))
+
+        dice[source] = 1
+        if outcome:
+            dice[target] = atk_dice - 1
+            owners[target] = atk_owner
+            self.regions.change_owner(target, atk_owner)
+
+    def apply_end_turn(self, player_name: int, rng) -> List[int]:
+        """Distribute reinforcements at the end of a turn, following the rules of the server
+
+        The player gets as many dice as is the size of its largest region plus its
+        reserve, at most 64. They are placed one by one into randomly chosen areas of
+        the player, dice which do not fit anywhere are kept in the reserve.
+
+        Parameters
+        ----------
+        player_name : int
+        rng : random.Random
+            Source of randomness for placing the dice
+
+        Returns
+        -------
+        list of int
+            Names of areas which received dice
+        """
+        dice = self.dice
+        reserve = self.reserves.get(player_name, 0)
+        new_dice = nb_reinforcements(reserve, self.regions.get_score(player_name))
+        areas = [area.name for area in self.get_player_areas(player_name)]
+        added, new_dice = distribute_dice([MAX_DICE - dice[area] for area in areas], new_dice, rng)
+
+        previous_dice = {}
+        for i, nb_added in added.items():
+            area = areas[i]
+            previous_dice[area] = dice[area]
+            dice[area] += nb_added
+
+        self.history.append((player_name, reserve, previous_dice))
+        self.reserves[player_name] = new_dice
+        return list(previous_dice)
+
+    def undo(self) -> None:
+        """Revert the last move applied by apply_battle() or apply_end_turn()
+
+        Raises
+        ------
+        IndexError
+            If there is no move to revert
+        """
+        move = self.history.pop()
+        if len(move) == 3:
+            player_name, reserve, previous_dice = move
+            for area, dice in previous_dice.items():
+                self.dice[area] = dice
+            self.reserves[player_name] = reserve
+        else:
+            source, target, atk_dice, def_dice, def_owner = move
+            self.dice[source] = atk_dice
+            self.dice[target] = def_dice
+            if self.owners[target] != def_owner:
+                self.owners[target] = def_owner
+                self.regions.change_owner(target, def_owner)
+
+
+def create_state(topology, owners, dice, reserves, history):
+    """Create state of a board, setting up its regions
+
+    Parameters
+    ----------
+    topology : BoardTopology
+    owners, dice : array of int
+    reserves : dict of int: int
+    history : list of tuple
+
+    Returns
+    -------
+    BoardState
+    """
+    regions = RegionTracker(
+        {name: topology.neighbours[name] for name in topology.names},
+        {name: owners[name] for name in topology.names},
+    )
+    return BoardState(owners, dice, regions, reserves, history)
+
+
+def restore_board(topology, owners, dice, reserves, history):
+    """Restore a pickled board, its regions are set up again instead of being pickled
+    """
+    board = Board.__new__(Board)
+    board.set_up(topology, create_state(topology, owners, dice, reserves, history))
+    return board
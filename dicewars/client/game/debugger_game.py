@@ -6,16 +6,24 @@ from .player import Player
 class StaticGame(object):
     """Represantation of the game state
     """
-    def __init__(self, f):
+    def __init__(self, player_name, board, current_player_name, players_order):
+        """
+        Parameters
+        ----------
+        player_name : int
+            Player to look at the game as
+        board : Board
+        current_player_name : int
+            Player on turn
+        players_order : list of int
+            Names of players in the order of play
+        """
         self.input_queue = Queue()
-        self.players = {}
 
-        save_game = pickle.load(f)
-
-        self.player_name = save_game['player_name']
-        self.board = save_game['board']
-        self.current_player_name = save_game['current_player_name']
-        self.players_order = save_game['order']
+        self.player_name = player_name
+        self.board = board
+        self.current_player_name = current_player_name
+        self.players_order = players_order
 
         self.players = {i: Player(i, player_score(self.board, i)) for i in self.players_order}
 
@@ -23,6 +31,18 @@ class StaticGame(object):
 
         print("This is player name {}, the players order is {}".format(self.player_name, self.players_order))
 
+    @classmethod
+    def load(cls, f):
+        """Load a game saved by dicewars.ai.utils.save_state()
+
+        Parameters
+        ----------
+        f : file
+            Binary file with the pickled state
+        """
+        save_game = pickle.load(f)
+        return cls(save_game['player_name'], save_game['board'], save_game['current_player_name'], save_game['order'])
+
 
 def player_score(board, player_name):
-    return max([len(r) for r in board.get_players_regions(player_name)])
+    return board.get_player_score(player_name)
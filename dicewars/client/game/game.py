@@ -1,5 +1,3 @@
-import json
-from json.decoder import JSONDecodeError
 import logging
 import socket
 from queue import Queue
@@ -8,12 +6,13 @@ from time import sleep
 from .board import Board
 from .player import Player
 from dicewars.client.socket_listener import SocketListener
+from dicewars.common.protocol import Connection, JSON
 
 
 class Game(object):
     """Represantation of the game state
     """
-    def __init__(self, addr, port, hello_msg):
+    def __init__(self, addr, port, hello_msg, encoding=JSON):
         """
         Parameters
         ----------
@@ -21,10 +20,12 @@ class Game(object):
             Server address
         port : int
             Server port
+        encoding : int
+            Encoding of messages, see dicewars.common.protocol
         """
         self.logger = logging.getLogger('CLIENT')
 
-        self.buffer = 65535
+        self.encoding = encoding
         self.battle_in_progress = False
 
         self.server_address = addr
@@ -43,11 +44,7 @@ class Game(object):
                 i += 1
                 sleep(0.01)
 
-        try:
-            self.socket.send(str.encode(json.dumps(hello_msg)))
-        except BrokenPipeError:
-            self.logger.error("Connection to server broken.")
-            exit(1)
+        self.transmit(hello_msg)
 
         self.start_socket_daemon()
         while self.input_queue.empty():
@@ -56,21 +53,31 @@ class Game(object):
 
         self.logger.debug("Received message: {0}\n".format(msg))  # TODO
         if msg['type'] == 'game_start':
-            self.player_name = msg['player']
-            self.add_players(int(msg['no_players']), msg['score'])
-            self.board = Board(msg['areas'], msg['board'])
-            self.current_player = self.players[msg['current_player']]
-            self.current_player_name = msg['current_player']
-            self.players_order = msg['order']
+            self.init_game_state(msg)
         else:
             self.logger.error("Did not receive game state from server.")
             exit(1)
 
-        self.logger.info("This is player name {}, the players order is {}".format(self.player_name, self.players_order))
-
     ##################
     # INITIALIZATION #
     ##################
+    def init_game_state(self, msg):
+        """Set up players and board from the 'game_start' message
+
+        Parameters
+        ----------
+        msg : dict
+            Message from the server
+        """
+        self.player_name = msg['player']
+        self.add_players(int(msg['no_players']), msg['score'])
+        self.board = Board(msg['areas'], msg['board'])
+        self.current_player = self.players[msg['current_player']]
+        self.current_player_name = msg['current_player']
+        self.players_order = msg['order']
+
+        self.logger.info("This is player name {}, the players order is {}".format(self.player_name, self.players_order))
+
     def add_players(self, number_of_players, score):
         """Create Players instances
         
@@ -85,6 +92,28 @@ class Game(object):
         for i in range(1, number_of_players + 1):
             self.players[i] = Player(i, score[str(i)])
 
+    def update_scores(self, scores):
+        """Set scores of players reported by the server
+
+        Parameters
+        ----------
+        scores : dict of str: int
+            Scores of all players or only of those whose scores have changed
+        """
+        for name, score in scores.items():
+            self.players[int(name)].set_score(score)
+
+    def update_reserves(self, reserves):
+        """Set dice reserves of players reported by the server
+
+        Parameters
+        ----------
+        reserves : dict of str: int
+        """
+        for name, reserve in reserves.items():
+            self.players[int(name)].set_reserve(reserve)
+            self.board.reserves[int(name)] = reserve
+
     ##############
     # NETWORKING #
     ##############
@@ -111,23 +140,38 @@ class Game(object):
             msg = {'type': 'end_turn'}
             self.logger.debug("Sending end_turn message.")
 
+        self.transmit(msg)
+
+    def transmit(self, msg):
+        """Encode message and send it to the server
+
+        Parameters
+        ----------
+        msg : dict
+        """
         try:
-            self.socket.send(str.encode(json.dumps(msg)))
+            self.connection.send(msg)
         except BrokenPipeError:
             self.logger.error("Connection to server broken.")
             exit(1)
 
+    def close_connection(self):
+        """Close the socket connected to the server
+        """
+        self.socket.close()
+
     def init_socket(self):
         """Socket initialization
         """
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.socket.connect((self.server_address, self.server_port))
+        self.connection = Connection(self.socket, self.encoding)
 
     def start_socket_daemon(self):
         """Start message collecting daemon
         """
         self.input_queue = Queue()
-        self.socket_listener = SocketListener(self.socket, self.buffer, self.input_queue)
+        self.socket_listener = SocketListener(self.connection, self.input_queue)
         self.socket_listener.daemon = True
         self.socket_listener.start()
         self.logger.debug("Started socket daemon.")
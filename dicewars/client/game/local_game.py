@@ -0,0 +1,41 @@
+from collections import deque
+import logging
+
+from .game import Game
+
+
+class LocalGame(Game):
+    """Representation of the game state for a client running in the server's process
+
+    Messages for the server are not sent over a socket,
+    they are collected in the outbox instead.
+    """
+    def __init__(self, start_msg):
+        """
+        Parameters
+        ----------
+        start_msg : dict
+            The 'game_start' message from the server
+
+        Attributes
+        ----------
+        outbox : deque of dict
+            Messages waiting to be picked up by the server
+        """
+        self.logger = logging.getLogger('CLIENT')
+
+        self.battle_in_progress = False
+        self.players = {}
+        self.outbox = deque()
+
+        self.init_game_state(start_msg)
+
+    def transmit(self, msg):
+        """Leave message for the server in the outbox
+        """
+        self.outbox.append(msg)
+
+    def close_connection(self):
+        """There is no connection to close
+        """
+        pass
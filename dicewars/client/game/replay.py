@@ -0,0 +1,180 @@
+from array import array
+
+import numpy
+
+from dicewars.common.record import (
+    BATTLE, END_TURN, KIND, NEXT_PLAYER, PLAYER, RESERVE, GameRecordReader, apply_event
+)
+
+from .board import Board, create_state
+from .debugger_game import StaticGame
+from .topology import BoardTopology
+
+
+KEYFRAME_INTERVAL = 32
+
+
+class Replay(object):
+    """Positions of a recorded game, reconstructed without playing it again
+
+    Positions after every KEYFRAME_INTERVAL-th event are kept, any other one
+    is reached by applying at most KEYFRAME_INTERVAL - 1 events to the
+    closest preceding keyframe. Position ``n`` is the one after the first
+    ``n`` events, i.e. position 0 is the start of the game.
+    """
+    def __init__(self, f, keyframe_interval=KEYFRAME_INTERVAL):
+        """Read the whole record and compute keyframes
+
+        Parameters
+        ----------
+        f : file
+            Binary file with the record, see dicewars.common.record
+        keyframe_interval : int
+            Number of events between keyframes
+
+        Attributes
+        ----------
+        record : GameRecordReader
+            Header of the record
+        events : numpy.ndarray
+            All events of the game, a row per event
+        topology : BoardTopology
+            Topology shared by all boards of the replay
+        keyframes : (numpy.ndarray, numpy.ndarray)
+            Owners and dice in positions of keyframes, a row per keyframe
+        current_players : numpy.ndarray
+            Player on turn in every position
+        reserves : numpy.ndarray
+            Reserves of players in every position, indexed by positions and players' names
+        nb_battles : numpy.ndarray
+            Number of battles fought before every position
+        """
+        self.record = GameRecordReader(f)
+        self.events = self.record.read_events()
+        self.keyframe_interval = keyframe_interval
+        self.topology = BoardTopology(self.record.board)
+
+        nb_positions = len(self.events) + 1
+        owners = self.record.owners.copy()
+        dice = self.record.dice.copy()
+        keyframe_owners = numpy.empty((len(self.events) // keyframe_interval + 1, len(owners)), dtype=numpy.int8)
+        keyframe_dice = numpy.empty_like(keyframe_owners)
+        for i, event in enumerate(self.events):
+            if i % keyframe_interval == 0:
+                keyframe_owners[i // keyframe_interval] = owners
+                keyframe_dice[i // keyframe_interval] = dice
+            apply_event(event, owners, dice, self.record.names)
+        if len(self.events) % keyframe_interval == 0:
+            keyframe_owners[-1] = owners
+            keyframe_dice[-1] = dice
+        self.keyframes = (keyframe_owners, keyframe_dice)
+
+        # the player on turn and the reserves change only at ends of turns, they are
+        # forward-filled from them to all positions
+        kinds = self.events[:, KIND]
+        ends_of_turns = numpy.flatnonzero(kinds == END_TURN)
+        last_end_of_turn = numpy.zeros(nb_positions, dtype=numpy.intp)
+        last_end_of_turn[ends_of_turns + 1] = ends_of_turns + 1
+        last_end_of_turn = numpy.maximum.accumulate(last_end_of_turn)
+        next_players = numpy.concatenate(([self.record.players_order[0]], self.events[:, NEXT_PLAYER]))
+        self.current_players = next_players[last_end_of_turn]
+
+        self.reserves = numpy.zeros((nb_positions, self.record.nb_players + 1), dtype=numpy.int8)
+        self.reserves[ends_of_turns + 1, self.events[ends_of_turns, PLAYER]] = self.events[ends_of_turns, RESERVE]
+        changed = numpy.zeros_like(self.reserves, dtype=bool)
+        changed[ends_of_turns + 1, self.events[ends_of_turns, PLAYER]] = True
+        changed[0] = True
+        last_change = numpy.maximum.accumulate(numpy.where(changed, numpy.arange(nb_positions)[:, None], 0), axis=0)
+        self.reserves = numpy.take_along_axis(self.reserves, last_change, axis=0)
+
+        is_battle = kinds == BATTLE
+        self.nb_battles = numpy.concatenate(([0], numpy.cumsum(is_battle)))
+
+    def __len__(self):
+        """Number of positions, including the one before the first event
+        """
+        return len(self.events) + 1
+
+    def position(self, n):
+        """Get owners and dice of areas in a position
+
+        Parameters
+        ----------
+        n : int
+            Number of events played
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray)
+            Owners and dice of areas indexed by their names, independent of the replay
+        """
+        if not 0 <= n < len(self):
+            raise IndexError("Position {} is out of the range of {} positions".format(n, len(self)))
+        keyframe = n // self.keyframe_interval
+        owners = self.keyframes[0][keyframe].copy()
+        dice = self.keyframes[1][keyframe].copy()
+        for event in self.events[keyframe * self.keyframe_interval:n]:
+            apply_event(event, owners, dice, self.record.names)
+        return owners, dice
+
+    def board(self, n):
+        """Get a position as a board of the client, e.g. to be given to an AI
+
+        Parameters
+        ----------
+        n : int
+            Number of events played
+
+        Returns
+        -------
+        Board
+        """
+        owners, dice = self.position(n)
+        reserves = {
+            player: reserve for player, reserve in enumerate(self.reserves[n].tolist()) if reserve
+        }
+        board = Board.__new__(Board)
+        board.set_up(
+            self.topology,
+            create_state(self.topology, array('b', owners.tobytes()), array('b', dice.tobytes()), reserves, [])
+        )
+        return board
+
+    def game(self, n, player_name=None):
+        """Get a position as a game for the debugger UI
+
+        Parameters
+        ----------
+        n : int
+            Number of events played
+        player_name : int
+            Player to look at the game as, the player on turn by default
+
+        Returns
+        -------
+        StaticGame
+        """
+        current_player_name = int(self.current_players[n])
+        if player_name is None:
+            player_name = current_player_name
+        game = StaticGame(
+            player_name, self.board(n), current_player_name, list(self.record.players_order)
+        )
+        for name, player in game.players.items():
+            player.set_reserve(int(self.reserves[n, name]))
+        return game
+
+    def find_battle(self, nb_battles):
+        """Get the position right before a battle
+
+        Parameters
+        ----------
+        nb_battles : int
+            Number of battles played before, as counted by the GameSummary
+
+        Returns
+        -------
+        int
+            Position in which the battle is about to be fought
+        """
+        return int(numpy.searchsorted(self.nb_battles, nb_battles + 1)) - 1
@@ -0,0 +1,37 @@
+class BoardState(object):
+    """Part of the game board changing during the game
+
+    Owners and dice of all areas are stored in compact arrays indexed by area names,
+    ``numpy.frombuffer()`` turns them into numpy arrays without copying.
+    """
+    __slots__ = ('owners', 'dice', 'regions', 'reserves', 'history')
+
+    def __init__(self, owners, dice, regions, reserves, history):
+        """
+        Parameters
+        ----------
+        owners : array of int
+            Name of owner of each area, indexed by area names
+        dice : array of int
+            Number of dice in each area, indexed by area names
+        regions : RegionTracker
+            Regions of areas owned by the same player
+        reserves : dict of int: int
+            Dice reserves of players, missing players have none
+        history : list of tuple
+            Undo log of moves applied by Board.apply_battle() and Board.apply_end_turn()
+        """
+        self.owners = owners
+        self.dice = dice
+        self.regions = regions
+        self.reserves = reserves
+        self.history = history
+
+    def copy(self):
+        """Get an independent copy
+
+        Returns
+        -------
+        BoardState
+        """
+        return BoardState(self.owners[:], self.dice[:], self.regions.copy(), dict(self.reserves), list(self.history))
@@ -0,0 +1,106 @@
+import numpy
+
+
+def read_only(a):
+    """Copy an array into one which cannot be made writeable again
+
+    The copy is a view of immutable bytes, so setting its ``flags.writeable``
+    fails instead of allowing the array to be changed.
+    """
+    return numpy.frombuffer(a.tobytes(), dtype=a.dtype).reshape(a.shape)
+
+
+class BoardTopology(object):
+    """Geometry of the game board, which never changes during the game
+
+    The topology is immutable, so that all copies of a board can share it.
+    """
+    __slots__ = (
+        'names', 'nb_slots', 'neighbours', 'hexes',
+        'adjacency_offsets', 'adjacency_names', 'edge_sources', 'edge_targets', 'neighbour_table',
+    )
+
+    def __init__(self, board):
+        """
+        Parameters
+        ----------
+        board : dict
+            Dictionary describing the game's board, with neighbours and hexes of areas
+            keyed by area names
+
+        Attributes
+        ----------
+        names : tuple of int
+            Names of areas in the order of the board
+        nb_slots : int
+            Length of sequences indexed by area names
+        neighbours : tuple of tuple of int
+            Names of adjacent areas, indexed by area names
+        hexes : tuple of tuple of tuple of int
+            Hex coordinates of all hexes of areas, indexed by area names
+        adjacency_offsets, adjacency_names : numpy.ndarray
+            Adjacency in the compressed sparse row format, names of neighbours of area
+            ``a`` are ``adjacency_names[adjacency_offsets[a]:adjacency_offsets[a+1]]``, read-only
+        edge_sources, edge_targets : numpy.ndarray
+            Both ends of every pair of adjacent areas, in the order of names and their
+            neighbours, read-only
+        neighbour_table : numpy.ndarray
+            Names of adjacent areas in rows indexed by area names, read-only. Rows are padded
+            by 0, which is not a name of any area and owns no dice
+        """
+        names = tuple(int(name) for name in board)
+        nb_slots = max(names) + 1
+        neighbours = [()] * nb_slots
+        hexes = [()] * nb_slots
+        for key, area in board.items():
+            neighbours[int(key)] = tuple(int(n) for n in area['neighbours'])
+            hexes[int(key)] = tuple(tuple(int(i) for i in h) for h in area['hexes'])
+
+        adjacency_offsets = numpy.zeros(nb_slots + 1, dtype=numpy.int32)
+        adjacency_offsets[1:] = numpy.cumsum([len(n) for n in neighbours])
+        adjacency_names = numpy.array([n for ns in neighbours for n in ns], dtype=numpy.int32)
+        edge_sources = numpy.array([name for name in names for _ in neighbours[name]], dtype=numpy.int32)
+        edge_targets = numpy.array([n for name in names for n in neighbours[name]], dtype=numpy.int32)
+        neighbour_table = numpy.zeros((nb_slots, max(max(len(n) for n in neighbours), 1)), dtype=numpy.int32)
+        for name in names:
+            neighbour_table[name, :len(neighbours[name])] = neighbours[name]
+        adjacency_offsets, adjacency_names, edge_sources, edge_targets, neighbour_table = (
+            read_only(a) for a in (adjacency_offsets, adjacency_names, edge_sources, edge_targets, neighbour_table)
+        )
+
+        object.__setattr__(self, 'names', names)
+        object.__setattr__(self, 'nb_slots', nb_slots)
+        object.__setattr__(self, 'neighbours', tuple(neighbours))
+        object.__setattr__(self, 'hexes', tuple(hexes))
+        object.__setattr__(self, 'adjacency_offsets', adjacency_offsets)
+        object.__setattr__(self, 'adjacency_names', adjacency_names)
+        object.__setattr__(self, 'edge_sources', edge_sources)
+        object.__setattr__(self, 'edge_targets', edge_targets)
+        object.__setattr__(self, 'neighbour_table', neighbour_table)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("BoardTopology is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("BoardTopology is immutable")
+
+    def __reduce__(self):
+        return (BoardTopology, (self.get_board(),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def get_board(self):
+        """Get the dictionary describing the board, as sent by the server
+
+        Returns
+        -------
+        dict of str: dict
+        """
+        return {
+            str(name): {'neighbours': list(self.neighbours[name]), 'hexes': [list(h) for h in self.hexes[name]]}
+            for name in self.names
+        }
@@ -373,8 +373,7 @@ class ClientUI(QWidget):
 
             if def_data['owner'] == atk_data['owner']:
                 defender.set_owner(atk_data['owner'])
-                self.game.players[atk_name].set_score(msg['score'][str(atk_name)])
-                self.game.players[def_name].set_score(msg['score'][str(def_name)])
+            self.game.update_scores(msg['score'])
 
             self.game.battle = {
                 'atk_name' : atk_name,
@@ -406,8 +405,8 @@ class ClientUI(QWidget):
             self.game.battle = False
             self.game.players[self.game.current_player_name].activate()
 
-            for i, player in self.game.players.items():
-                player.set_reserve(msg['reserves'][str(i)])
+            self.game.update_scores(msg['score'])
+            self.game.update_reserves(msg['reserves'])
 
         elif msg['type'] == 'game_end':
             if msg['winner'] == self.game.player_name:
@@ -0,0 +1,2 @@
+from .regions import RegionTracker
+from .reinforcements import distribute_dice, nb_reinforcements
@@ -0,0 +1,214 @@
+"""Wire protocol of messages between the server and clients
+
+Every message travels in a frame made of a header and a payload. The header
+holds the encoding of the payload (one byte) and the length of the payload
+(four bytes, network byte order). Messages are dictionaries keyed by strings,
+encoded in JSON, or in MessagePack if the msgpack package is installed.
+
+The server answers every client in the encoding of its hello message.
+Blocking sockets are handled by Connection, asyncio streams by read_message().
+"""
+from collections import deque
+import json
+import struct
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+JSON = 0
+MSGPACK = 1
+ENCODINGS = {'json': JSON, 'msgpack': MSGPACK}
+
+HEADER = struct.Struct('!BI')
+RECV_SIZE = 65535
+
+
+def get_encoding(name):
+    """Get identifier of encoding given its name
+
+    Parameters
+    ----------
+    name : str
+        'json' or 'msgpack'
+
+    Returns
+    -------
+    int
+    """
+    if name not in ENCODINGS:
+        raise ValueError("Unknown encoding '{}', choose from {}".format(name, sorted(ENCODINGS)))
+    if ENCODINGS[name] == MSGPACK and msgpack is None:
+        raise ValueError("Encoding 'msgpack' requires the msgpack package")
+    return ENCODINGS[name]
+
+
+def encode_message(msg, encoding=JSON):
+    """Encode message into a frame
+
+    Parameters
+    ----------
+    msg : dict
+    encoding : int
+
+    Returns
+    -------
+    bytes
+    """
+    if encoding == MSGPACK:
+        payload = msgpack.packb(msg, use_bin_type=True)
+    else:
+        payload = json.dumps(msg).encode()
+    return HEADER.pack(encoding, len(payload)) + payload
+
+
+def decode_payload(encoding, payload):
+    """Decode payload of a frame
+
+    Parameters
+    ----------
+    encoding : int
+    payload : bytes
+
+    Returns
+    -------
+    dict
+    """
+    if encoding == JSON:
+        return json.loads(payload.decode())
+    elif encoding == MSGPACK:
+        if msgpack is None:
+            raise ValueError("Received a msgpack message, but the msgpack package is not installed")
+        return msgpack.unpackb(payload, raw=False)
+    else:
+        raise ValueError("Unknown encoding {} of a message".format(encoding))
+
+
+class FrameDecoder(object):
+    """Reassembles frames from chunks of a stream of bytes
+    """
+    def __init__(self):
+        """
+        Attributes
+        ----------
+        buffer : bytearray
+            Received bytes not yet decoded, starting at a frame boundary
+        """
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        """Take in received bytes and decode all messages completed by them
+
+        Parameters
+        ----------
+        data : bytes
+
+        Returns
+        -------
+        list of (int, dict)
+            Encodings and decoded messages
+        """
+        self.buffer += data
+        messages = []
+        offset = 0
+
+        while len(self.buffer) - offset >= HEADER.size:
+            encoding, length = HEADER.unpack_from(self.buffer, offset)
+            end = offset + HEADER.size + length
+            if end > len(self.buffer):
+                break
+            payload = bytes(self.buffer[offset + HEADER.size:end])
+            messages.append((encoding, decode_payload(encoding, payload)))
+            offset = end
+
+        del self.buffer[:offset]
+        return messages
+
+
+class Connection(object):
+    """Socket sending and receiving framed messages
+    """
+    def __init__(self, sock, encoding=JSON):
+        """
+        Parameters
+        ----------
+        sock : socket
+        encoding : int
+            Encoding of outgoing messages
+
+        Attributes
+        ----------
+        peer_encoding : int
+            Encoding of the last message received, None before the first one
+        """
+        self.socket = sock
+        self.encoding = encoding
+        self.peer_encoding = None
+        self.decoder = FrameDecoder()
+        self.received = deque()
+
+    def send(self, msg):
+        """Encode message and send it
+
+        Parameters
+        ----------
+        msg : dict
+        """
+        self.socket.sendall(encode_message(msg, self.encoding))
+
+    def send_data(self, data):
+        """Send already encoded frame
+
+        Parameters
+        ----------
+        data : bytes
+        """
+        self.socket.sendall(data)
+
+    def receive(self):
+        """Wait for the next message
+
+        Returns
+        -------
+        dict
+
+        Raises
+        ------
+        ConnectionResetError
+            If the peer closes the connection
+        """
+        while not self.received:
+            data = self.socket.recv(RECV_SIZE)
+            if not data:
+                raise ConnectionResetError("Connection closed by peer")
+            self.received.extend(self.decoder.feed(data))
+
+        self.peer_encoding, msg = self.received.popleft()
+        return msg
+
+    def close(self):
+        self.socket.close()
+
+
+async def read_message(reader):
+    """Wait for the next message on an asyncio stream
+
+    Parameters
+    ----------
+    reader : asyncio.StreamReader
+
+    Returns
+    -------
+    (int, dict)
+        Encoding and the decoded message
+
+    Raises
+    ------
+    asyncio.IncompleteReadError
+        If the peer closes the connection
+    """
+    encoding, length = HEADER.unpack(await reader.readexactly(HEADER.size))
+    payload = await reader.readexactly(length)
+    return encoding, decode_payload(encoding, payload)
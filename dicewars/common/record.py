@@ -0,0 +1,304 @@
+"""Binary record of a game, move by move
+
+A record is written by the server as the game goes, it is only ever appended
+to. It starts with a header holding the number of players, the seeds of the
+game (see scripts/server.py) and the sizes of the board, followed by a payload
+of little-endian 16-bit integers:
+
+    names               names of areas in ascending order
+    hex counts          number of hexes of every area
+    hexes               x and y coordinates of all hexes, area after area
+    neighbour counts    number of neighbours of every area
+    neighbours          names of neighbours, area after area
+    owners              initial owner of every area
+    dice                initial dice in every area
+    order               names of players in the order of play
+
+and by nicknames of players in the order of play, each prefixed by its length
+in bytes. The rest of the record are events, one per battle, end of turn and
+the end of the game. All events of a record have the same size, they are made
+of the unsigned bytes
+
+    KIND            BATTLE, END_TURN or GAME_END
+    PLAYER          the attacker, the player ending the turn or the winner, 0 for none
+    ATTACKER        attacking area
+    DEFENDER        attacked area
+    ATK_PWR         sum of the attacker's dice
+    DEF_PWR         sum of the defender's dice
+    CONQUERED       1 if the attacker won the battle
+    RESERVE         dice left in the reserve of the player at the end of the turn
+    NEXT_PLAYER     player on turn after the end of the turn
+
+followed by the number of dice added at the end of the turn to every area, in
+the order of names. Fields that do not apply to the kind of event are zeros.
+Any position of the game follows from the initial one by applying events one
+after another, see apply_event().
+"""
+import struct
+
+import numpy
+
+
+MAGIC = b'DWR1'
+HEADER = struct.Struct('<4sBBqqqqHHH')
+LENGTH = struct.Struct('<H')
+VALUE = numpy.dtype('<i2')
+
+BATTLE = 1
+END_TURN = 2
+GAME_END = 3
+
+KIND, PLAYER, ATTACKER, DEFENDER, ATK_PWR, DEF_PWR, CONQUERED, RESERVE, NEXT_PLAYER = range(9)
+ADDED = 9
+EVENT = struct.Struct('<9B')
+
+
+class GameRecorder(object):
+    """Writer of a game record, called by the server at every event of the game
+    """
+    def __init__(self, f, board_seed=None, ownership_seed=None, strength_seed=None, fixed=None):
+        """
+        Parameters
+        ----------
+        f : file
+            Binary file to write the record to
+        board_seed, ownership_seed, strength_seed, fixed : int
+            Seeds of the game, see scripts/server.py
+
+        Attributes
+        ----------
+        columns : dict of int: int
+            Positions of areas' numbers of added dice in an event, keyed by names
+        padding : bytes
+            Zeros completing an event without added dice
+        """
+        self.f = f
+        self.seeds = (board_seed, ownership_seed, strength_seed, fixed)
+        self.columns = {}
+        self.padding = b''
+
+    def start(self, board, owners, dice, players_order, nicknames):
+        """Write the header of the record
+
+        Parameters
+        ----------
+        board : dict of int: dict
+            Hexes and neighbours of every area, keyed by names
+        owners : dict of int: int
+            Initial owners of areas
+        dice : dict of int: int
+            Initial dice in areas
+        players_order : list of int
+            Names of players in the order of play
+        nicknames : list of str
+            Nicknames of players in the order of play
+        """
+        names = sorted(board)
+        hex_counts = [len(board[name]['hexes']) for name in names]
+        hexes = [c for name in names for h in board[name]['hexes'] for c in h]
+        neighbour_counts = [len(board[name]['neighbours']) for name in names]
+        neighbours = [n for name in names for n in board[name]['neighbours']]
+
+        self.columns = {name: ADDED + i for i, name in enumerate(names)}
+        self.padding = bytes(len(names))
+
+        seeds_mask = sum(1 << i for i, seed in enumerate(self.seeds) if seed is not None)
+        seeds = [0 if seed is None else seed for seed in self.seeds]
+        header = HEADER.pack(
+            MAGIC, len(players_order), seeds_mask, *seeds, len(names), sum(hex_counts), len(neighbours)
+        )
+        payload = numpy.array(
+            names + hex_counts + hexes + neighbour_counts + neighbours
+            + [owners[name] for name in names] + [dice[name] for name in names] + list(players_order),
+            dtype=VALUE
+        ).tobytes()
+        encoded_nicknames = [nickname.encode('utf-8') for nickname in nicknames]
+        self.f.write(header + payload + b''.join(LENGTH.pack(len(n)) + n for n in encoded_nicknames))
+
+    def battle(self, player, attacker, defender, atk_pwr, def_pwr, conquered):
+        """Record a battle
+
+        Parameters
+        ----------
+        player : int
+            Owner of the attacking area
+        attacker, defender : int
+            Names of the attacking and the attacked area
+        atk_pwr, def_pwr : int
+            Sums of dice rolled by both sides
+        conquered : bool
+            Whether the attacker won
+        """
+        self.f.write(EVENT.pack(BATTLE, player, attacker, defender, atk_pwr, def_pwr, conquered, 0, 0) + self.padding)
+
+    def end_turn(self, player, added, reserve, next_player):
+        """Record an end of turn
+
+        Parameters
+        ----------
+        player : int
+            Player ending the turn
+        added : dict of int: int
+            Numbers of dice added to areas, keyed by their names
+        reserve : int
+            Dice left in the reserve of the player
+        next_player : int
+            Player on turn next
+        """
+        event = bytearray(EVENT.pack(END_TURN, player, 0, 0, 0, 0, 0, reserve, next_player) + self.padding)
+        for name, nb_added in added.items():
+            event[self.columns[name]] = nb_added
+        self.f.write(event)
+
+    def game_end(self, winner):
+        """Record the end of the game and flush the record
+
+        Parameters
+        ----------
+        winner : int
+            Name of the winner, 0 if the game was cancelled
+        """
+        self.f.write(EVENT.pack(GAME_END, winner, 0, 0, 0, 0, 0, 0, 0) + self.padding)
+        self.f.flush()
+
+
+class GameRecordReader(object):
+    """Reader of a game record, possibly of a game still being played
+    """
+    def __init__(self, f):
+        """Read the header of the record
+
+        Parameters
+        ----------
+        f : file
+            Binary file positioned at the start of the record
+
+        Attributes
+        ----------
+        nb_players : int
+        board_seed, ownership_seed, strength_seed, fixed : int
+            Seeds of the game, None if the game was not seeded
+        names : numpy.ndarray
+            Names of areas in ascending order
+        board : dict of int: dict
+            Hexes and neighbours of every area, keyed by names, as in the
+            'board' of the 'game_start' message
+        owners : numpy.ndarray
+            Initial owners of areas, indexed by their names
+        dice : numpy.ndarray
+            Initial dice in areas, indexed by their names
+        players_order : list of int
+            Names of players in the order of play
+        nicknames : list of str
+            Nicknames of players in the order of play
+        event_size : int
+            Number of bytes of an event
+        """
+        self.f = f
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a game record")
+        _, self.nb_players, seeds_mask, *seeds, nb_areas, nb_hexes, nb_adjacencies = HEADER.unpack(header)
+        self.board_seed, self.ownership_seed, self.strength_seed, self.fixed = [
+            seed if seeds_mask & (1 << i) else None for i, seed in enumerate(seeds)
+        ]
+
+        sizes = [nb_areas, nb_areas, 2 * nb_hexes, nb_areas, nb_adjacencies, nb_areas, nb_areas, self.nb_players]
+        values = numpy.frombuffer(self.read_exactly(VALUE.itemsize * sum(sizes)), dtype=VALUE)
+        names, hex_counts, hexes, neighbour_counts, neighbours, owners, dice, order = numpy.split(
+            values, numpy.cumsum(sizes)[:-1]
+        )
+
+        self.names = names.astype(numpy.intp)
+        hexes = hexes.reshape(-1, 2).tolist()
+        neighbours = neighbours.tolist()
+        hex_counts = hex_counts.tolist()
+        neighbour_counts = neighbour_counts.tolist()
+        hex_offsets = numpy.cumsum(hex_counts).tolist()
+        neighbour_offsets = numpy.cumsum(neighbour_counts).tolist()
+        self.board = {}
+        for i, name in enumerate(self.names.tolist()):
+            self.board[name] = {
+                'hexes': hexes[hex_offsets[i] - hex_counts[i]:hex_offsets[i]],
+                'neighbours': neighbours[neighbour_offsets[i] - neighbour_counts[i]:neighbour_offsets[i]],
+            }
+
+        nb_slots = int(self.names.max()) + 1 if nb_areas else 1
+        self.owners = numpy.zeros(nb_slots, dtype=numpy.int8)
+        self.owners[self.names] = owners
+        self.dice = numpy.zeros(nb_slots, dtype=numpy.int8)
+        self.dice[self.names] = dice
+        self.players_order = order.tolist()
+
+        self.nicknames = []
+        for _ in range(self.nb_players):
+            length, = LENGTH.unpack(self.read_exactly(LENGTH.size))
+            self.nicknames.append(self.read_exactly(length).decode('utf-8'))
+
+        self.event_size = ADDED + nb_areas
+        self.pending = b''
+
+    def read_exactly(self, size):
+        data = self.f.read(size)
+        if len(data) < size:
+            raise ValueError("Game record is truncated")
+        return data
+
+    def read_events(self):
+        """Read events written since the last call
+
+        An event being written right now is kept for the next call.
+
+        Returns
+        -------
+        numpy.ndarray
+            Events as rows of unsigned bytes, see the description of the format
+        """
+        data = self.pending + self.f.read()
+        nb_events = len(data) // self.event_size
+        self.pending = data[nb_events * self.event_size:]
+        return numpy.frombuffer(data, dtype=numpy.uint8, count=nb_events * self.event_size).reshape(-1, self.event_size)
+
+    def positions(self):
+        """Go through the game event by event
+
+        The arrays are updated in place, they have to be copied to be kept.
+
+        Yields
+        ------
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+            Event and owners and dice of areas after it, indexed by names
+        """
+        owners = self.owners.copy()
+        dice = self.dice.copy()
+        events = self.read_events()
+        while len(events):
+            for event in events:
+                apply_event(event, owners, dice, self.names)
+                yield event, owners, dice
+            events = self.read_events()
+
+
+def apply_event(event, owners, dice, names):
+    """Bring a position of the game past an event
+
+    Parameters
+    ----------
+    event : numpy.ndarray
+        Event of a record
+    owners : numpy.ndarray
+        Owners of areas indexed by their names, changed in place
+    dice : numpy.ndarray
+        Dice in areas indexed by their names, changed in place
+    names : numpy.ndarray
+        Names of areas in ascending order
+    """
+    kind = event[KIND]
+    if kind == BATTLE:
+        attacker, defender = event[ATTACKER], event[DEFENDER]
+        if event[CONQUERED]:
+            owners[defender] = owners[attacker]
+            dice[defender] = dice[attacker] - 1
+        dice[attacker] = 1
+    elif kind == END_TURN:
+        dice[names] += event[ADDED:].astype(dice.dtype)
@@ -0,0 +1,214 @@
+class RegionTracker(object):
+    """Connected regions of areas held by the same player
+
+    Regions are kept as disjoint sets with explicit members, every area
+    points directly to the representative of its region. Joining two
+    regions relabels the smaller one, a region losing an area is rebuilt
+    from its remaining members, so that a change of ownership touches
+    only the regions around the area. Sizes of the largest regions are
+    cached per player.
+
+    Neighbours held by other players are counted for every area as well,
+    areas with any of them make the borders of players.
+    """
+    def __init__(self, neighbours, owners=None):
+        """
+        Parameters
+        ----------
+        neighbours : dict of int: list of int
+            Names of adjacent areas for each area
+        owners : dict of int: int
+            Initial owners of the areas, unowned areas can be left out
+
+        Attributes
+        ----------
+        neighbours : tuple of tuple of int
+            Names of adjacent areas, indexed by area names, shared by copies
+        owners : list of int
+            Owner of each area, indexed by area names, None for unowned areas
+        roots : list of int
+            Representative of the region of each area, indexed by area names
+        members : dict of int: list of int
+            Names of areas in each region, keyed by its representative
+        player_roots : dict of int: set of int
+            Representatives of all regions of each player
+        foreign_neighbours : list of int
+            Number of neighbours held by other players, indexed by area names
+        """
+        nb_slots = max(int(name) for name in neighbours) + 1
+        adjacency = [()] * nb_slots
+        for name, adjacent in neighbours.items():
+            adjacency[int(name)] = tuple(int(n) for n in adjacent)
+        self.neighbours = tuple(adjacency)
+
+        self.owners = [None] * nb_slots
+        self.roots = list(range(nb_slots))
+        self.members = {}
+        self.player_roots = {}
+        self.scores = {}
+        self.foreign_neighbours = [0] * nb_slots
+
+        if owners:
+            for name, owner in owners.items():
+                self.change_owner(int(name), owner)
+
+    def copy(self):
+        """Get an independent copy, the adjacency is shared as it never changes
+
+        Returns
+        -------
+        RegionTracker
+        """
+        tracker = RegionTracker.__new__(RegionTracker)
+        tracker.neighbours = self.neighbours
+        tracker.owners = self.owners[:]
+        tracker.roots = self.roots[:]
+        tracker.members = {root: members[:] for root, members in self.members.items()}
+        tracker.player_roots = {player: set(roots) for player, roots in self.player_roots.items()}
+        tracker.scores = dict(self.scores)
+        tracker.foreign_neighbours = self.foreign_neighbours[:]
+        return tracker
+
+    def change_owner(self, name, owner):
+        """Update regions after an area has been taken over
+
+        Parameters
+        ----------
+        name : int
+            Name of the area
+        owner : int
+            Name of the new owner
+        """
+        previous_owner = self.owners[name]
+        if previous_owner == owner:
+            return
+
+        if previous_owner is not None:
+            self.split_region(name)
+            self.scores.pop(previous_owner, None)
+
+        owners = self.owners
+        foreign_neighbours = self.foreign_neighbours
+        owners[name] = owner
+        self.add_region(name, [name])
+        nb_foreign = 0
+        for neighbour in self.neighbours[name]:
+            neighbour_owner = owners[neighbour]
+            if neighbour_owner == owner:
+                foreign_neighbours[neighbour] -= neighbour_owner != previous_owner
+                if self.roots[neighbour] != self.roots[name]:
+                    self.join_regions(self.roots[neighbour], self.roots[name])
+            else:
+                nb_foreign += 1
+                foreign_neighbours[neighbour] += neighbour_owner == previous_owner
+        foreign_neighbours[name] = nb_foreign
+        self.scores.pop(owner, None)
+
+    def add_region(self, root, members):
+        self.members[root] = members
+        self.player_roots.setdefault(self.owners[root], set()).add(root)
+        roots = self.roots
+        for name in members:
+            roots[name] = root
+
+    def remove_region(self, root):
+        self.player_roots[self.owners[root]].discard(root)
+        return self.members.pop(root)
+
+    def join_regions(self, root_a, root_b):
+        if len(self.members[root_a]) < len(self.members[root_b]):
+            root_a, root_b = root_b, root_a
+        members = self.remove_region(root_b)
+        roots = self.roots
+        for name in members:
+            roots[name] = root_a
+        self.members[root_a].extend(members)
+
+    def split_region(self, name):
+        """Remove area from its region and rebuild what remains of the region
+
+        An area with at most one neighbour in the region cannot disconnect it,
+        so it is just dropped from the members.
+        """
+        owner = self.owners[name]
+        root = self.roots[name]
+        nb_connections = 0
+        for neighbour in self.neighbours[name]:
+            if self.owners[neighbour] == owner:
+                nb_connections += 1
+        if nb_connections <= 1:
+            members = self.members[root]
+            members.remove(name)
+            if root == name:
+                self.remove_region(root)
+                if members:
+                    self.add_region(members[0], members)
+            return
+
+        remaining = set(self.remove_region(root))
+        remaining.discard(name)
+        neighbours = self.neighbours
+
+        while remaining:
+            start = remaining.pop()
+            region = [start]
+            for area in region:
+                for neighbour in neighbours[area]:
+                    if neighbour in remaining:
+                        remaining.discard(neighbour)
+                        region.append(neighbour)
+            self.add_region(start, region)
+
+    def get_score(self, player_name):
+        """Get size of the largest region of a player
+
+        Parameters
+        ----------
+        player_name : int
+
+        Returns
+        -------
+        int
+        """
+        score = self.scores.get(player_name)
+        if score is None:
+            roots = self.player_roots.get(player_name, ())
+            score = max((len(self.members[root]) for root in roots), default=0)
+            self.scores[player_name] = score
+        return score
+
+    def get_regions(self, player_name):
+        """Get all regions of a player
+
+        Parameters
+        ----------
+        player_name : int
+
+        Returns
+        -------
+        list of list of int
+            Sorted names of areas of each region, regions are ordered by their smallest areas
+        """
+        regions = [sorted(self.members[root]) for root in self.player_roots.get(player_name, ())]
+        regions.sort()
+        return regions
+
+    def get_largest_region(self, player_name):
+        """Get areas of the largest region of a player
+
+        Ties are broken in favour of the region with the smallest area.
+
+        Parameters
+        ----------
+        player_name : int
+
+        Returns
+        -------
+        list of int
+            Sorted names of areas in the region, empty if the player has no areas
+        """
+        score = self.get_score(player_name)
+        for region in self.get_regions(player_name):
+            if len(region) == score:
+                return region
+        return []
@@ -0,0 +1,81 @@
+import random
+
+
+MAX_DICE = 8
+MAX_REINFORCEMENTS = 64
+
+
+def distribute_dice(free_slots, nb_dice, rng):
+    """Distribute reinforcements among areas of a player at the end of a turn
+
+    Dice are placed one by one into randomly chosen areas, an area found full
+    is dropped from the choice. Given the same random generator, the draws are
+    exactly those of the original placement of dice by the server, so that
+    games stay reproducible under a fixed seed. The server and the forward
+    model of the client board, used by simulating AIs, share it.
+
+    Parameters
+    ----------
+    free_slots : list of int
+        Number of dice every area of the player can still take, in the order
+        of the player's areas
+    nb_dice : int
+        Number of dice to place, the reserve of the player included
+    rng : random.Random
+        Source of randomness for placing the dice
+
+    Returns
+    -------
+    (dict of int: int, int)
+        Number of dice added to areas, keyed by their indices in free_slots in
+        the order in which they received their first die, and number of dice
+        which did not fit
+    """
+    added = {}
+    free = list(free_slots)
+    candidates = list(range(len(free)))
+    n = len(candidates)
+    k = n.bit_length()
+
+    # rng.choice() of the standard generator draws k random bits until they are below n,
+    # doing it here saves two Python calls per die; test_reinforcements.py checks that
+    # the draws stay those of rng.choice() of the running Python
+    inline_choice = rng is random or type(rng) is random.Random
+    getrandbits = rng.getrandbits if inline_choice else None
+    choice = rng.choice
+
+    while nb_dice and n:
+        if inline_choice:
+            r = getrandbits(k)
+            while r >= n:
+                r = getrandbits(k)
+            i = candidates[r]
+        else:
+            i = choice(candidates)
+
+        if free[i]:
+            free[i] -= 1
+            added[i] = added.get(i, 0) + 1
+            nb_dice -= 1
+        else:
+            candidates.remove(i)
+            n -= 1
+            k = n.bit_length()
+    return added, nb_dice
+
+
+def nb_reinforcements(reserve, largest_region):
+    """Number of dice a player gets to distribute at the end of a turn
+
+    Parameters
+    ----------
+    reserve : int
+        Dice left over from previous turns
+    largest_region : int
+        Size of the largest region of the player
+
+    Returns
+    -------
+    int
+    """
+    return min(reserve + largest_region, MAX_REINFORCEMENTS)
@@ -1,3 +1,5 @@
+from dicewars.common import RegionTracker
+
 from .area import Area
 
 
@@ -14,7 +16,9 @@ class Board(object):
         Attributes
         ----------
         areas : dict of int: Area
-            Dictionary of Area instances
+            Dictionary of Area instances keyed by their names
+        regions : RegionTracker
+            Regions of areas owned by the same player
         """
         self.board = board
         self.areas = {}
@@ -22,6 +26,7 @@ class Board(object):
             self.areas[area] = Area(area, board[area]['neighbours'])
         for a in self.areas:
             self.areas[a].add_adjacent_areas(self)
+        self.regions = RegionTracker({area: board[area]['neighbours'] for area in board})
 
     def get_area_by_name(self, name):
         """Get instance of Area by its name
@@ -34,11 +39,9 @@ class Board(object):
         Returns
         -------
         Area
-            Instance of an area
+            Instance of an area, None if there is no such area
         """
-        for a in self.areas:
-            if name == self.areas[a].get_name():
-                return self.areas[a]
+        return self.areas.get(name)
 
     def get_board(self):
         """Get dictionary listing adjacent areas for each area
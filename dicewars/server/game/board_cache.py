@@ -0,0 +1,172 @@
+"""Cache of generated boards in a single memory-mapped file
+
+The file is a sequence of records, one per board, each made of a header and
+a payload. The header holds the number of players and the three seeds of the
+board (see create_board()), followed by the number of areas, hexes and
+adjacencies. The payload is made of little-endian 16-bit integers:
+
+    names               names of areas in the order of the board
+    hex counts          number of hexes of every area
+    hexes               x and y coordinates of all hexes, area after area
+    neighbour counts    number of neighbours of every area
+    neighbours          names of neighbours, area after area
+    ownership areas     names of areas in the order of the ownership mapping
+    ownership players   names of their owners
+    dice                dice in every area, in the order of names
+
+Records are only ever appended, so that several processes can share a cache.
+"""
+import os
+import struct
+
+import hexutil
+import numpy
+
+from .board import Board
+
+
+MAGIC = b'DWB1'
+HEADER = struct.Struct('<4sHqqqHHH')
+VALUE = numpy.dtype('<i2')
+
+
+class BoardCache(object):
+    """Boards and their initial ownership and dice keyed by the number of players and seeds
+
+    Boards with any seed of None are random, they are never cached.
+    """
+    def __init__(self, path):
+        """
+        Parameters
+        ----------
+        path : str
+            Path to the cache file, it is created when the first board is stored
+
+        Attributes
+        ----------
+        index : dict of tuple: (int, int, int, int)
+            Offsets of payloads of records and their numbers of areas, hexes and
+            adjacencies, keyed by the number of players and the seeds
+        data : numpy.memmap
+            Content of the file, None if it has not been mapped yet
+        """
+        self.path = path
+        self.index = {}
+        self.data = None
+        self.nb_indexed_bytes = 0
+
+    def get(self, nb_players, board_seed, ownership_seed, strength_seed):
+        """Load a board from the cache
+
+        Parameters
+        ----------
+        nb_players : int
+        board_seed, ownership_seed, strength_seed : int
+
+        Returns
+        -------
+        (Board, dict of int: int)
+            The board and the mapping of areas' names to their owners' names,
+            None if the board is not in the cache
+        """
+        key = (nb_players, board_seed, ownership_seed, strength_seed)
+        if None in key:
+            return None
+        if key not in self.index:
+            self.update_index()
+            if key not in self.index:
+                return None
+
+        offset, nb_areas, nb_hexes, nb_adjacencies = self.index[key]
+        sizes = [nb_areas, nb_areas, 2 * nb_hexes, nb_areas, nb_adjacencies, nb_areas, nb_areas, nb_areas]
+        values = numpy.frombuffer(self.data, dtype=VALUE, count=sum(sizes), offset=offset).tolist()
+        names, hex_counts, hexes, neighbour_counts, neighbours, ownership_areas, ownership_players, dice = split(values, sizes)
+
+        board_description = {}
+        hex_offset = neighbour_offset = 0
+        for name, hex_count, neighbour_count in zip(names, hex_counts, neighbour_counts):
+            board_description[name] = {
+                'hexes': [
+                    hexutil.Hex(hexes[i], hexes[i + 1])
+                    for i in range(hex_offset, hex_offset + 2 * hex_count, 2)
+                ],
+                'neighbours': neighbours[neighbour_offset:neighbour_offset + neighbour_count],
+            }
+            hex_offset += 2 * hex_count
+            neighbour_offset += neighbour_count
+
+        board = Board(board_description)
+        for name, area_dice in zip(names, dice):
+            board.get_area_by_name(name).set_dice(area_dice)
+        return board, dict(zip(ownership_areas, ownership_players))
+
+    def put(self, nb_players, board_seed, ownership_seed, strength_seed, board, area_ownership):
+        """Store a newly created board in the cache
+
+        Parameters
+        ----------
+        nb_players : int
+        board_seed, ownership_seed, strength_seed : int
+        board : Board
+            Board with dice assigned, but not owners
+        area_ownership : dict of int: int
+            Mapping of areas' names to their owners' names
+        """
+        key = (nb_players, board_seed, ownership_seed, strength_seed)
+        if None in key or key in self.index:
+            return
+
+        description = board.get_board()
+        names = list(description)
+        hex_counts = [len(description[name]['hexes']) for name in names]
+        hexes = [c for name in names for h in description[name]['hexes'] for c in h]
+        neighbour_counts = [len(description[name]['neighbours']) for name in names]
+        neighbours = [n for name in names for n in description[name]['neighbours']]
+        dice = [board.get_area_by_name(name).get_dice() for name in names]
+
+        header = HEADER.pack(MAGIC, *key, len(names), sum(hex_counts), len(neighbours))
+        payload = numpy.array(
+            names + hex_counts + hexes + neighbour_counts + neighbours
+            + list(area_ownership) + list(area_ownership.values()) + dice,
+            dtype=VALUE
+        ).tobytes()
+
+        # a single write to a file opened for appending keeps records of concurrent writers whole
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, header + payload)
+        finally:
+            os.close(fd)
+
+    def update_index(self):
+        """Map the file again and index records added since the last time
+        """
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == self.nb_indexed_bytes:
+            return
+
+        self.data = numpy.memmap(self.path, dtype=numpy.uint8, mode='r')
+        offset = self.nb_indexed_bytes
+        while offset + HEADER.size <= len(self.data):
+            magic, nb_players, board_seed, ownership_seed, strength_seed, nb_areas, nb_hexes, nb_adjacencies = \
+                HEADER.unpack(self.data[offset:offset + HEADER.size].tobytes())
+            if magic != MAGIC:
+                raise ValueError("{} is not a board cache, or it is corrupted at byte {}".format(self.path, offset))
+
+            end = offset + HEADER.size + VALUE.itemsize * (6 * nb_areas + 2 * nb_hexes + nb_adjacencies)
+            if end > len(self.data):
+                break  # a record being written right now
+            key = (nb_players, board_seed, ownership_seed, strength_seed)
+            self.index.setdefault(key, (offset + HEADER.size, nb_areas, nb_hexes, nb_adjacencies))
+            offset = end
+        self.nb_indexed_bytes = offset
+
+
+def split(values, sizes):
+    """Split a list into consecutive parts of given sizes
+    """
+    parts = []
+    offset = 0
+    for size in sizes:
+        parts.append(values[offset:offset + size])
+        offset += size
+    return parts
@@ -1,10 +1,12 @@
-import json
 from json.decoder import JSONDecodeError
 import logging
 import random
 import socket
 import sys
 
+from dicewars.common import distribute_dice, nb_reinforcements
+from dicewars.common.reinforcements import MAX_DICE
+from dicewars.common.protocol import Connection, encode_message
 from .player import Player
 
 from .summary import GameSummary
@@ -16,7 +18,8 @@ MAX_BATTLES_PER_GAME = 10000  # obsevered maximum of 5671 over over 100k games
 class Game(object):
     """Instance of the game
     """
-    def __init__(self, board, area_ownership, players, addr, port, nicknames_order):
+    def __init__(self, board, area_ownership, players, addr, port, nicknames_order, delta=False, rng=None,
+                 recorder=None):
         """Initialize game and connect clients
 
         Parameters
@@ -27,20 +30,30 @@ class Game(object):
             IP address of the server
         port : int
             Port number
+        delta : bool
+            Send the full game state only in 'game_start' and only its changes afterwards
+        rng : random.Random
+            Source of player order and dice rolls, the global random generator by default
+        recorder : GameRecorder
+            Writer of the record of the game, the game is not recorded if None
 
         Attributes
         ----------
-        buffer : int
-            Size of socket buffer
         number_of_players : int
             Number of players
+        scores : dict of str: int
+            Scores of players as last reported to clients
+        changed_scores : dict of str: int
+            Scores that have changed by the last event
         """
-        self.buffer = 65535
         self.logger = logging.getLogger('SERVER')
 
         self.address = addr
         self.port = port
         self.number_of_players = players
+        self.delta = delta
+        self.rng = rng if rng is not None else random
+        self.recorder = recorder
 
         self.nb_players_alive = players
         self.nb_consecutive_end_of_turns = 0
@@ -57,6 +70,10 @@ class Game(object):
         self.report_player_order()
 
         self.assign_areas_to_players(area_ownership)
+        if self.recorder is not None:
+            self.start_record()
+        self.scores = {}
+        self.update_scores()
         self.logger.debug("Board initialized")
 
         for player in self.players.values():
@@ -80,9 +97,7 @@ class Game(object):
 
         except KeyboardInterrupt:
             self.logger.info("Game interrupted.")
-            for i in range(1, self.number_of_players + 1):
-                player = self.players[i]
-                self.send_message(player, 'close_socket')
+            self.broadcast_message('close_socket')
         except (BrokenPipeError, JSONDecodeError) as e:
             self.logger.error("Connection to client failed: {0}".format(e))
         except ConnectionResetError:
@@ -107,6 +122,7 @@ class Game(object):
             New owner
         """
         area.set_owner_name(player.get_name())
+        self.board.regions.change_owner(area.get_name(), player.get_name())
         player.add_area(area)
 
     def handle_player_turn(self):
@@ -115,20 +131,29 @@ class Game(object):
         self.logger.debug("Handling player {} ({}) turn".format(self.current_player.get_name(), self.current_player.nickname))
         player = self.current_player.get_name()
         msg = self.get_message(player)
+        self.handle_command(msg)
+
+    def handle_command(self, msg):
+        """Carry out command of the current player
 
+        Parameters
+        ----------
+        msg : dict
+            Message from the client of the current player
+        """
         if msg['type'] == 'battle':
             self.nb_consecutive_end_of_turns = 0
             battle = self.battle(self.board.get_area_by_name(msg['atk']), self.board.get_area_by_name(msg['def']))
+            self.update_scores()
             self.summary.add_battle()
             self.logger.debug("Battle result: {}".format(battle))
-            for p in self.players:
-                self.send_message(self.players[p], 'battle', battle=battle)
+            self.broadcast_message('battle', battle=battle)
 
         elif msg['type'] == 'end_turn':
             self.nb_consecutive_end_of_turns += 1
             affected_areas = self.end_turn()
-            for p in self.players:
-                self.send_message(self.players[p], 'end_turn', areas=affected_areas)
+            self.update_scores()
+            self.broadcast_message('end_turn', areas=affected_areas)
 
     def get_state(self):
         """Get game state
@@ -136,8 +161,9 @@ class Game(object):
         Returns
         -------
         dict
-            Dictionary containing owner, dice and adjacent areas of
-            each area, as well as score of each player
+            Dictionary containing owner and dice of each area, as well as
+            score of each player. Adjacency of areas is sent only once,
+            in the 'board' of the 'game_start' message.
         """
         game_state = {
             'areas': {}
@@ -145,8 +171,7 @@ class Game(object):
 
         for a in self.board.areas:
             area = self.board.areas[a]
-            game_state['areas'][area.name] = {
-                'adjacent_areas': area.get_adjacent_areas_names(),
+            game_state['areas'][str(area.name)] = {
                 'owner': area.get_owner_name(),
                 'dice': area.get_dice()
             }
@@ -155,10 +180,32 @@ class Game(object):
 
         for p in self.players:
             player = self.players[p]
-            game_state['score'][player.get_name()] = player.get_largest_region(self.board)
+            game_state['score'][str(player.get_name())] = player.get_largest_region(self.board)
 
         return game_state
 
+    def get_update(self):
+        """Get game state, or only the changed scores in the delta mode
+
+        Returns
+        -------
+        dict
+        """
+        if self.delta:
+            return {'score': self.changed_scores}
+        return self.get_state()
+
+    def update_scores(self):
+        """Find out which players' scores have changed since the last update
+        """
+        self.changed_scores = {}
+        for player in self.players.values():
+            name = str(player.get_name())
+            score = player.get_largest_region(self.board)
+            if self.scores.get(name) != score:
+                self.changed_scores[name] = score
+        self.scores.update(self.changed_scores)
+
     def battle(self, attacker, defender):
         """Carry out a battle
 
@@ -178,9 +225,9 @@ class Game(object):
         def_name = defender.get_owner_name()
 
         for i in range(0, atk_dice):
-            atk_pwr += random.randint(1, 6)
+            atk_pwr += self.rng.randint(1, 6)
         for i in range(0, def_dice):
-            def_pwr += random.randint(1, 6)
+            def_pwr += self.rng.randint(1, 6)
 
         battle = {
             'atk': {
@@ -193,9 +240,13 @@ class Game(object):
 
         attacker.set_dice(1)
 
+        if self.recorder is not None:
+            self.recorder.battle(
+                atk_name, attacker.get_name(), defender.get_name(), atk_pwr, def_pwr, atk_pwr > def_pwr
+            )
+
         if atk_pwr > def_pwr:
-            defender.set_owner_name(atk_name)
-            self.players[atk_name].add_area(defender)
+            self.assign_area(defender, self.players[atk_name])
             self.players[def_name].remove_area(defender)
             if self.players[def_name].get_number_of_areas() == 0:
                 self.eliminate_player(def_name)
@@ -227,32 +278,30 @@ class Game(object):
         dict
             Dictionary of affected areas including number of dice in these areas
         """
-        affected_areas = []
         player = self.current_player
-        dice = player.get_reserve() + player.get_largest_region(self.board)
-        if dice > 64:
-            dice = 64
-
-        areas = []
-        for area in self.current_player.get_areas():
-            areas.append(area)
-
-        while dice and areas:
-            area = random.choice(areas)
-            if not area.add_die():
-                areas.remove(area)
-            else:
-                if area not in affected_areas:
-                    affected_areas.append(area)
-                dice -= 1
+        dice = nb_reinforcements(player.get_reserve(), player.get_largest_region(self.board))
+
+        areas = player.get_areas()
+        added, dice = distribute_dice([MAX_DICE - area.get_dice() for area in areas], dice, self.rng)
+        affected_areas = [areas[i] for i in added]
+        for area, nb_added in zip(affected_areas, added.values()):
+            area.set_dice(area.get_dice() + nb_added)
 
         player.set_reserve(dice)
 
         self.set_next_player()
 
+        if self.recorder is not None:
+            self.recorder.end_turn(
+                player.get_name(),
+                {area.get_name(): nb_added for area, nb_added in zip(affected_areas, added.values())},
+                dice,
+                self.current_player.get_name()
+            )
+
         list_of_areas = {}
         for area in affected_areas:
-            list_of_areas[area.get_name()] = {
+            list_of_areas[str(area.get_name())] = {
                 'owner': area.get_owner_name(),
                 'dice': area.get_dice()
             }
@@ -329,8 +378,9 @@ class Game(object):
     def process_win(self, player_nick, player_name):
         self.summary.set_winner(player_nick)
         self.logger.info("Player {} ({}) wins!".format(player_nick, player_name))
-        for i in self.players:
-            self.send_message(self.players[i], 'game_end', winner=player_name)
+        self.broadcast_message('game_end', winner=player_name)
+        if self.recorder is not None:
+            self.recorder.game_end(max(player_name, 0))
 
     ##############
     # NETWORKING #
@@ -345,11 +395,10 @@ class Game(object):
 
         Returns
         -------
-        str
+        dict
             Decoded message from the client
         """
-        raw_message = self.client_sockets[player].recv(self.buffer)
-        msg = json.loads(raw_message.decode())
+        msg = self.client_sockets[player].receive()
         self.logger.debug("Got message from client {}; type: {}".format(player, msg['type']))
         return msg
 
@@ -370,34 +419,75 @@ class Game(object):
             Areas changed during the turn
         """
         self.logger.debug("Sending msg type '{}' to client {}".format(type, client.get_name()))
+        self.deliver_message(client, self.build_message(type, client, battle, winner, areas))
+
+    def broadcast_message(self, type, battle=None, winner=None, areas=None):
+        """Send the same message to all clients
+
+        The message is built and encoded only once.
+
+        Parameters
+        ----------
+        type : str
+            Type of message, one of 'battle', 'end_turn', 'game_end', and 'close_socket'
+        battle : dict
+            Result of a battle
+        winner : int
+            Winner of the game
+        areas : list of int
+            Areas changed during the turn
+        """
+        self.logger.debug("Broadcasting msg type '{}'".format(type))
+        self.deliver_broadcast(self.build_message(type, None, battle, winner, areas))
+
+    def build_message(self, type, client, battle=None, winner=None, areas=None):
+        """Build message for a client
+
+        Parameters
+        ----------
+        type : str
+            Type of message
+        client : Player
+            Recepient of the message, only needed for 'game_start' and 'game_state'
+        battle : dict
+            Result of a battle
+        winner : int
+            Winner of the game
+        areas : list of int
+            Areas changed during the turn
+
+        Returns
+        -------
+        dict
+        """
         if type == 'game_start':
             msg = self.get_state()
             msg['type'] = 'game_start'
             msg['player'] = client.get_name()
             msg['no_players'] = self.number_of_players
             msg['current_player'] = self.current_player.get_name()
-            msg['board'] = self.board.get_board()
+            msg['board'] = {str(name): area for name, area in self.board.get_board().items()}
             msg['order'] = self.players_order
 
         elif type == 'game_state':
-            msg = self.get_state()
+            msg = self.get_update()
             msg['type'] = 'game_state'
             msg['player'] = client.get_name()
             msg['no_players'] = self.number_of_players
             msg['current_player'] = self.current_player.get_name()
 
         elif type == 'battle':
-            msg = self.get_state()
+            msg = self.get_update()
             msg['type'] = 'battle'
             msg['result'] = battle
 
         elif type == 'end_turn':
-            msg = self.get_state()
+            msg = self.get_update()
             msg['type'] = 'end_turn'
             msg['areas'] = areas
             msg['current_player'] = self.current_player.get_name()
             msg['reserves'] = {
-                i: self.players[i].get_reserve() for i in self.players
+                str(i): self.players[i].get_reserve() for i in self.players
             }
 
         elif type == 'game_end':
@@ -409,8 +499,34 @@ class Game(object):
         elif type == 'close_socket':
             msg = {'type': 'close_socket'}
 
-        msg = json.dumps(msg)
-        client.send_message(msg + '\0')
+        return msg
+
+    def deliver_message(self, client, msg):
+        """Encode message and send it to a client
+
+        Parameters
+        ----------
+        client : Player
+            Recepient of the message
+        msg : dict
+            The message, keyed by strings only, as it is decoded by the client
+        """
+        client.send_message(msg)
+
+    def deliver_broadcast(self, msg):
+        """Encode message once for every encoding in use and send it to all clients
+
+        Parameters
+        ----------
+        msg : dict
+            The message, keyed by strings only, as it is decoded by the clients
+        """
+        frames = {}
+        for client in self.players.values():
+            encoding = client.get_encoding()
+            if encoding not in frames:
+                frames[encoding] = encode_message(msg, encoding)
+            client.send_data(frames[encoding])
 
     def create_socket(self):
         """Initiate server socket
@@ -435,6 +551,8 @@ class Game(object):
         for i in range(1, self.number_of_players + 1):
             self.connect_client(i)
             hello_msg = self.get_message(i)
+            connection = self.client_sockets[i]
+            connection.encoding = connection.peer_encoding
             if hello_msg['type'] != 'client_desc':
                 raise ValueError("Client send a wrong-type hello message '{}'".format(hello_msg))
             self.players[i].set_nickname(hello_msg['nickname'])
@@ -445,14 +563,14 @@ class Game(object):
         """Assign client to an instance of Player
         """
         sock, client_address = self.socket.accept()
-        self.add_client(sock, client_address, i)
+        self.add_client(Connection(sock), client_address, i)
 
     def add_client(self, connection, client_address, i):
         """Add client's socket to an instance of Player
 
         Parameters
         ----------
-        connection : socket
+        connection : Connection
             Client's socket
         client_addres : (str, int)
             Client's address and port number
@@ -504,7 +622,7 @@ class Game(object):
             self.players[i] = Player(i)
 
         self.players_order = list(range(1, self.number_of_players + 1))
-        random.shuffle(self.players_order)
+        self.rng.shuffle(self.players_order)
 
         self.set_first_player()
         self.logger.debug("Player order {0}".format(self.players_order))
@@ -538,5 +656,17 @@ class Game(object):
 
         self.set_first_player()
 
+    def start_record(self):
+        """Write the initial state of the game into its record
+        """
+        areas = self.board.areas.values()
+        self.recorder.start(
+            self.board.get_board(),
+            {area.get_name(): area.get_owner_name() for area in areas},
+            {area.get_name(): area.get_dice() for area in areas},
+            self.players_order,
+            [self.players[name].get_nickname() for name in self.players_order]
+        )
+
     def report_player_order(self):
         self.logger.info('Player order: {}'.format([(name, self.players[name].nickname) for name in self.players_order]))
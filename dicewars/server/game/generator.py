@@ -1,9 +1,54 @@
+import functools
 import hexutil
 from random import randint, choice as rand_choice, shuffle
 
 
+# offsets of neighbours in the order of hexutil.Hex.neighbours()
+NEIGHBOUR_OFFSETS = ((2, 0), (1, 1), (-1, 1), (-2, 0), (-1, -1), (1, -1))
+
+# states of hexes during the generation
+FREE = 0
+BORDER = 1  # free hex adjacent to a taken one
+TAKEN = 2
+
+
+@functools.lru_cache(maxsize=None)
+def hex_grid(min_x, max_x, min_y, max_y):
+    """Number hexes of a board row by row
+
+    Parameters
+    ----------
+    min_x, max_x, min_y, max_y : int
+        Boundary values for Hex coordinates
+
+    Returns
+    -------
+    (tuple of (int, int), dict of (int, int): int, tuple of tuple of int)
+        Coordinates of the hexes, their numbers given the coordinates and numbers
+        of the six neighbours of every hex, -1 for neighbours off the board
+    """
+    hexes = []
+    index = {}
+    for y in range(min_y, max_y + 1):
+        first_x = min_x if y % 2 == 0 else min_x + 1
+        for x in range(first_x, first_x + max_x - min_x + 1, 2):
+            index[(x, y)] = len(hexes)
+            hexes.append((x, y))
+    neighbours = tuple(
+        tuple(index.get((x + dx, y + dy), -1) for dx, dy in NEIGHBOUR_OFFSETS)
+        for x, y in hexes
+    )
+    return tuple(hexes), index, neighbours
+
+
 class BoardGenerator(object):
     """Generator of game board
+
+    Hexes of the board are numbered row by row. The state of every hex, the area
+    it belongs to and its neighbours are kept in lists indexed by these numbers,
+    so that no Hex objects are needed until the board is complete. Random numbers
+    are drawn in the same order as they always were, a seed of the global random
+    generator therefore gives the same board as with earlier versions.
     """
     def __init__(self):
         """
@@ -11,16 +56,21 @@ class BoardGenerator(object):
         ----------
         min_x, max_x, min_y, max_y : int
             Boundary values for Hex coordinates
+        hexes, index, neighbours
+            Numbering of hexes of the board shared by all generators, see hex_grid()
+        coordinates : list of int
+            Hexes considered for starting a new area
         """
         self.min_x = -32
         self.max_x = 30
         self.min_y = -14
         self.max_y = 13
-        self.coordinates = [(x, y) for x in range(self.min_x + 2, self.max_x, 2)
-                            for y in range(self.min_y + 1, self.max_y)]
-        for i in range(len(self.coordinates)):
-            if self.coordinates[i][1] % 2 == 1:
-                self.coordinates[i] = (self.coordinates[i][0] + 1, self.coordinates[i][1])
+        self.hexes, self.index, self.neighbours = hex_grid(self.min_x, self.max_x, self.min_y, self.max_y)
+
+        self.coordinates = []
+        for x in range(self.min_x + 2, self.max_x, 2):
+            for y in range(self.min_y + 1, self.max_y):
+                self.coordinates.append(self.index[(x + y % 2, y)])
 
     def random_hex(self):
         """Get random Hex from the board
@@ -49,22 +99,21 @@ class BoardGenerator(object):
             Dictionary of areas in the game board. Contains names of adjacent
             areas and coordinates of the hexes of each area
         """
-        self.a = {}
+        self.state = [FREE] * len(self.hexes)
+        self.owners = [0] * len(self.hexes)
         self.areas = {}
-        for i in range(self.min_y, self.max_y + 1):
-            self.a[i] = {}
-            if i % 2 == 0:
-                for j in range(self.min_x, self.max_x + 1, 2):
-                    self.a[i][j] = 0
-            else:
-                for j in range(self.min_x + 1, self.max_x + 2, 2):
-                    self.a[i][j] = 0
 
         for i in range(1, 30 + randint(0, 2)):
             self.__create_area(i)
-        self.__add_neighbours()
-
-        return self.areas
+        adjacent_areas = self.__add_neighbours()
+
+        return {
+            area: {
+                'hexes': [hexutil.Hex(*self.hexes[h]) for h in hexes],
+                'neighbours': adjacent_areas[area],
+            }
+            for area, hexes in self.areas.items()
+        }
 
     def __create_area(self, area):
         """Create an area from Hexes
@@ -82,22 +131,20 @@ class BoardGenerator(object):
     def __fill_area(self, area):
         """Fills empty Hexes inside the area
         """
-        for h in self.areas[area]['hexes']:
-            for n in h.neighbours():
-                counter = 0
-                if n.y not in self.a or n.x not in self.a[n.y] or self.a[n.y][n.x] != 1:
+        state = self.state
+        owners = self.owners
+        for h in self.areas[area]:
+            for n in self.neighbours[h]:
+                if n < 0 or state[n] != BORDER:
                     break
-                for nn in n.neighbours():
-                    if (nn.y not in self.a or nn.x not in self.a[nn.y]):
-                        counter += 1
-                    elif nn not in self.areas[area]['hexes']:
+                counter = 0
+                for nn in self.neighbours[n]:
+                    if nn < 0 or owners[nn] != area:
                         counter += 1
-                    if counter > 2:
-                        break
+                        if counter > 2:
+                            break
                 if counter <= 2:
-                    self.__retag_neighbouring_hexes(n)
-                    self.a[n.y][n.x] = 2
-                    self.areas[area]['hexes'].append(n)
+                    self.__take_hex(n, area)
                     break
 
     def __add_hex_to_area(self, area):
@@ -113,88 +160,83 @@ class BoardGenerator(object):
     def __start_first_area(self):
         """Add first Hex to first area on the board
         """
-        self.h = self.random_hex()
+        h = self.random_hex()
+        self.h = self.index[(h.x, h.y)]
         self.possible_hexes.append(self.h)
-        self.a[self.h.y][self.h.x] = 2
-        self.__retag_neighbouring_hexes(self.h)
-        self.areas[1] = {
-            'hexes': [self.h],
-            'neighbours': []
-        }
+        self.areas[1] = []
+        self.__take_hex(self.h, 1)
         return True
 
     def __start_area(self, area):
         """Add first Hex to an area
         """
         shuffle(self.coordinates)
-        for coord in self.coordinates:
-            x = coord[0]
-            y = coord[1]
-            if self.a[y][x] == 0:
-                h = hexutil.Hex(x, y)
-                for n in h.neighbours():
-                    if n.y in self.a and n.x in self.a[n.y] and self.a[n.y][n.x] == 1:
+        state = self.state
+        for h in self.coordinates:
+            if state[h] == FREE:
+                for n in self.neighbours[h]:
+                    if n >= 0 and state[n] == BORDER:
                         self.h = h
                         self.possible_hexes.append(h)
-                        self.a[h.y][h.x] = 2
-                        self.__retag_neighbouring_hexes(h)
-                        self.areas[area] = {
-                            'hexes': [h],
-                            'neighbours': []
-                        }
+                        self.areas[area] = []
+                        self.__take_hex(h, area)
                         return True
 
     def __grow_area(self, area):
         """Add hex to already existing area
         """
         while True:
-            if self.h != self.areas[area]['hexes'][0] or self.h not in self.possible_hexes:
+            if self.h != self.areas[area][0] or self.h not in self.possible_hexes:
                 self.h = rand_choice(self.possible_hexes)
 
             n = self.__neighbour()
-            if n:
+            if n >= 0:
                 self.possible_hexes.append(n)
-                self.a[n.y][n.x] = 2
-                self.__retag_neighbouring_hexes(n)
-                self.areas[area]['hexes'].append(n)
+                self.__take_hex(n, area)
                 return True
 
             else:
                 self.possible_hexes.remove(self.h)
                 if not self.possible_hexes:
-                    self.areas.pop(area)
+                    for h in self.areas.pop(area):
+                        self.owners[h] = 0
                     return False
 
-    def __retag_neighbouring_hexes(self, hex):
-        """Mark adjacent Hexes as neighbours to already used Hex
+    def __take_hex(self, h, area):
+        """Add Hex to an area and mark adjacent Hexes as neighbours to a used Hex
         """
-        for n in hex.neighbours():
-            if n.y in self.a and n.x in self.a[n.y]:
-                if self.a[n.y][n.x] == 0:
-                    self.a[n.y][n.x] = 1
+        state = self.state
+        state[h] = TAKEN
+        self.owners[h] = area
+        self.areas[area].append(h)
+        for n in self.neighbours[h]:
+            if n >= 0 and state[n] == FREE:
+                state[n] = BORDER
 
     def __neighbour(self):
-        """Get random adjacent Hex
+        """Get random adjacent Hex, -1 if there is none
         """
-        ns = self.h.neighbours()
+        ns = list(self.neighbours[self.h])
         shuffle(ns)
         for n in ns:
-            if n.y in self.a and n.x in self.a[n.y]:
-                if self.a[n.y][n.x] != 2:
-                    return n
-        return False
+            if n >= 0 and self.state[n] != TAKEN:
+                return n
+        return -1
 
     def __add_neighbours(self):
-        """Add neighbours of an area to the areas dict based
+        """Find names of adjacent areas of every area
+
+        Returns
+        -------
+        dict of int: list of int
         """
-        for a in self.areas:
-            for h in self.areas[a]['hexes']:
-                for n in h.neighbours():
-                    if (n.y in self.a and n.x in self.a[n.y] and self.a[n.y][n.x] == 2
-                        and n not in self.areas[a]['hexes']):
-                        for k in self.areas:
-                            if a == k:
-                                continue
-                            if n in self.areas[k]['hexes']:
-                                if k not in self.areas[a]['neighbours']:
-                                    self.areas[a]['neighbours'].append(k)
+        owners = self.owners
+        adjacent_areas = {}
+        for a, hexes in self.areas.items():
+            adjacent_areas[a] = []
+            for h in hexes:
+                for n in self.neighbours[h]:
+                    k = owners[n] if n >= 0 else 0
+                    if k and k != a and k not in adjacent_areas[a]:
+                        adjacent_areas[a].append(k)
+        return adjacent_areas
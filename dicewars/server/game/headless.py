@@ -0,0 +1,185 @@
+from contextlib import contextmanager
+import random
+
+from dicewars.client.ai_driver import AIDriver
+from dicewars.client.game.local_game import LocalGame
+from dicewars.common.record import GameRecorder
+
+from .game import Game
+from .initialization import create_board
+
+
+class LocalClient(object):
+    """AI-driven client living in the same process as the server
+
+    The AI is given its own state of the global random generator, so that
+    it draws the same numbers as in a client process seeded the same way
+    and it does not interfere with dice rolls of the server.
+    """
+    def __init__(self, nickname, ai_constructor, seed=None):
+        """
+        Parameters
+        ----------
+        nickname : str
+            Name reported to the server in place of the hello message
+        ai_constructor : callable
+            Class of the AI
+        seed : int
+            Seed of the random generator used by the AI
+
+        Attributes
+        ----------
+        driver : AIDriver
+            Driver of the AI, created upon the 'game_start' message
+        """
+        self.nickname = nickname
+        self.ai_constructor = ai_constructor
+        self.random_state = random.Random(seed).getstate()
+        self.driver = None
+
+    def send_message(self, msg):
+        """Deliver message from the server and let the AI react to it
+
+        Parameters
+        ----------
+        msg : dict
+        """
+        if msg['type'] == 'game_start':
+            with self.own_random():
+                self.driver = AIDriver(LocalGame(msg), self.ai_constructor)
+            return
+
+        if self.driver.handle_server_message(msg) and self.driver.is_on_turn():
+            with self.own_random():
+                self.driver.make_turn()
+
+    def get_message(self):
+        """Pick up the command of the AI
+
+        Returns
+        -------
+        dict
+        """
+        outbox = self.driver.game.outbox
+        if not outbox:
+            raise RuntimeError("Client {} has no message for the server".format(self.nickname))
+        return outbox.popleft()
+
+    @contextmanager
+    def own_random(self):
+        """Swap in the client's state of the global random generator
+        """
+        server_state = random.getstate()
+        random.setstate(self.random_state)
+        try:
+            yield
+        finally:
+            self.random_state = random.getstate()
+            random.setstate(server_state)
+
+
+class HeadlessGame(Game):
+    """Game played by LocalClients without sockets, threads or subprocesses
+
+    Messages are handed over to the clients as dictionaries in the same form
+    the clients would decode them from the wire. Only changes of the game
+    state are sent after the game start.
+    """
+    def __init__(self, board, area_ownership, clients, recorder=None):
+        """
+        Parameters
+        ----------
+        board : Board
+        area_ownership : dict of int: int
+        clients : list of LocalClient
+            Clients in the order of play
+        recorder : GameRecorder
+            Writer of the record of the game
+        """
+        self.clients = clients
+        nicknames = [client.nickname for client in clients]
+        super().__init__(board, area_ownership, len(clients), None, None, nicknames, delta=True, recorder=recorder)
+
+    def run(self):
+        """Play the game till its end
+
+        Returns
+        -------
+        GameSummary
+        """
+        for i in range(1, self.number_of_players + 1):
+            self.send_message(self.players[i], 'game_state')
+        while True:
+            self.logger.debug("Current player {}".format(self.current_player.get_name()))
+            self.handle_player_turn()
+            if self.check_win_condition():
+                return self.summary
+
+    ##############
+    # NETWORKING #
+    ##############
+    def get_message(self, player):
+        msg = self.client_sockets[player].get_message()
+        self.logger.debug("Got message from client {}; type: {}".format(player, msg['type']))
+        return msg
+
+    def deliver_message(self, client, msg):
+        self.client_sockets[client.get_name()].send_message(msg)
+
+    def deliver_broadcast(self, msg):
+        for client in self.players.values():
+            self.deliver_message(client, msg)
+
+    def create_socket(self):
+        pass
+
+    def connect_clients(self):
+        """Assign clients to players in the given order
+
+        The LocalClients stand in for sockets, so that they get renumbered
+        along with players when the order of play is adjusted.
+        """
+        self.client_sockets = {}
+        for i, client in enumerate(self.clients, start=1):
+            self.client_sockets[i] = client
+            self.players[i].set_nickname(client.nickname)
+
+    def close_connections(self):
+        pass
+
+
+def run_headless_game(clients, board_seed=None, ownership_seed=None, strength_seed=None, fixed=None, board_cache=None,
+                      record=None):
+    """Play a game among AIs inside the current process
+
+    The seeds have the meaning of -b, -o, -s and -f of scripts/server.py.
+    Given the same seeds (including the clients' ones), the game goes the same
+    way as if it was played through the server and client processes, as long as
+    the AIs are not affected by timing. The state of the global random generator
+    is restored afterwards.
+
+    Parameters
+    ----------
+    clients : list of LocalClient
+        Clients in the order of play
+    board_seed, ownership_seed, strength_seed, fixed : int
+    board_cache : BoardCache
+        Cache of boards, see create_board()
+    record : file
+        Binary file to write the record of the game to, see dicewars.common.record
+
+    Returns
+    -------
+    GameSummary
+    """
+    caller_random_state = random.getstate()
+    try:
+        board, area_ownership = create_board(len(clients), board_seed, ownership_seed, strength_seed, board_cache)
+        random.seed(fixed)
+        recorder = None
+        if record is not None:
+            recorder = GameRecorder(record, board_seed, ownership_seed, strength_seed, fixed)
+        game = HeadlessGame(board, area_ownership, clients, recorder)
+        return game.run()
+    finally:
+        random.setstate(caller_random_state)
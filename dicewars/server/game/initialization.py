@@ -0,0 +1,93 @@
+import random
+from itertools import cycle
+
+from .board import Board
+from .generator import BoardGenerator
+
+
+def area_player_mapping(nb_players, nb_areas):
+    assignment = {}
+    unassigned_areas = list(range(1, nb_areas+1))
+    player_cycle = cycle(range(1, nb_players+1))
+
+    while unassigned_areas:
+        player_no = next(player_cycle)
+        area_no = random.choice(unassigned_areas)
+        assignment[area_no] = player_no
+        unassigned_areas.remove(area_no)
+
+    return assignment
+
+
+def players_areas(ownership, the_player):
+    return [area for area, player in ownership.items() if player == the_player]
+
+
+def assign_dice(board, nb_players, ownership):
+    dice_total = 3 * board.get_number_of_areas() - random.randint(0, 5)
+    players_processed = 0
+
+    for player in range(1, nb_players+1):
+        player_dice = int(round(dice_total / (nb_players - players_processed)))
+        dice_total -= player_dice
+
+        available_areas = [board.get_area_by_name(area_name) for area_name in players_areas(ownership, player)]
+
+        # each area has to have at least one die
+        for area in available_areas:
+            area.set_dice(1)
+            player_dice -= 1
+
+        while player_dice and available_areas:
+            area = random.choice(available_areas)
+            if not area.add_die():  # adding a die to area failed means that area is full
+                available_areas.remove(area)
+            else:
+                player_dice -= 1
+
+        players_processed += 1
+
+
+def create_board(nb_players, board_seed=None, ownership_seed=None, strength_seed=None, cache=None):
+    """Generate a board and distribute its areas and dice among players
+
+    Every phase reseeds the global random generator with its own seed,
+    a seed of None makes the phase effectively random. A board loaded from
+    the cache leaves the global random generator untouched, callers reseed
+    it afterwards anyway.
+
+    Parameters
+    ----------
+    nb_players : int
+    board_seed : int
+        Seed for the geometry of the board
+    ownership_seed : int
+        Seed for the assignment of areas to players
+    strength_seed : int
+        Seed for the assignment of dice to areas
+    cache : BoardCache
+        Cache to load the board from, newly generated boards are stored in it
+
+    Returns
+    -------
+    (Board, dict of int: int)
+        The board and the mapping of areas' names to their owners' names
+    """
+    if cache is not None:
+        cached = cache.get(nb_players, board_seed, ownership_seed, strength_seed)
+        if cached is not None:
+            return cached
+
+    random.seed(board_seed)
+    generator = BoardGenerator()
+    board = Board(generator.generate_board())
+
+    random.seed(ownership_seed)
+    area_ownership = area_player_mapping(nb_players, board.get_number_of_areas())
+
+    random.seed(strength_seed)
+    assign_dice(board, nb_players, area_ownership)
+
+    if cache is not None:
+        cache.put(nb_players, board_seed, ownership_seed, strength_seed, board, area_ownership)
+    return board, area_ownership
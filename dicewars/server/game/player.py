@@ -16,13 +16,15 @@ class Player(object):
         ----------
         areas : list of Area
             Areas belonging to the player
+        areas_changed : bool
+            Whether areas have been added or removed since they were last ordered
         dice_reserve : int
             Number of dice in player's reserve
         client_addr : str
             Client's IP address
         client_port : int
             Client's port number
-        socket : socket
+        socket : Connection
             Client's socket
         """
 
@@ -31,6 +33,7 @@ class Player(object):
         self.logger = logging.getLogger('SERVER')
 
         self.areas = []
+        self.areas_changed = False
         self.client_addr = None
         self.client_port = None
         self.socket = None
@@ -49,13 +52,14 @@ class Player(object):
             self.logger.warning("Area {0} already belonging to player {1}.".format(area.get_name(), self.name))
         else:
             self.areas.append(area)
+            self.areas_changed = True
 
     def assign_client(self, socket, client_addr):
         """Assign client's socket, IP address, and port number
 
         Parameters
         ----------
-        socket : socket
+        socket : Connection
         client_addr : (str, int)
             IP address and port number
         """
@@ -78,6 +82,10 @@ class Player(object):
     def get_largest_region(self, board):
         """Get player's score
 
+        The player's areas get ordered region by region, in the order of
+        breadth-first search from the first area of each region, as dice
+        are distributed among them in this order at the end of turn.
+
         Parameters
         ----------
         board : Board
@@ -87,41 +95,35 @@ class Player(object):
         int
             Player's score
         """
-        largest_region_size = 0
-        areas_to_test = self.areas
-        player_areas = []
+        if self.areas_changed:
+            self.areas = self.order_areas_by_regions()
+            self.areas_changed = False
 
-        if not areas_to_test:
-            return 0
+        return board.regions.get_score(self.name)
 
-        areas_in_current_region = [areas_to_test[0]]
+    def order_areas_by_regions(self):
+        """Get player's areas ordered region by region
 
-        while areas_to_test:
-            areas_already_tested = []
-            while areas_in_current_region:
-                current_area = areas_in_current_region[0]
-                areas_in_current_region.remove(current_area)
-                areas_already_tested.append(current_area)
+        Returns
+        -------
+        list of Area
+        """
+        areas_to_test = set(self.areas)
+        player_areas = []
 
+        for first_area in self.areas:
+            if first_area not in areas_to_test:
+                continue
+            areas_to_test.remove(first_area)
+            region = [first_area]
+            for current_area in region:
                 for area in current_area.get_adjacent_areas():
-                    if (area not in areas_already_tested and
-                        area not in areas_in_current_region):
-                        if area.get_owner_name() == self.name:
-                            areas_in_current_region.append(area)
-
-            if len(areas_already_tested) > largest_region_size:
-                largest_region_size = len(areas_already_tested)
-
-            for area in areas_already_tested:
-                if area in areas_to_test:
-                    areas_to_test.remove(area)
-                    player_areas.append(area)
-
-            if areas_to_test:
-                areas_in_current_region = [areas_to_test[0]]
+                    if area in areas_to_test:
+                        areas_to_test.remove(area)
+                        region.append(area)
+            player_areas.extend(region)
 
-        self.areas = player_areas
-        return largest_region_size
+        return player_areas
 
     def get_name(self):
         """Return player's name
@@ -153,12 +155,28 @@ class Player(object):
                                 self.name))
         else:
             self.areas.remove(area)
+            self.areas_changed = True
+
+    def get_encoding(self):
+        """Return encoding of messages for the Player's client
+        """
+        return self.socket.encoding
 
     def send_message(self, msg):
         """Send message msg to the Player's client
         """
         try:
-            self.socket.sendall(msg.encode())
+            self.socket.send(msg)
+        except socket.error as e:
+            self.logger.error("Connection to client {0} broken".format(
+                              self.name))
+            raise e
+
+    def send_data(self, data):
+        """Send encoded message to the Player's client
+        """
+        try:
+            self.socket.send_data(data)
         except socket.error as e:
             self.logger.error("Connection to client {0} broken".format(
                               self.name))
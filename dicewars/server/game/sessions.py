@@ -0,0 +1,371 @@
+import asyncio
+import logging
+import random
+import sys
+
+from dicewars.common.protocol import encode_message, read_message
+
+from .game import Game
+from .initialization import create_board
+
+
+DEFAULT_SETTINGS = {
+    'players': 2,
+    'board': None,
+    'ownership': None,
+    'strength': None,
+    'fixed': None,
+    'order': None,
+}
+MAX_PLAYERS = 8
+
+
+def check_hello(hello_msg):
+    """Check the hello message of a client of the MultiGameServer
+
+    Parameters
+    ----------
+    hello_msg : dict
+
+    Raises
+    ------
+    ValueError
+        If the message is malformed
+    """
+    if not isinstance(hello_msg, dict) or hello_msg.get('type') != 'client_desc':
+        raise ValueError("not a client description")
+    if not isinstance(hello_msg.get('game_id'), (str, int)):
+        raise ValueError("missing or invalid game_id")
+    if not isinstance(hello_msg.get('nickname'), str):
+        raise ValueError("missing or invalid nickname")
+    if not isinstance(hello_msg.get('game', {}), dict):
+        raise ValueError("game settings are not a dictionary")
+
+
+def check_settings(settings):
+    """Check settings of a game, as given by its first client
+
+    Parameters
+    ----------
+    settings : dict
+        Settings with keys of DEFAULT_SETTINGS
+
+    Raises
+    ------
+    ValueError
+        If the settings are invalid
+    """
+    unknown = set(settings) - set(DEFAULT_SETTINGS)
+    if unknown:
+        raise ValueError("unknown settings {}".format(sorted(unknown)))
+
+    players = settings['players']
+    if type(players) is not int or not 2 <= players <= MAX_PLAYERS:
+        raise ValueError("number of players has to be from 2 to {}".format(MAX_PLAYERS))
+    for key in ('board', 'ownership', 'strength', 'fixed'):
+        if settings[key] is not None and type(settings[key]) is not int:
+            raise ValueError("seed '{}' has to be an integer".format(key))
+
+    order = settings['order']
+    if order is not None:
+        if (not isinstance(order, list) or len(order) != players
+                or not all(isinstance(nick, str) for nick in order) or len(set(order)) != players):
+            raise ValueError("order has to list distinct nicknames of all players")
+
+
+class RemoteClient(object):
+    """Client connected to the MultiGameServer
+    """
+    def __init__(self, nickname, reader, writer, encoding):
+        """
+        Parameters
+        ----------
+        nickname : str
+            Nickname from the hello message
+        reader : asyncio.StreamReader
+        writer : asyncio.StreamWriter
+        encoding : int
+            Encoding of the hello message, used for all messages to the client
+        """
+        self.nickname = nickname
+        self.reader = reader
+        self.writer = writer
+        self.encoding = encoding
+
+
+class GameSession(Game):
+    """Game played over asyncio streams, alongside other games in the same process
+
+    Every session draws player order and dice rolls from its own random
+    generator, so that it goes the same way as a game of scripts/server.py
+    run with the same seeds.
+    """
+    def __init__(self, game_id, settings, clients, delta=False, board_cache=None):
+        """
+        Parameters
+        ----------
+        game_id
+            Identifier of the game given by the clients
+        settings : dict
+            Number of players, seeds and nicknames order, see DEFAULT_SETTINGS
+        clients : list of RemoteClient
+            Clients in the order of their connection
+        delta : bool
+            Send only changes of the game state after the game start
+        board_cache : BoardCache
+            Cache of boards, see create_board()
+        """
+        self.game_id = game_id
+        self.clients = clients
+        board, area_ownership = create_board(
+            settings['players'], settings['board'], settings['ownership'], settings['strength'], board_cache
+        )
+        super().__init__(
+            board, area_ownership, settings['players'], None, None, settings['order'],
+            delta=delta, rng=random.Random(settings['fixed'])
+        )
+
+    async def run(self):
+        """Play the game till its end
+
+        Returns
+        -------
+        GameSummary
+            Summary of the game, None if it was interrupted
+        """
+        try:
+            for i in range(1, self.number_of_players + 1):
+                self.send_message(self.players[i], 'game_state')
+            while True:
+                self.logger.debug("Game {}: current player {}".format(self.game_id, self.current_player.get_name()))
+                msg = await self.receive_message(self.current_player.get_name())
+                self.handle_command(msg)
+                if self.check_win_condition():
+                    await self.drain()
+                    return self.summary
+                await self.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError) as e:
+            self.logger.error("Connection to client in game {} failed: {}".format(self.game_id, e))
+            return None
+        except (KeyError, AttributeError, TypeError) as e:
+            self.logger.error("Client in game {} sent an invalid command: {!r}".format(self.game_id, e))
+            return None
+        finally:
+            self.close_connections()
+
+    ##############
+    # NETWORKING #
+    ##############
+    async def receive_message(self, player):
+        """Wait for message from client
+
+        Parameters
+        ----------
+        player : int
+            Name of the client
+
+        Returns
+        -------
+        dict
+        """
+        _, msg = await read_message(self.client_sockets[player].reader)
+        self.logger.debug("Got message from client {}; type: {}".format(player, msg['type']))
+        return msg
+
+    def get_message(self, player):
+        raise RuntimeError("Messages of a GameSession are received by receive_message()")
+
+    def deliver_message(self, client, msg):
+        remote_client = self.client_sockets[client.get_name()]
+        remote_client.writer.write(encode_message(msg, remote_client.encoding))
+
+    def deliver_broadcast(self, msg):
+        frames = {}
+        for client in self.players.values():
+            remote_client = self.client_sockets[client.get_name()]
+            if remote_client.encoding not in frames:
+                frames[remote_client.encoding] = encode_message(msg, remote_client.encoding)
+            remote_client.writer.write(frames[remote_client.encoding])
+
+    async def drain(self):
+        """Wait until messages are handed over to the operating system
+        """
+        await asyncio.gather(*(client.writer.drain() for client in self.clients))
+
+    def create_socket(self):
+        pass
+
+    def connect_clients(self):
+        """Assign clients to players in the order of their connection
+        """
+        self.client_sockets = {}
+        for i, client in enumerate(self.clients, start=1):
+            self.client_sockets[i] = client
+            self.players[i].set_nickname(client.nickname)
+
+    def close_connections(self):
+        for client in self.clients:
+            client.writer.close()
+
+
+class Lobby(object):
+    """Clients waiting for the rest of players of their game
+    """
+    def __init__(self, settings):
+        """
+        Parameters
+        ----------
+        settings : dict
+            Settings of the game
+
+        Attributes
+        ----------
+        clients : list of RemoteClient
+        watchers : dict of RemoteClient: asyncio.Task
+            Reads of waiting clients, which finish when a client disconnects
+        started : bool
+            Whether all players have connected
+        finished : asyncio.Future
+            Done when the game is over
+        """
+        self.settings = settings
+        self.clients = []
+        self.watchers = {}
+        self.started = False
+        self.finished = asyncio.get_running_loop().create_future()
+
+
+class MultiGameServer(object):
+    """Server hosting any number of concurrent games on a single port
+
+    Clients give the identifier of the game they want to join as 'game_id'
+    in their hello message. The first client of a game can set the game up
+    by 'game', a dictionary with keys of DEFAULT_SETTINGS, which have the
+    meaning of -n, -b, -o, -s, -f and -r of scripts/server.py. Settings it
+    does not give are taken from the defaults of the server. The game starts
+    once all its players have connected.
+    """
+    def __init__(self, addr, port, defaults=None, delta=False, board_cache=None):
+        """
+        Parameters
+        ----------
+        addr : str
+            IP address of the server
+        port : int
+            Port number
+        defaults : dict
+            Default settings of games, overriding DEFAULT_SETTINGS
+        delta : bool
+            Send only changes of the game state after the game start
+        board_cache : BoardCache
+            Cache of boards shared by all games, see create_board()
+        """
+        self.logger = logging.getLogger('SERVER')
+        self.address = addr
+        self.port = port
+        self.delta = delta
+        self.board_cache = board_cache
+        self.defaults = dict(DEFAULT_SETTINGS)
+        if defaults:
+            self.defaults.update(defaults)
+
+        self.lobbies = {}
+
+    async def start(self):
+        """Start accepting clients
+
+        Returns
+        -------
+        asyncio.Server
+        """
+        server = await asyncio.start_server(self.handle_client, self.address, self.port)
+        self.logger.debug("Server socket at {}:{}".format(self.address, self.port))
+        return server
+
+    async def serve(self):
+        """Accept clients until cancelled
+        """
+        server = await self.start()
+        async with server:
+            await server.serve_forever()
+
+    async def handle_client(self, reader, writer):
+        """Place a newly connected client into its game, start the game when complete
+        """
+        try:
+            encoding, hello_msg = await read_message(reader)
+        except (asyncio.IncompleteReadError, ValueError) as e:
+            self.logger.error("Failed to receive hello message: {}".format(e))
+            writer.close()
+            return
+
+        try:
+            check_hello(hello_msg)
+            game_id = hello_msg['game_id']
+            lobby = self.lobbies.get(game_id)
+            if lobby is None:
+                settings = dict(self.defaults)
+                settings.update(hello_msg.get('game', {}))
+                check_settings(settings)
+                lobby = self.lobbies[game_id] = Lobby(settings)
+        except ValueError as e:
+            self.logger.error("Client sent a wrong hello message '{}': {}".format(hello_msg, e))
+            writer.close()
+            return
+
+        client = RemoteClient(hello_msg['nickname'], reader, writer, encoding)
+        lobby.clients.append(client)
+        self.logger.info("Client {} joined game {}".format(client.nickname, game_id))
+        if len(lobby.clients) < lobby.settings['players']:
+            await self.wait_in_lobby(game_id, lobby, client)
+            return
+
+        del self.lobbies[game_id]
+        lobby.started = True
+        for watcher in lobby.watchers.values():
+            watcher.cancel()
+        await asyncio.gather(*lobby.watchers.values(), return_exceptions=True)
+
+        summary = None
+        try:
+            session = GameSession(game_id, lobby.settings, lobby.clients, self.delta, self.board_cache)
+            summary = await session.run()
+        except Exception as e:
+            self.logger.error("Game {} failed: {!r}".format(game_id, e))
+            for lobby_client in lobby.clients:
+                lobby_client.writer.close()
+        finally:
+            lobby.finished.set_result(None)
+
+        if summary is not None:
+            self.report(game_id, summary)
+
+    async def wait_in_lobby(self, game_id, lobby, client):
+        """Wait for the end of the game, or leave the lobby if the client disconnects before it starts
+
+        Clients do not send anything before the game starts, so anything they
+        send while waiting is taken as leaving the lobby.
+        """
+        watcher = lobby.watchers[client] = asyncio.ensure_future(client.reader.read(1))
+        await asyncio.wait([watcher, lobby.finished], return_when=asyncio.FIRST_COMPLETED)
+        if lobby.started:
+            await lobby.finished
+            return
+
+        self.logger.info("Client {} left game {}".format(client.nickname, game_id))
+        lobby.clients.remove(client)
+        del lobby.watchers[client]
+        client.writer.close()
+        if not lobby.clients:
+            del self.lobbies[game_id]
+
+    def report(self, game_id, summary):
+        """Report result of a finished game
+
+        Parameters
+        ----------
+        game_id
+        summary : GameSummary
+        """
+        sys.stdout.write('Game: {}\n{}'.format(game_id, summary))
+        sys.stdout.flush()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+
+from argparse import ArgumentParser
+import sys
+
+from dicewars.server.game.board_cache import BoardCache
+from dicewars.server.game.initialization import create_board
+
+
+def main():
+    """
+    Generate a corpus of boards into a board cache
+    """
+
+    parser = ArgumentParser(prog='Dice_Wars-board-cache')
+    parser.add_argument('cache', help="Board cache file, boards are appended to it")
+    parser.add_argument('-n', '--number-of-players', help="Numbers of players", type=int, nargs='+', default=[2])
+    parser.add_argument('-b', '--board', help="Seed of the first board", type=int, default=0)
+    parser.add_argument('-g', '--nb-boards', help="How many consecutive board seeds to generate", type=int, default=1)
+    parser.add_argument('-o', '--ownership', help="Random seed to be used for province assignment", type=int, default=42)
+    parser.add_argument('-s', '--strength', help="Random seed to be used for dice assignment", type=int, default=42)
+    parser.add_argument('-r', '--report', help="State the board number on the stdout", action='store_true')
+    args = parser.parse_args()
+
+    cache = BoardCache(args.cache)
+    for i in range(args.nb_boards):
+        if args.report:
+            sys.stdout.write('\r{}'.format(i))
+        for nb_players in args.number_of_players:
+            create_board(nb_players, args.board + i, args.ownership, args.strength, cache)
+    if args.report:
+        sys.stdout.write('\r')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,23 +1,17 @@
 #!/usr/bin/env python3
 from argparse import ArgumentParser
+import json
 import logging
 from PyQt5.QtWidgets import QApplication
 import sys
 import random
 
-import importlib
-
 from dicewars.client.game.game import Game
 from dicewars.client.ui import ClientUI
 from dicewars.client.ai_driver import AIDriver
+from dicewars.common.protocol import get_encoding
 
-from utils import get_logging_level, get_nickname
-
-
-def get_ai_constructor(ai_specification):
-    ai_module = importlib.import_module('dicewars.ai.{}'.format(ai_specification))
-
-    return ai_module.AI
+from utils import get_logging_level, get_nickname, get_ai_constructor
 
 
 def main():
@@ -29,6 +23,10 @@ def main():
     parser.add_argument('-d', '--debug', help="Enable debug output", default='WARN')
     parser.add_argument('-s', '--seed', help="Random seed for a client", type=int)
     parser.add_argument('--ai', help="Ai version")
+    parser.add_argument('-e', '--encoding', help="Encoding of messages, 'json' or 'msgpack'", default='json')
+    parser.add_argument('-g', '--game-id', help="Game to join on a multi-game server")
+    parser.add_argument('--game-settings', type=json.loads,
+                        help="Settings of the game on a multi-game server as JSON, e.g. '{\"players\": 3, \"board\": 11}'")
     args = parser.parse_args()
 
     random.seed(args.seed)
@@ -42,7 +40,11 @@ def main():
         'type': 'client_desc',
         'nickname': get_nickname(args.ai),
     }
-    game = Game(args.address, args.port, hello_msg)
+    if args.game_id is not None:
+        hello_msg['game_id'] = args.game_id
+    if args.game_settings is not None:
+        hello_msg['game'] = args.game_settings
+    game = Game(args.address, args.port, hello_msg, get_encoding(args.encoding))
 
     if args.ai:
         ai = AIDriver(game, get_ai_constructor(args.ai))
@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
+import os
 import sys
 from signal import signal, SIGCHLD
 from argparse import ArgumentParser
 
 from dicewars.server.game.summary import get_win_rates
-from utils import run_ai_only_game, ListStats, BoardDefinition
+from utils import run_ai_only_game, run_ai_only_game_in_process, ListStats, BoardDefinition
 
 
 parser = ArgumentParser(prog='Dice_Wars')
@@ -20,6 +21,9 @@ parser.add_argument('-l', '--logdir', help="Folder to store last running logs in
 parser.add_argument('-d', '--debug', action='store_true')
 parser.add_argument('--ai', help="Specify AI versions as a sequence of ints.", nargs='+')
 parser.add_argument('-r', '--report', help="State the game number on the stdout", action='store_true')
+parser.add_argument('--in-process', help="Play without starting server and clients", action='store_true')
+parser.add_argument('--board-cache', help="File to load generated boards from and store them in")
+parser.add_argument('--record-dir', help="Folder to write records of games to")
 
 procs = []
 
@@ -46,6 +50,9 @@ def main():
 
     signal(SIGCHLD, signal_handler)
 
+    if args.record_dir is not None:
+        os.makedirs(args.record_dir, exist_ok=True)
+
     if len(args.ai) < 2 or len(args.ai) > 8:
         print("Unsupported number of AIs")
         exit(1)
@@ -57,14 +64,29 @@ def main():
         try:
             board_seed = None if args.board is None else args.board + i
             board_definition = BoardDefinition(board_seed, args.ownership, args.strength)
-            game_summary = run_ai_only_game(
-                args.port, args.address, procs, args.ai,
-                board_definition,
-                fixed=args.fixed,
-                client_seed=args.client_seed,
-                logdir=args.logdir,
-                debug=args.debug,
-            )
+            record = None
+            if args.record_dir is not None:
+                record = os.path.join(args.record_dir, 'game-{}.dwr'.format(i))
+            if args.in_process:
+                game_summary = run_ai_only_game_in_process(
+                    args.ai,
+                    board_definition,
+                    fixed=args.fixed,
+                    client_seed=args.client_seed,
+                    board_cache=args.board_cache,
+                    record=record,
+                )
+            else:
+                game_summary = run_ai_only_game(
+                    args.port, args.address, procs, args.ai,
+                    board_definition,
+                    fixed=args.fixed,
+                    client_seed=args.client_seed,
+                    logdir=args.logdir,
+                    debug=args.debug,
+                    board_cache=args.board_cache,
+                    record=record,
+                )
             summaries.append(game_summary)
         except KeyboardInterrupt:
             for p in procs:
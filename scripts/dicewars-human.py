@@ -50,6 +50,7 @@ def main():
             "-n", str(len(args.ai) + 1),
             "-p", str(args.port),
             "-a", str(args.address),
+            "--delta",
         ]
         if args.board is not None:
             cmd.extend(['-b', str(args.board)])
@@ -2,9 +2,12 @@
 from signal import signal, SIGCHLD
 from argparse import ArgumentParser
 
+import copy
 import math
 import itertools
-from utils import run_ai_only_game, get_nickname, BoardDefinition, SingleLineReporter, PlayerPerformance
+import multiprocessing
+import os
+from utils import run_ai_only_game, run_ai_only_game_in_process, get_nickname, BoardDefinition, SingleLineReporter, PlayerPerformance
 from utils import TournamentCombatantsProvider, EvaluationCombatantsProvider
 from utils import column_t
 import random
@@ -25,6 +28,10 @@ parser.add_argument('-d', '--debug', action='store_true')
 parser.add_argument('-r', '--report', help="State the game number on the stdout", action='store_true')
 parser.add_argument('--save', help="Where to put pickled GameSummaries")
 parser.add_argument('--load', help="Which GameSummaries to start from")
+parser.add_argument('--in-process', help="Play without starting server and clients", action='store_true')
+parser.add_argument('--board-cache', help="File to load generated boards from and store them in")
+parser.add_argument('--record-dir', help="Folder to write records of games to")
+parser.add_argument('-j', '--jobs', help="How many games to play in parallel", type=int, default=1)
 
 procs = []
 
@@ -80,6 +87,87 @@ def rotational_permunations_generator(players):
     return len(players), all_rotations(players)
 
 
+def games_schedule(args, combatants_provider):
+    """List all games to be played as (board_no, rotation_no, nb_rotations, combatants, board_definition)
+
+    Draws from the global random generator exactly as playing the games one by one would.
+    """
+    schedule = []
+    boards_played = 0
+    for board_definition in board_definitions(args.board):
+        if boards_played == args.nb_boards:
+            break
+        boards_played += 1
+
+        combatants = combatants_provider.get_combatants(args.game_size)
+        nb_permutations, permutations_generator = rotational_permunations_generator(combatants)
+        for i, permuted_combatants in enumerate(permutations_generator):
+            schedule.append((boards_played, i, nb_permutations, permuted_combatants, board_definition))
+
+    return schedule
+
+
+def play_game(args, combatants, board_definition, record=None):
+    if args.in_process:
+        return run_ai_only_game_in_process(
+            combatants,
+            board_definition,
+            fixed=UNIVERSAL_SEED,
+            client_seed=UNIVERSAL_SEED,
+            board_cache=args.board_cache,
+            record=record,
+        )
+    else:
+        return run_ai_only_game(
+            args.port, args.address, procs, combatants,
+            board_definition,
+            fixed=UNIVERSAL_SEED,
+            client_seed=UNIVERSAL_SEED,
+            logdir=args.logdir,
+            debug=args.debug,
+            board_cache=args.board_cache,
+            record=record,
+        )
+
+
+worker_args = None
+
+
+def init_worker(args, workers_counter):
+    """Give the worker process its own server port and folder for logs
+    """
+    global worker_args
+
+    with workers_counter.get_lock():
+        worker_no = workers_counter.value
+        workers_counter.value += 1
+
+    worker_args = copy.copy(args)
+    worker_args.port = args.port + worker_no
+    if args.logdir is not None:
+        worker_args.logdir = os.path.join(args.logdir, 'worker-{}'.format(worker_no))
+        os.makedirs(worker_args.logdir, exist_ok=True)
+
+
+def record_path(args, game):
+    """Where to write the record of a game, None if games are not recorded
+    """
+    if args.record_dir is None:
+        return None
+    board_no, rotation_no, _, _, _ = game
+    return os.path.join(args.record_dir, 'board-{}-{}.dwr'.format(board_no, rotation_no + 1))
+
+
+def play_scheduled_game(game):
+    _, _, _, combatants, board_definition = game
+    return play_game(worker_args, combatants, board_definition, record_path(worker_args, game))
+
+
+def describe_game(game):
+    board_no, rotation_no, nb_rotations, combatants, _ = game
+    return '\r{} {}/{} {}'.format(board_no, rotation_no+1, nb_rotations, ' vs. '.join(combatants))
+
+
 def main():
     args = parser.parse_args()
     if args.ai_under_test is not None:
@@ -90,40 +178,44 @@ def main():
 
     signal(SIGCHLD, signal_handler)
 
+    if args.record_dir is not None:
+        os.makedirs(args.record_dir, exist_ok=True)
+
     if args.load:
         with open(args.load, 'rb') as f:
             all_games = pickle.load(f)
     else:
         all_games = []
 
-    boards_played = 0
+    schedule = games_schedule(args, combatants_provider)
+
     reporter = SingleLineReporter(not args.report)
+    pool = None
     try:
-        for board_definition in board_definitions(args.board):
-            if boards_played == args.nb_boards:
-                break
-            boards_played += 1
-
-            combatants = combatants_provider.get_combatants(args.game_size)
-            nb_permutations, permutations_generator = rotational_permunations_generator(combatants)
-            for i, permuted_combatants in enumerate(permutations_generator):
-                reporter.report('\r{} {}/{} {}'.format(boards_played, i+1, nb_permutations, ' vs. '.join(permuted_combatants)))
-                game_summary = run_ai_only_game(
-                    args.port, args.address, procs, permuted_combatants,
-                    board_definition,
-                    fixed=UNIVERSAL_SEED,
-                    client_seed=UNIVERSAL_SEED,
-                    logdir=args.logdir,
-                    debug=args.debug,
-                )
+        if args.jobs > 1:
+            # results come in the order of the schedule, making the tournament identical to a serial one
+            pool = multiprocessing.Pool(args.jobs, init_worker, (args, multiprocessing.Value('i', 0)))
+            for game, game_summary in zip(schedule, pool.imap(play_scheduled_game, schedule)):
+                reporter.report(describe_game(game))
                 all_games.append(game_summary)
+            pool.close()
+        else:
+            for game in schedule:
+                reporter.report(describe_game(game))
+                _, _, _, combatants, board_definition = game
+                all_games.append(play_game(args, combatants, board_definition, record_path(args, game)))
     except (Exception, KeyboardInterrupt) as e:
         import traceback
         traceback.print_exc()
         sys.stderr.write("Breaking the tournament because of {}\n".format(repr(e)))
+        if pool is not None:
+            pool.terminate()
         for p in procs:
             p.kill()
 
+    if pool is not None:
+        pool.join()
+
     reporter.clean()
 
     if args.save:
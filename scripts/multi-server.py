@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+from argparse import ArgumentParser
+import asyncio
+import logging
+
+from dicewars.server.game.board_cache import BoardCache
+from dicewars.server.game.sessions import MultiGameServer
+
+
+from utils import get_logging_level
+
+
+def main():
+    """
+    Server for many concurrent games of Dice Wars
+    """
+
+    parser = ArgumentParser(prog='Dice_Wars-multi-server')
+    parser.add_argument('-n', '--number-of-players', help="Default number of players", type=int, default=2)
+    parser.add_argument('-p', '--port', help="Server port", type=int, default=5005)
+    parser.add_argument('-a', '--address', help="Server address", default='127.0.0.1')
+    parser.add_argument('-d', '--debug', help="Enable debug output", default='WARN')
+    parser.add_argument('-b', '--board', help="Default random seed to be used for board creating", type=int)
+    parser.add_argument('-o', '--ownership', help="Default random seed to be used for province assignment", type=int)
+    parser.add_argument('-s', '--strength', help="Default random seed to be used for dice assignment", type=int)
+    parser.add_argument('-f', '--fixed', help="Default random seed to be used for player order and dice rolls", type=int)
+    parser.add_argument('--delta', action='store_true',
+                        help="Send only changes of the game state after the game start")
+    parser.add_argument('--board-cache', help="File to load generated boards from and store them in")
+    args = parser.parse_args()
+    log_level = get_logging_level(args)
+
+    logging.basicConfig(level=log_level)
+    logger = logging.getLogger('SERVER')
+    logger.debug("Command line arguments: {0}".format(args))
+
+    defaults = {
+        'players': args.number_of_players,
+        'board': args.board,
+        'ownership': args.ownership,
+        'strength': args.strength,
+        'fixed': args.fixed,
+    }
+    board_cache = BoardCache(args.board_cache) if args.board_cache else None
+    server = MultiGameServer(args.address, args.port, defaults, args.delta, board_cache)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        logger.info("Server interrupted.")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,9 +4,9 @@ from argparse import ArgumentParser
 import logging
 import random
 
-from itertools import cycle
-
-from dicewars.server.game import Board, BoardGenerator
+from dicewars.common.record import GameRecorder
+from dicewars.server.game.board_cache import BoardCache
+from dicewars.server.game.initialization import create_board
 # from dicewars.ai.xzaryb00.recording_server import RecordingGame as Game
 from dicewars.server.game import Game
 
@@ -14,49 +14,6 @@ from dicewars.server.game import Game
 from utils import get_logging_level
 
 
-def area_player_mapping(nb_players, nb_areas):
-    assignment = {}
-    unassigned_areas = list(range(1, nb_areas+1))
-    player_cycle = cycle(range(1, nb_players+1))
-
-    while unassigned_areas:
-        player_no = next(player_cycle)
-        area_no = random.choice(unassigned_areas)
-        assignment[area_no] = player_no
-        unassigned_areas.remove(area_no)
-
-    return assignment
-
-
-def players_areas(ownership, the_player):
-    return [area for area, player in ownership.items() if player == the_player]
-
-
-def assign_dice(board, nb_players, ownership):
-    dice_total = 3 * board.get_number_of_areas() - random.randint(0, 5)
-    players_processed = 0
-
-    for player in range(1, nb_players+1):
-        player_dice = int(round(dice_total / (nb_players - players_processed)))
-        dice_total -= player_dice
-
-        available_areas = [board.get_area_by_name(area_name) for area_name in players_areas(ownership, player)]
-
-        # each area has to have at least one die
-        for area in available_areas:
-            area.set_dice(1)
-            player_dice -= 1
-
-        while player_dice and available_areas:
-            area = random.choice(available_areas)
-            if not area.add_die():  # adding a die to area failed means that area is full
-                available_areas.remove(area)
-            else:
-                player_dice -= 1
-
-        players_processed += 1
-
-
 def main():
     """
     Server for Dice Wars
@@ -73,6 +30,10 @@ def main():
     parser.add_argument('-f', '--fixed', help="Random seed to be used for player order and dice rolls", type=int)
     parser.add_argument('-r', '--order', nargs='+',
                         help="Random seed to be used for dice assignment")
+    parser.add_argument('--delta', action='store_true',
+                        help="Send only changes of the game state after the game start")
+    parser.add_argument('--board-cache', help="File to load generated boards from and store them in")
+    parser.add_argument('--record', help="File to write the record of the game to")
     args = parser.parse_args()
     log_level = get_logging_level(args)
 
@@ -80,20 +41,26 @@ def main():
     logger = logging.getLogger('SERVER')
     logger.debug("Command line arguments: {0}".format(args))
 
-    random.seed(args.board)
-    generator = BoardGenerator()
-    board = Board(generator.generate_board())
+    board_cache = BoardCache(args.board_cache) if args.board_cache else None
+    board, area_ownership = create_board(
+        args.number_of_players, args.board, args.ownership, args.strength, board_cache
+    )
 
-    random.seed(args.ownership)
-    area_ownership = area_player_mapping(args.number_of_players, board.get_number_of_areas())
-
-    random.seed(args.strength)
-    assign_dice(board, args.number_of_players, area_ownership)
+    record = open(args.record, 'wb') if args.record else None
+    recorder = None
+    if record is not None:
+        recorder = GameRecorder(record, args.board, args.ownership, args.strength, args.fixed)
 
     random.seed(args.fixed)
-    game = Game(board, area_ownership, args.number_of_players, args.address, args.port, args.order)
+    game = Game(
+        board, area_ownership, args.number_of_players, args.address, args.port, args.order, args.delta,
+        recorder=recorder
+    )
     game.run()
 
+    if record is not None:
+        record.close()
+
 
 if __name__ == '__main__':
     main()
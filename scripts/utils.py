@@ -1,3 +1,6 @@
+import contextlib
+import functools
+import importlib
 import os
 import sys
 from subprocess import Popen
@@ -5,6 +8,8 @@ import tempfile
 import numpy as np
 import random
 
+from dicewars.server.game.board_cache import BoardCache
+from dicewars.server.game.headless import LocalClient, run_headless_game
 from dicewars.server.game.summary import GameSummary
 
 
@@ -56,6 +61,12 @@ def get_nickname(ai_spec):
     return nick
 
 
+def get_ai_constructor(ai_specification):
+    ai_module = importlib.import_module('dicewars.ai.{}'.format(ai_specification))
+
+    return ai_module.AI
+
+
 def log_file_producer(logdir, process):
     if logdir is None:
         return open(os.devnull, 'w')
@@ -66,7 +77,7 @@ def log_file_producer(logdir, process):
 def run_ai_only_game(
         port, address, process_list, ais,
         board_definition=None, fixed=None, client_seed=None,
-        logdir=None, debug=False):
+        logdir=None, debug=False, board_cache=None, record=None):
     logs = []
     process_list.clear()
 
@@ -77,6 +88,7 @@ def run_ai_only_game(
         "-n", str(len(ais)),
         "-p", str(port),
         "-a", str(address),
+        "--delta",
     ]
     server_cmd.append('-r')
     server_cmd.extend(ai_nicks)
@@ -84,6 +96,10 @@ def run_ai_only_game(
         server_cmd.extend(board_definition.to_args())
     if fixed is not None:
         server_cmd.extend(['-f', str(fixed)])
+    if board_cache is not None:
+        server_cmd.extend(['--board-cache', board_cache])
+    if record is not None:
+        server_cmd.extend(['--record', record])
     if debug:
         server_cmd.extend(['--debug', 'DEBUG'])
 
@@ -117,6 +133,26 @@ def run_ai_only_game(
     return game_summary
 
 
+@functools.lru_cache(maxsize=None)
+def open_board_cache(path):
+    return BoardCache(path)
+
+
+def run_ai_only_game_in_process(ais, board_definition=None, fixed=None, client_seed=None, board_cache=None, record=None):
+    clients = [LocalClient(get_nickname(ai), get_ai_constructor(ai), client_seed) for ai in ais]
+    if board_definition is None:
+        board_definition = BoardDefinition(None, None, None)
+
+    with contextlib.ExitStack() as stack:
+        return run_headless_game(
+            clients,
+            board_definition.board, board_definition.ownership, board_definition.strength,
+            fixed=fixed,
+            board_cache=None if board_cache is None else open_board_cache(board_cache),
+            record=None if record is None else stack.enter_context(open(record, 'wb')),
+        )
+
+
 class ListStats:
     def __init__(self, the_list):
         self.min = min(the_list)
@@ -178,7 +214,7 @@ class PlayerPerformance:
 
 class TournamentCombatantsProvider:
     def __init__(self, players):
-        self.game_numbers = np.zeros((len(players), len(players)), dtype=np.int)
+        self.game_numbers = np.zeros((len(players), len(players)), dtype=int)
         self.players = players
 
     def get_combatants(self, nb_combatants):
@@ -208,7 +244,7 @@ class TournamentCombatantsProvider:
 
 class EvaluationCombatantsProvider:
     def __init__(self, players, ai_under_test):
-        self.game_numbers = np.zeros((len(players), len(players)), dtype=np.int)
+        self.game_numbers = np.zeros((len(players), len(players)), dtype=int)
         self.players = players
         self.put = ai_under_test
         assert(self.put in self.players)
@@ -4,6 +4,8 @@ from PyQt5.QtWidgets import QApplication
 import sys
 
 from dicewars.client.game.debugger_game import StaticGame
+from dicewars.client.game.replay import Replay
+from dicewars.common.record import MAGIC
 from dicewars.client import debugger_ui
 
 
@@ -26,11 +28,26 @@ class DetailedAreaReporter:
 
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument('savegame')
+    parser.add_argument('savegame', help="State pickled by save_state(), or a record of a game")
+    parser.add_argument('-m', '--move', type=int,
+                        help="Number of events of the recorded game to replay, all of them by default")
+    parser.add_argument('--battle', type=int,
+                        help="Show the recorded game right before the battle after this many battles")
+    parser.add_argument('--player', type=int, help="Player to look at the recorded game as")
     args = parser.parse_args()
 
     with open(args.savegame, 'rb') as f:
-        game = StaticGame(f)
+        if f.peek(len(MAGIC))[:len(MAGIC)] == MAGIC:
+            replay = Replay(f)
+            if args.battle is not None:
+                move = replay.find_battle(args.battle)
+            elif args.move is not None:
+                move = args.move
+            else:
+                move = len(replay) - 1
+            game = replay.game(move, args.player)
+        else:
+            game = StaticGame.load(f)
 
     area_describer = DetailedAreaReporter(game.board)
     debugger_ui.on_area_activation = area_describer
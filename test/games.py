@@ -0,0 +1,47 @@
+"""Headless games shared by the tests, played by dt.sdc and dt.ste unless given other clients
+"""
+import io
+
+from dicewars.ai.dt import sdc, ste
+from dicewars.server.game.headless import LocalClient, run_headless_game
+
+
+NICKNAMES = ['dt.sdc (AI)', 'dt.ste (AI)']
+OWNERSHIP_SEED = 2
+STRENGTH_SEED = 3
+FIXED = 4
+
+
+def ai_clients():
+    """Clients of dt.sdc and dt.ste with seeded AIs
+    """
+    return [
+        LocalClient(NICKNAMES[0], sdc.AI, 1),
+        LocalClient(NICKNAMES[1], ste.AI, 1),
+    ]
+
+
+def play_game(board_seed, clients=None, strength_seed=STRENGTH_SEED, **kwargs):
+    """Play a game by run_headless_game(), keyword arguments are passed to it
+
+    Returns
+    -------
+    GameSummary
+    """
+    if clients is None:
+        clients = ai_clients()
+    return run_headless_game(clients, board_seed, OWNERSHIP_SEED, strength_seed, FIXED, **kwargs)
+
+
+def record_game(board_seed, clients=None, strength_seed=STRENGTH_SEED):
+    """Play a game and record it
+
+    Returns
+    -------
+    GameSummary
+    bytes
+        The record of the game
+    """
+    record = io.BytesIO()
+    summary = play_game(board_seed, clients, strength_seed, record=record)
+    return summary, record.getvalue()
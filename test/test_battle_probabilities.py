@@ -0,0 +1,77 @@
+import itertools
+import random
+import unittest
+
+from dicewars.ai.utils import (
+    BATTLE_WIN_PROBABILITY, CHAIN_WIN_PROBABILITY, SURVIVING_DICE_PROBABILITY,
+    attack_succcess_probability, chain_success_probability,
+    probability_of_holding_area, probability_of_holding_areas,
+)
+from dicewars.client.game.board import Board
+from dicewars.server.game.initialization import create_board
+
+
+def enumerated_win_probability(atk, df):
+    rolls = list(itertools.product(range(1, 7), repeat=atk + df))
+    wins = sum(sum(roll[:atk]) > sum(roll[atk:]) for roll in rolls)
+    return wins / len(rolls)
+
+
+class BattleProbabilityTests(unittest.TestCase):
+    def test_matches_enumeration(self):
+        for atk, df in [(1, 1), (2, 1), (1, 2), (2, 2), (3, 2), (2, 3), (4, 1)]:
+            self.assertAlmostEqual(BATTLE_WIN_PROBABILITY[atk, df], enumerated_win_probability(atk, df), places=12)
+            self.assertAlmostEqual(attack_succcess_probability(atk, df), enumerated_win_probability(atk, df), places=12)
+
+    def test_beyond_table(self):
+        self.assertAlmostEqual(attack_succcess_probability(8, 8), BATTLE_WIN_PROBABILITY[8, 8], places=12)
+        self.assertGreater(attack_succcess_probability(12, 3), attack_succcess_probability(8, 3))
+
+    def test_chains(self):
+        self.assertAlmostEqual(
+            chain_success_probability(5, [3, 2, 1]),
+            BATTLE_WIN_PROBABILITY[5, 3] * BATTLE_WIN_PROBABILITY[4, 2] * BATTLE_WIN_PROBABILITY[3, 1]
+        )
+        self.assertEqual(chain_success_probability(3, [1, 1, 1]), 0.0)
+        self.assertEqual(chain_success_probability(3, []), 1.0)
+        for atk in range(1, 9):
+            for df in range(1, 9):
+                for k in range(9):
+                    self.assertAlmostEqual(CHAIN_WIN_PROBABILITY[atk, df, k], chain_success_probability(atk, [df] * k))
+
+    def test_chains_beyond_table(self):
+        self.assertAlmostEqual(
+            chain_success_probability(10, [9, 3]),
+            attack_succcess_probability(10, 9) * attack_succcess_probability(9, 3),
+            places=12
+        )
+        self.assertAlmostEqual(chain_success_probability(5, [12]), attack_succcess_probability(5, 12), places=12)
+
+    def test_surviving_dice(self):
+        for atk in range(2, 9):
+            for df in range(1, 9):
+                self.assertAlmostEqual(SURVIVING_DICE_PROBABILITY[atk, df].sum(), 1.0)
+                self.assertAlmostEqual(SURVIVING_DICE_PROBABILITY[atk, df, atk - 1], BATTLE_WIN_PROBABILITY[atk, df])
+
+
+class HoldProbabilityTests(unittest.TestCase):
+    def test_batch_matches_single_areas(self):
+        server_board, ownership = create_board(4, 11, 22, 33)
+        board = Board(
+            {str(name): {'owner': ownership[name], 'dice': area.get_dice()} for name, area in server_board.areas.items()},
+            {str(name): area for name, area in server_board.get_board().items()},
+        )
+        rng = random.Random(1)
+        names = list(board.topology.names) * 3
+        area_dice = [rng.randint(1, 8) for _ in names]
+        players = [rng.randint(1, 4) for _ in names]
+
+        expected = [
+            probability_of_holding_area(board, name, dice, player)
+            for name, dice, player in zip(names, area_dice, players)
+        ]
+        self.assertEqual(probability_of_holding_areas(board, names, area_dice, players).tolist(), expected)
+
+        expected = [probability_of_holding_area(board, name, 3, 2) for name in names]
+        self.assertEqual(probability_of_holding_areas(board, names, 3, 2).tolist(), expected)
+        self.assertEqual(probability_of_holding_areas(board, [], 3, 2).tolist(), [])
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+from dicewars.server.game.board_cache import BoardCache
+from dicewars.server.game.initialization import create_board
+
+from games import play_game
+
+
+def describe(board, area_ownership):
+    areas = {
+        name: (board.get_board()[name]['hexes'], board.get_board()[name]['neighbours'], area.get_dice())
+        for name, area in board.areas.items()
+    }
+    return list(areas.items()), list(area_ownership.items())
+
+
+class BoardCacheTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'boards.bin')
+
+    def test_cached_board_equals_generated(self):
+        cache = BoardCache(self.path)
+        generated = describe(*create_board(3, 11, 22, 33, cache))
+        self.assertEqual(describe(*create_board(3, 11, 22, 33, cache)), generated)
+        self.assertEqual(describe(*create_board(3, 11, 22, 33, BoardCache(self.path))), generated)
+        self.assertEqual(describe(*create_board(3, 11, 22, 33)), generated)
+
+    def test_boards_are_keyed_by_all_seeds(self):
+        cache = BoardCache(self.path)
+        for seeds in [(2, 1, 2, 3), (3, 1, 2, 3), (2, 1, 2, 4), (2, 5, 2, 3)]:
+            create_board(*seeds, cache=cache)
+        size = os.path.getsize(self.path)
+
+        reopened = BoardCache(self.path)
+        for seeds in [(2, 1, 2, 3), (3, 1, 2, 3), (2, 1, 2, 4), (2, 5, 2, 3)]:
+            self.assertEqual(describe(*reopened.get(*seeds)), describe(*create_board(*seeds)))
+        self.assertIsNone(reopened.get(2, 1, 3, 3))
+        self.assertIsNone(reopened.get(2, None, 2, 3))
+        self.assertEqual(os.path.getsize(self.path), size)
+
+    def test_random_boards_are_not_cached(self):
+        create_board(2, None, 2, 3, BoardCache(self.path))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_truncated_record_is_ignored(self):
+        create_board(2, 1, 2, 3, BoardCache(self.path))
+        create_board(2, 5, 2, 3, BoardCache(self.path))
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 10)
+
+        cache = BoardCache(self.path)
+        self.assertIsNotNone(cache.get(2, 1, 2, 3))
+        self.assertIsNone(cache.get(2, 5, 2, 3))
+
+    def test_game_on_cached_board_is_unchanged(self):
+        cache = BoardCache(self.path)
+        expected = repr(play_game(12))
+        self.assertEqual(repr(play_game(12, board_cache=cache)), expected)
+        self.assertEqual(repr(play_game(12, board_cache=cache)), expected)
@@ -0,0 +1,136 @@
+import copy
+import pickle
+import random
+import unittest
+
+from dicewars.ai.utils import possible_attacks
+from dicewars.client.game.board import Board
+
+
+def create_board(owners, dice):
+    """Board of areas in a row, area i neighbours areas i - 1 and i + 1
+    """
+    nb_areas = len(owners)
+    areas = {}
+    board = {}
+    for i in range(nb_areas):
+        name = str(i + 1)
+        areas[name] = {'owner': owners[i], 'dice': dice[i]}
+        board[name] = {
+            'neighbours': [n for n in [i, i + 2] if 1 <= n <= nb_areas],
+            'hexes': [[i + 1, 0]],
+        }
+    return Board(areas, board)
+
+
+def snapshot(board):
+    return (
+        list(board.owners), list(board.dice), [board.reserves.get(player, 0) for player in [1, 2]],
+        [board.get_players_regions(player) for player in [1, 2]],
+        [board.get_player_score(player) for player in [1, 2]],
+    )
+
+
+class ForwardModelTests(unittest.TestCase):
+    def test_battle(self):
+        board = create_board([1, 1, 2, 1], [2, 5, 3, 4])
+        original = snapshot(board)
+
+        board.apply_battle(2, 3, True)
+        self.assertEqual((board.owners[3], board.dice[2], board.dice[3]), (1, 1, 4))
+        self.assertEqual(board.get_player_score(1), 4)
+        self.assertEqual(board.nb_players_alive(), 1)
+
+        board.undo()
+        self.assertEqual(snapshot(board), original)
+
+        board.apply_battle(4, 3, False)
+        self.assertEqual((board.owners[3], board.dice[4], board.dice[3]), (2, 1, 3))
+        board.undo()
+        self.assertEqual(snapshot(board), original)
+
+        self.assertRaises(ValueError, board.apply_battle, 1, 2, True)
+        self.assertRaises(ValueError, board.apply_battle, 1, 3, True)
+        self.assertRaises(IndexError, board.undo)
+
+    def test_end_turn(self):
+        board = create_board([1, 1, 1, 2, 1], [8, 7, 6, 3, 7])
+        board.reserves[1] = 4
+        original = snapshot(board)
+
+        affected = board.apply_end_turn(1, random.Random(42))
+        self.assertEqual(sorted(affected), [2, 3, 5])
+        self.assertEqual(list(board.dice), [0, 8, 8, 8, 3, 8])
+        self.assertEqual(board.reserves[1], 3)
+
+        board.undo()
+        self.assertEqual(snapshot(board), original)
+
+    def test_reinforcements_are_capped(self):
+        board = create_board([1] * 10 + [2], [1] * 10 + [1])
+        board.reserves[1] = 60
+        board.apply_end_turn(1, random.Random(0))
+        self.assertEqual(sum(board.dice[1:11]), 74)
+        self.assertEqual(board.reserves[1], 0)
+
+    def test_sequence(self):
+        rng = random.Random(3)
+        board = create_board([1, 2] * 6, [rng.randint(1, 8) for _ in range(12)])
+        original = snapshot(board)
+
+        for _ in range(50):
+            player = rng.choice([1, 2])
+            attacks = [
+                (area.name, n) for area in board.get_player_areas(player) if area.can_attack()
+                for n in area.neighbours if board.owners[n] != player
+            ]
+            sources, targets = board.get_possible_attacks(player)
+            self.assertEqual(list(zip(sources.tolist(), targets.tolist())), attacks)
+            self.assertEqual([(a.name, b.name) for a, b in possible_attacks(board, player)], attacks)
+            if attacks and rng.random() < 0.7:
+                board.apply_battle(*rng.choice(attacks), rng.random() < 0.5)
+            else:
+                board.apply_end_turn(player, rng)
+
+        while board.history:
+            board.undo()
+        self.assertEqual(snapshot(board), original)
+
+
+class BoardSnapshotTests(unittest.TestCase):
+    def test_snapshot_is_independent(self):
+        board = create_board([1, 1, 2, 1], [2, 5, 3, 4])
+        original = snapshot(board)
+
+        board_copy = board.snapshot()
+        board_copy.apply_battle(2, 3, True)
+        board_copy.get_area(1).set_dice(8)
+        self.assertEqual(snapshot(board), original)
+
+        self.assertIs(board_copy.get_area('2').board, board_copy)
+        self.assertIs(board_copy.topology, board.topology)
+        self.assertRaises(AttributeError, setattr, board_copy.topology, 'neighbours', ())
+        self.assertRaises(ValueError, board_copy.adjacency_names.__setitem__, 0, 1)
+        topology = board.topology
+        for a in (topology.adjacency_offsets, topology.adjacency_names, topology.edge_sources,
+                  topology.edge_targets, topology.neighbour_table):
+            with self.assertRaises(ValueError):
+                a.flags.writeable = True
+
+    def test_pickle(self):
+        board = create_board([1, 1, 2, 1], [2, 5, 3, 4])
+        board.apply_battle(2, 3, True)
+        board_copy = pickle.loads(pickle.dumps(board))
+
+        self.assertEqual(snapshot(board_copy), snapshot(board))
+        self.assertEqual(board_copy.topology.get_board(), board.topology.get_board())
+        self.assertEqual(board_copy.get_area(1).hexes, ((1, 0),))
+        board_copy.undo()
+        self.assertEqual(board_copy.get_player_score(2), 1)
+
+    def test_deepcopy_of_area(self):
+        board = create_board([1, 2], [3, 4])
+        area_copy = copy.deepcopy(board.get_area(2))
+        area_copy.set_owner(1)
+        self.assertEqual(board.get_area(2).get_owner_name(), 2)
+        self.assertEqual(area_copy.board.get_player_score(1), 2)
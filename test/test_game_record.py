@@ -0,0 +1,58 @@
+import io
+import unittest
+
+import numpy
+
+from dicewars.common.record import BATTLE, END_TURN, GAME_END, KIND, PLAYER, GameRecordReader
+
+from games import NICKNAMES, record_game
+
+
+class GameRecordTests(unittest.TestCase):
+    def test_header(self):
+        _, data = record_game(11, strength_seed=None)
+        reader = GameRecordReader(io.BytesIO(data))
+
+        self.assertEqual(reader.nb_players, 2)
+        self.assertEqual((reader.board_seed, reader.ownership_seed, reader.strength_seed, reader.fixed), (11, 2, None, 4))
+        self.assertEqual(sorted(reader.nicknames), sorted(NICKNAMES))
+        self.assertEqual(sorted(reader.players_order), [1, 2])
+        self.assertEqual(sorted(reader.board), reader.names.tolist())
+        for name, area in reader.board.items():
+            self.assertGreater(len(area['hexes']), 0)
+            for neighbour in area['neighbours']:
+                self.assertIn(name, reader.board[neighbour]['neighbours'])
+
+    def test_replay_ends_with_the_winner_owning_the_board(self):
+        summary, data = record_game(12)
+        reader = GameRecordReader(io.BytesIO(data))
+
+        kinds = []
+        for event, owners, dice in reader.positions():
+            kinds.append(event[KIND])
+        self.assertEqual(kinds.count(BATTLE), summary.nb_battles)
+        self.assertIn(END_TURN, kinds)
+        self.assertEqual(kinds[-1], GAME_END)
+
+        winner = event[PLAYER]
+        self.assertEqual(reader.nicknames[reader.players_order.index(winner)], summary.winner)
+        self.assertTrue((owners[reader.names] == winner).all())
+        self.assertTrue(((dice[reader.names] >= 1) & (dice[reader.names] <= 8)).all())
+
+    def test_record_is_read_while_being_written(self):
+        _, data = record_game(13)
+        complete = GameRecordReader(io.BytesIO(data)).read_events()
+        # the header, ten events and a part of the eleventh one
+        split = len(data) - (len(complete) - 10) * complete.shape[1] + 3
+
+        stream = io.BytesIO(data[:split])
+        reader = GameRecordReader(stream)
+        first = reader.read_events()
+        stream.write(data[split:])
+        stream.seek(split)
+        rest = reader.read_events()
+
+        self.assertEqual(len(first), 10)
+        self.assertEqual(len(reader.read_events()), 0)
+        self.assertEqual(rest[-1][KIND], GAME_END)
+        self.assertTrue((numpy.concatenate((first, rest)) == complete).all())
@@ -0,0 +1,32 @@
+import hashlib
+import random
+import unittest
+
+from dicewars.server.game.generator import BoardGenerator
+
+
+# boards generated by the original dict-based generator: seed, number of areas,
+# neighbours and number of hexes of area 1, digest of the whole board
+REFERENCE_BOARDS = [
+    (11, 30, [5, 2, 22, 3], 18, '2ef238a09b9bdb8c'),
+    (42, 31, [3, 2], 12, '465f5ba0a12128b2'),
+    (1337, 31, [3, 2, 5, 22], 18, '3b95e5edad5e3b54'),
+]
+
+
+class BoardGeneratorTests(unittest.TestCase):
+    def test_boards_are_unchanged(self):
+        for seed, nb_areas, neighbours, nb_hexes, digest in REFERENCE_BOARDS:
+            random.seed(seed)
+            board = BoardGenerator().generate_board()
+            self.assertEqual(len(board), nb_areas)
+            self.assertEqual(board[1]['neighbours'], neighbours)
+            self.assertEqual(len(board[1]['hexes']), nb_hexes)
+            self.assertEqual(hashlib.sha256(repr(board).encode()).hexdigest()[:16], digest)
+
+    def test_adjacency_is_symmetric(self):
+        random.seed(7)
+        board = BoardGenerator().generate_board()
+        for name, area in board.items():
+            for neighbour in area['neighbours']:
+                self.assertIn(name, board[neighbour]['neighbours'])
@@ -0,0 +1,23 @@
+import random
+import unittest
+
+from games import NICKNAMES, play_game
+
+
+class HeadlessGameTests(unittest.TestCase):
+    def test_game_is_finished(self):
+        summary = play_game(11)
+        self.assertIn(summary.winner, NICKNAMES)
+        self.assertGreater(summary.nb_battles, 0)
+        self.assertEqual(len(summary.eliminations), 1)
+
+    def test_game_is_reproducible(self):
+        self.assertEqual(repr(play_game(12)), repr(play_game(12)))
+
+    def test_global_random_is_restored(self):
+        random.seed(5)
+        expected = random.random()
+
+        random.seed(5)
+        play_game(13)
+        self.assertEqual(random.random(), expected)
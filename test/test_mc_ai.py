@@ -0,0 +1,96 @@
+import copy
+import random
+import unittest
+
+from dicewars.ai.dt import mc, sdc
+from dicewars.client.ai_driver import BattleCommand, EndTurnCommand
+from dicewars.client.game.board import Board
+from dicewars.server.game.headless import LocalClient
+from dicewars.server.game.initialization import create_board
+
+from games import play_game
+
+
+class FakeClock(object):
+    """Clock advancing by a fixed step whenever it is read
+    """
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+class CountingAI(mc.AI):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.nb_rollouts = 0
+
+    def rollout(self, board, move):
+        self.nb_rollouts += 1
+        return super().rollout(board, move)
+
+
+class QuickAI(mc.AI):
+    max_rollouts = 20
+
+
+def client_board():
+    server_board, ownership = create_board(2, 11, 22, 33)
+    return Board(
+        {str(name): {'owner': ownership[name], 'dice': area.get_dice()} for name, area in server_board.areas.items()},
+        {str(name): area for name, area in server_board.get_board().items()},
+    )
+
+
+class MonteCarloAITests(unittest.TestCase):
+    def test_turn_respects_time_and_keeps_board(self):
+        board = client_board()
+        original = copy.deepcopy(board)
+        ai = CountingAI(1, board, [1, 2])
+        ai.clock = FakeClock(0.25)
+
+        # the deadline is a second after 0.25, it passes at the fifth reading of the clock afterwards,
+        # every candidate is tried once before the clock is read
+        command = ai.ai_turn(board, 0, 0, 20.0)
+        nb_candidates = len(ai.sdc_attacks(board, 1)) + 1
+        self.assertIsInstance(command, (BattleCommand, EndTurnCommand))
+        self.assertEqual(ai.nb_rollouts, nb_candidates + 4)
+
+        self.assertEqual(list(board.owners), list(original.owners))
+        self.assertEqual(list(board.dice), list(original.dice))
+        self.assertEqual(board.get_players_regions(1), original.get_players_regions(1))
+        self.assertEqual(board.history, [])
+
+    def test_fixed_number_of_rollouts(self):
+        board = client_board()
+        ai = CountingAI(1, board, [1, 2])
+        ai.max_rollouts = 50
+        ai.clock = None  # the time is not watched
+
+        ai.ai_turn(board, 0, 0, 1.0)
+        self.assertEqual(ai.nb_rollouts, 50)
+
+    def test_turn_is_reproducible_with_seeded_global_random(self):
+        commands = []
+        for _ in range(2):
+            random.seed(7)
+            board = client_board()
+            ai = QuickAI(1, board, [1, 2])
+            command = ai.ai_turn(board, 0, 0, 1.0)
+            commands.append((type(command), vars(command)))
+        self.assertEqual(commands[0], commands[1])
+
+    def test_game_is_finished_and_reproducible(self):
+        def play():
+            clients = [
+                LocalClient('dt.mc (AI)', QuickAI, 1),
+                LocalClient('dt.sdc (AI)', sdc.AI, 1),
+            ]
+            return play_game(11, clients)
+
+        summary = play()
+        self.assertIn(summary.winner, ['dt.mc (AI)', 'dt.sdc (AI)'])
+        self.assertEqual(repr(summary), repr(play()))
@@ -0,0 +1,38 @@
+import unittest
+
+from dicewars.common import protocol
+from dicewars.common.protocol import FrameDecoder, JSON, MSGPACK, encode_message
+
+
+MESSAGES = [
+    {'type': 'battle', 'result': {'atk': {'name': 3, 'dice': 1, 'owner': 2, 'pwr': 17}}, 'score': {'2': 7}},
+    {'type': 'end_turn', 'areas': {}, 'current_player': 1, 'reserves': {'1': 0, '2': 3}, 'score': {}},
+    {'type': 'game_end', 'winner': 2},
+]
+
+
+class FrameDecoderTests(unittest.TestCase):
+    def check_round_trip(self, encoding):
+        stream = b''.join(encode_message(msg, encoding) for msg in MESSAGES)
+
+        for chunk_size in [1, 2, 7, 64, len(stream)]:
+            decoder = FrameDecoder()
+            received = []
+            for i in range(0, len(stream), chunk_size):
+                received.extend(decoder.feed(stream[i:i + chunk_size]))
+
+            self.assertEqual(received, [(encoding, msg) for msg in MESSAGES])
+            self.assertEqual(len(decoder.buffer), 0)
+
+    def test_json(self):
+        self.check_round_trip(JSON)
+
+    @unittest.skipIf(protocol.msgpack is None, "msgpack not installed")
+    def test_msgpack(self):
+        self.check_round_trip(MSGPACK)
+
+    def test_incomplete_frame_is_kept(self):
+        frame = encode_message(MESSAGES[0])
+        decoder = FrameDecoder()
+        self.assertEqual(decoder.feed(frame[:-1]), [])
+        self.assertEqual(decoder.feed(frame[-1:]), [(JSON, MESSAGES[0])])
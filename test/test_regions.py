@@ -0,0 +1,76 @@
+import random
+import unittest
+
+from dicewars.common import RegionTracker
+
+
+def brute_force_regions(neighbours, owners, player_name):
+    remaining = {name for name, owner in owners.items() if owner == player_name}
+    regions = []
+    while remaining:
+        region = [min(remaining)]
+        remaining.remove(region[0])
+        for area in region:
+            for neighbour in neighbours[area]:
+                if neighbour in remaining:
+                    remaining.remove(neighbour)
+                    region.append(neighbour)
+        regions.append(sorted(region))
+    return sorted(regions)
+
+
+class RegionTrackerTests(unittest.TestCase):
+    def setUp(self):
+        # 4x4 grid of areas 1..16
+        self.neighbours = {}
+        for name in range(1, 17):
+            row, col = divmod(name - 1, 4)
+            self.neighbours[name] = [
+                r * 4 + c + 1 for r, c in [(row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)]
+                if 0 <= r < 4 and 0 <= c < 4
+            ]
+
+    def test_split_and_join(self):
+        owners = {name: 1 for name in self.neighbours}
+        tracker = RegionTracker(self.neighbours, owners)
+        self.assertEqual(tracker.get_score(1), 16)
+
+        for name in [2, 6, 10, 14]:
+            tracker.change_owner(name, 2)
+        self.assertEqual(tracker.get_regions(1), [[1, 5, 9, 13], [3, 4, 7, 8, 11, 12, 15, 16]])
+        self.assertEqual(tracker.get_score(1), 8)
+        self.assertEqual(tracker.get_score(2), 4)
+
+        tracker.change_owner(6, 1)
+        self.assertEqual(tracker.get_score(1), 13)
+        self.assertEqual(tracker.get_largest_region(2), [10, 14])
+
+    def test_largest_region_tie(self):
+        owners = {name: 2 for name in self.neighbours}
+        owners.update({1: 1, 16: 1})
+        tracker = RegionTracker(self.neighbours, owners)
+        self.assertEqual(tracker.get_largest_region(1), [1])
+        self.assertEqual(tracker.get_largest_region(3), [])
+        self.assertEqual(tracker.get_score(3), 0)
+
+    def test_random_changes_match_brute_force(self):
+        rng = random.Random(42)
+        owners = {name: rng.randint(1, 3) for name in self.neighbours}
+        tracker = RegionTracker(self.neighbours, owners)
+
+        for _ in range(500):
+            name = rng.randint(1, 16)
+            owners[name] = rng.randint(1, 3)
+            tracker.change_owner(name, owners[name])
+
+            copied = tracker.copy()
+            copied.change_owner(name, 4)
+
+            for player_name in range(1, 4):
+                regions = brute_force_regions(self.neighbours, owners, player_name)
+                self.assertEqual(tracker.get_regions(player_name), regions)
+                self.assertEqual(tracker.get_score(player_name), max((len(r) for r in regions), default=0))
+
+            for area, neighbours in self.neighbours.items():
+                foreign = sum(owners[n] != owners[area] for n in neighbours)
+                self.assertEqual(tracker.foreign_neighbours[area], foreign)
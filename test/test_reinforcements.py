@@ -0,0 +1,79 @@
+import random
+import unittest
+
+from dicewars.common import distribute_dice
+
+
+def place_dice_one_by_one(free_slots, nb_dice, rng):
+    """Placement of dice as originally done by the server
+    """
+    free = list(free_slots)
+    areas = list(range(len(free)))
+    added = {}
+    while nb_dice and areas:
+        area = rng.choice(areas)
+        if not free[area]:
+            areas.remove(area)
+        else:
+            free[area] -= 1
+            added[area] = added.get(area, 0) + 1
+            nb_dice -= 1
+    return added, nb_dice
+
+
+class ChoiceOnlyRandom(random.Random):
+    """Generator whose choice() must be used as it is
+    """
+    def choice(self, seq):
+        return seq[-1 - self._randbelow(len(seq))]
+
+
+class DistributeDiceTests(unittest.TestCase):
+    def check_same_draws(self, make_rng):
+        setup = random.Random(3)
+        for seed in range(300):
+            free_slots = [setup.randint(0, 7) for _ in range(setup.randint(0, 20))]
+            nb_dice = setup.randint(0, 64)
+
+            rng = make_rng(seed)
+            expected = place_dice_one_by_one(free_slots, nb_dice, rng), rng.random()
+            rng = make_rng(seed)
+            result = distribute_dice(free_slots, nb_dice, rng), rng.random()
+
+            self.assertEqual(result, expected)
+            self.assertEqual(list(result[0][0]), list(expected[0][0]))
+
+    def test_same_draws_as_choice(self):
+        self.check_same_draws(random.Random)
+
+    def test_same_draws_as_global_random(self):
+        def reseed(seed):
+            random.seed(seed)
+            return random
+
+        state = random.getstate()
+        try:
+            self.check_same_draws(reseed)
+        finally:
+            random.setstate(state)
+
+    def test_inlined_choice_around_powers_of_two(self):
+        # the inlined draw depends on how CPython's choice() turns random bits into an index,
+        # which changes with the number of bits needed for the number of candidate areas
+        for nb_areas in [1, 2, 3, 4, 7, 8, 9, 15, 16, 17, 31, 32, 33, 63, 64, 65, 127, 128, 129]:
+            for seed in range(5):
+                free_slots = [seed % 3] * nb_areas
+                rng = random.Random(seed)
+                expected = place_dice_one_by_one(free_slots, 64, rng), rng.random()
+                rng = random.Random(seed)
+                result = distribute_dice(free_slots, 64, rng), rng.random()
+                self.assertEqual(result, expected)
+                self.assertEqual(list(result[0][0]), list(expected[0][0]))
+
+    def test_custom_choice_is_used(self):
+        self.check_same_draws(ChoiceOnlyRandom)
+
+    def test_leftover_dice(self):
+        added, left = distribute_dice([1, 0, 2], 10, random.Random(1))
+        self.assertEqual(added, {0: 1, 2: 2})
+        self.assertEqual(left, 7)
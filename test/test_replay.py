@@ -0,0 +1,93 @@
+import io
+import unittest
+from unittest import mock
+
+import numpy
+
+from dicewars.ai.dt import ste
+from dicewars.client.ai_driver import BattleCommand, EndTurnCommand
+from dicewars.client.game.replay import Replay
+from dicewars.common.record import BATTLE, END_TURN, KIND, GameRecordReader
+from dicewars.server.game.game import Game
+from dicewars.server.game.headless import LocalClient
+
+from games import ai_clients, record_game
+
+
+class ReplayTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        clients = ai_clients() + [LocalClient('dt.ste (AI) 2', ste.AI, 2)]
+        cls.summary, cls.data = record_game(21, clients)
+
+    def test_positions_match_sequential_reading(self):
+        replay = Replay(io.BytesIO(self.data), keyframe_interval=5)
+        reader = GameRecordReader(io.BytesIO(self.data))
+        names = list(replay.topology.names)
+
+        board = replay.board(0)
+        self.assertEqual(list(board.owners), list(reader.owners))
+        self.assertEqual(list(board.dice), list(reader.dice))
+
+        for n, (_, owners, dice) in enumerate(reader.positions(), start=1):
+            board = replay.board(n)
+            self.assertEqual([board.owners[name] for name in names], owners[names].tolist())
+            self.assertEqual([board.dice[name] for name in names], dice[names].tolist())
+        self.assertEqual(n, len(replay) - 1)
+
+    def test_eliminating_battles_are_found(self):
+        replay = Replay(io.BytesIO(self.data))
+        players_order = replay.record.players_order
+
+        for nickname, nb_battles in self.summary.eliminations:
+            player = players_order[replay.record.nicknames.index(nickname)]
+            position = replay.find_battle(nb_battles)
+
+            self.assertEqual(replay.events[position][0], BATTLE)
+            self.assertIn(player, replay.position(position)[0])
+            self.assertNotIn(player, replay.position(position + 1)[0])
+
+    def test_ai_plays_on_replayed_board(self):
+        replay = Replay(io.BytesIO(self.data))
+        position = len(replay) // 2
+        player = int(replay.current_players[position])
+        board = replay.board(position)
+
+        ai = ste.AI(player, board, list(replay.record.players_order))
+        command = ai.ai_turn(board, 0, 0, 10.0)
+
+        self.assertIsInstance(command, (BattleCommand, EndTurnCommand))
+
+    def test_game_for_debugger(self):
+        replay = Replay(io.BytesIO(self.data))
+        game = replay.game(len(replay) - 1, player_name=1)
+
+        self.assertEqual(game.player_name, 1)
+        self.assertEqual(sorted(game.players), [1, 2, 3])
+        self.assertEqual(game.current_player.get_name(), replay.current_players[-1])
+
+    def test_ends_of_turns_match_server_game(self):
+        server_states = []
+        end_turn = Game.end_turn
+
+        def recording_end_turn(game):
+            areas = end_turn(game)
+            server_states.append((
+                {name: (area.get_owner_name(), area.get_dice()) for name, area in game.board.areas.items()},
+                {name: player.get_reserve() for name, player in game.players.items()},
+                game.current_player.get_name(),
+            ))
+            return areas
+
+        with mock.patch.object(Game, 'end_turn', recording_end_turn):
+            _, data = record_game(22)
+
+        replay = Replay(io.BytesIO(data), keyframe_interval=7)
+        ends_of_turns = numpy.flatnonzero(replay.events[:, KIND] == END_TURN)
+        self.assertEqual(len(ends_of_turns), len(server_states))
+        for end_of_turn, (areas, reserves, current_player) in zip(ends_of_turns, server_states):
+            n = end_of_turn + 1
+            owners, dice = replay.position(n)
+            self.assertEqual({name: (owners[name], dice[name]) for name in areas}, areas)
+            self.assertEqual({name: replay.reserves[n, name] for name in reserves}, reserves)
+            self.assertEqual(replay.current_players[n], current_player)
@@ -0,0 +1,137 @@
+import asyncio
+import unittest
+
+from dicewars.common.protocol import encode_message, read_message
+from dicewars.server.game.sessions import MultiGameServer
+
+from games import FIXED, NICKNAMES, OWNERSHIP_SEED, STRENGTH_SEED, ai_clients, play_game
+
+
+SEEDS = {'board': 11, 'ownership': OWNERSHIP_SEED, 'strength': STRENGTH_SEED, 'fixed': FIXED}
+
+
+async def connect(port, hello_msg):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(encode_message(hello_msg))
+    return reader, writer
+
+
+async def play_remote(port, local_client, game_id, settings=None):
+    """Play a game on the server by an AI of a LocalClient
+
+    Returns
+    -------
+    dict
+        The 'game_end' message
+    """
+    hello_msg = {'type': 'client_desc', 'nickname': local_client.nickname, 'game_id': game_id}
+    if settings is not None:
+        hello_msg['game'] = settings
+    reader, writer = await connect(port, hello_msg)
+    try:
+        while True:
+            _, msg = await read_message(reader)
+            if msg['type'] == 'game_end':
+                return msg
+            local_client.send_message(msg)
+            outbox = local_client.driver.game.outbox
+            while outbox:
+                writer.write(encode_message(outbox.popleft()))
+    finally:
+        writer.close()
+
+
+class MultiGameServerTests(unittest.TestCase):
+    def run_with_server(self, scenario):
+        """Run a scenario coroutine taking the server and its port
+        """
+        async def main():
+            server = MultiGameServer('127.0.0.1', 0, delta=True)
+            server.report = lambda game_id, summary: self.summaries.append((game_id, summary))
+            asyncio_server = await server.start()
+            port = asyncio_server.sockets[0].getsockname()[1]
+            try:
+                return await asyncio.wait_for(scenario(server, port), 60)
+            finally:
+                asyncio_server.close()
+                await asyncio_server.wait_closed()
+
+        self.summaries = []
+        return asyncio.run(main())
+
+    def test_game_matches_headless_game(self):
+        settings = dict(SEEDS, players=2, order=NICKNAMES)
+
+        async def scenario(server, port):
+            return await asyncio.gather(*(play_remote(port, client, 'g', settings) for client in ai_clients()))
+
+        end_messages = self.run_with_server(scenario)
+        expected = play_game(SEEDS['board'])
+
+        self.assertEqual(len(self.summaries), 1)
+        game_id, summary = self.summaries[0]
+        self.assertEqual(game_id, 'g')
+        self.assertEqual(repr(summary), repr(expected))
+        self.assertEqual(end_messages[0], end_messages[1])
+
+    def test_malformed_hello_is_rejected(self):
+        malformed = [
+            {'type': 'client_desc', 'game_id': 'g'},
+            {'type': 'client_desc', 'nickname': 'a'},
+            {'type': 'client_desc', 'nickname': 'a', 'game_id': ['g']},
+            {'type': 'client_desc', 'nickname': 'a', 'game_id': 'g', 'game': {'players': 'two'}},
+            {'type': 'client_desc', 'nickname': 'a', 'game_id': 'g', 'game': {'players': 9}},
+            {'type': 'client_desc', 'nickname': 'a', 'game_id': 'g', 'game': {'colour': 'red'}},
+            {'type': 'client_desc', 'nickname': 'a', 'game_id': 'g', 'game': {'order': ['a']}},
+        ]
+
+        async def scenario(server, port):
+            for hello_msg in malformed:
+                reader, writer = await connect(port, hello_msg)
+                with self.assertRaises(asyncio.IncompleteReadError):
+                    await read_message(reader)
+                writer.close()
+            return dict(server.lobbies)
+
+        self.assertEqual(self.run_with_server(scenario), {})
+
+    def test_client_leaving_lobby_is_removed(self):
+        hello_msg = {'type': 'client_desc', 'nickname': NICKNAMES[0], 'game_id': 'g', 'game': {'players': 2}}
+
+        async def scenario(server, port):
+            _, writer = await connect(port, hello_msg)
+            while 'g' not in server.lobbies:
+                await asyncio.sleep(0.01)
+            writer.close()
+            while 'g' in server.lobbies:
+                await asyncio.sleep(0.01)
+
+            # the game is set up again by the next client
+            settings = dict(SEEDS, players=2, order=NICKNAMES)
+            await asyncio.gather(*(play_remote(port, client, 'g', settings) for client in ai_clients()))
+
+        self.run_with_server(scenario)
+        self.assertEqual(len(self.summaries), 1)
+
+    def test_invalid_command_ends_game(self):
+        settings = dict(SEEDS, players=2)
+
+        async def scenario(server, port):
+            connections = []
+            for nickname in NICKNAMES:
+                hello_msg = {'type': 'client_desc', 'nickname': nickname, 'game_id': 'g', 'game': settings}
+                connections.append(await connect(port, hello_msg))
+
+            for reader, writer in connections:
+                _, msg = await read_message(reader)
+                self.assertEqual(msg['type'], 'game_start')
+                writer.write(encode_message({'type': 'battle', 'atk': 1000, 'def': 1001}))
+
+            for reader, writer in connections:
+                with self.assertRaises(asyncio.IncompleteReadError):
+                    while True:
+                        await read_message(reader)
+                writer.close()
+
+        self.run_with_server(scenario)
+        self.assertEqual(self.summaries, [])
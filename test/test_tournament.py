@@ -0,0 +1,61 @@
+import importlib.util
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts')
+
+
+def load_tournament():
+    """Import scripts/dicewars-tournament.py, registered so that workers can unpickle its functions
+    """
+    if 'dicewars_tournament' not in sys.modules:
+        sys.path.insert(0, SCRIPTS)
+        spec = importlib.util.spec_from_file_location('dicewars_tournament', os.path.join(SCRIPTS, 'dicewars-tournament.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['dicewars_tournament'] = module
+        spec.loader.exec_module(module)
+    return sys.modules['dicewars_tournament']
+
+
+class ParallelTournamentTests(unittest.TestCase):
+    def test_pool_plays_the_same_games_as_serial_run(self):
+        tournament = load_tournament()
+        from utils import TournamentCombatantsProvider
+
+        record_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(record_dir.cleanup)
+        args = tournament.parser.parse_args(
+            ['-n', '2', '-g', '2', '-b', '11', '-s', '5', '--in-process', '-j', '2', '--record-dir', record_dir.name]
+        )
+        state = random.getstate()
+        try:
+            random.seed(args.seed)
+            schedule = tournament.games_schedule(args, TournamentCombatantsProvider(['dt.sdc', 'dt.ste', 'dt.rand']))
+        finally:
+            random.setstate(state)
+        self.assertEqual(len(schedule), 4)
+
+        tournament.worker_args = args
+        serial = [repr(tournament.play_scheduled_game(game)) for game in schedule]
+        serial_records = {}
+        for name in os.listdir(record_dir.name):
+            with open(os.path.join(record_dir.name, name), 'rb') as f:
+                serial_records[name] = f.read()
+
+        pool = multiprocessing.Pool(args.jobs, tournament.init_worker, (args, multiprocessing.Value('i', 0)))
+        try:
+            parallel = [repr(summary) for summary in pool.imap(tournament.play_scheduled_game, schedule)]
+        finally:
+            pool.close()
+            pool.join()
+
+        self.assertEqual(parallel, serial)
+        self.assertEqual(len(serial_records), 4)
+        for name, data in serial_records.items():
+            with open(os.path.join(record_dir.name, name), 'rb') as f:
+                self.assertEqual(f.read(), data)
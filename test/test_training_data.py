@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+import numpy
+
+from dicewars.ai.xzaryb00.training_data import (
+    HEADER, NB_INPUTS, NB_OUTPUTS, AttacksFile, convert_csv, load_attacks
+)
+
+
+def attacks(nb_attacks, seed):
+    """Attacks as returned by get_features(), with random numbers as features
+    """
+    rng = numpy.random.default_rng(seed)
+    return [
+        (tuple(rng.random(NB_INPUTS)), list(rng.integers(0, 2, NB_OUTPUTS)), (1, None, None))
+        for _ in range(nb_attacks)
+    ]
+
+
+def rows(recorded):
+    return numpy.array([list(attack[0]) + list(attack[1]) for attack in recorded], dtype=numpy.float32)
+
+
+class TrainingDataTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.path = os.path.join(directory.name, 'turns.bin')
+
+    def test_appended_attacks_are_loaded(self):
+        first, second = attacks(5, 1), attacks(3, 2)
+        attacks_file = AttacksFile(self.path)
+        attacks_file.append(first)
+        attacks_file.append([])
+        attacks_file.close()
+        attacks_file = AttacksFile(self.path)
+        attacks_file.append(second)
+        attacks_file.close()
+
+        loaded = load_attacks(self.path)
+        self.assertEqual(loaded.shape, (8, NB_INPUTS + NB_OUTPUTS))
+        self.assertEqual(loaded.dtype, numpy.float32)
+        numpy.testing.assert_array_equal(loaded, rows(first + second))
+        self.assertFalse(loaded.flags.writeable)
+
+    def test_empty_file(self):
+        AttacksFile(self.path).close()
+        self.assertEqual(os.path.getsize(self.path), HEADER.size)
+        self.assertEqual(load_attacks(self.path).shape, (0, NB_INPUTS + NB_OUTPUTS))
+
+    def test_partly_written_row_is_ignored(self):
+        attacks_file = AttacksFile(self.path)
+        attacks_file.append(attacks(2, 3))
+        attacks_file.close()
+        with open(self.path, 'ab') as f:
+            f.write(b'\0' * 10)
+
+        numpy.testing.assert_array_equal(load_attacks(self.path), rows(attacks(2, 3)))
+
+    def test_other_file_is_refused(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'\0' * 100)
+        with self.assertRaises(ValueError):
+            load_attacks(self.path)
+
+    def test_converted_csv_equals_genfromtxt(self):
+        csv_path = os.path.join(self.directory, 'turns.csv')
+        numpy.savetxt(csv_path, rows(attacks(25, 4)), delimiter=',')
+
+        convert_csv(csv_path, self.path, chunk_size=7)
+
+        expected = numpy.genfromtxt(csv_path, delimiter=',', dtype=numpy.float32)
+        numpy.testing.assert_array_equal(load_attacks(self.path), expected)
+
+    def test_csv_is_not_converted_into_file_with_attacks(self):
+        csv_path = os.path.join(self.directory, 'turns.csv')
+        numpy.savetxt(csv_path, rows(attacks(4, 5)), delimiter=',')
+        convert_csv(csv_path, self.path)
+
+        with self.assertRaises(ValueError):
+            convert_csv(csv_path, self.path)
+        self.assertEqual(len(load_attacks(self.path)), 4)
@@ -0,0 +1,86 @@
+import unittest
+
+from dicewars.client.ai_driver import AIDriver, BattleCommand, EndTurnCommand, TurnPlan
+from dicewars.client.game.board import Board
+
+
+class Player(object):
+    def __init__(self, name):
+        self.name = name
+
+    def get_name(self):
+        return self.name
+
+
+class Game(object):
+    """Game on four areas in a row, owned alternately by two players
+    """
+    def __init__(self):
+        areas = {str(i): {'owner': 2 - i % 2, 'dice': 5} for i in range(1, 5)}
+        board = {str(i): {'neighbours': [n for n in [i - 1, i + 1] if 1 <= n <= 4], 'hexes': []} for i in range(1, 5)}
+        self.board = Board(areas, board)
+        self.player_name = 1
+        self.players_order = [1, 2]
+        self.current_player = Player(1)
+        self.sent = []
+
+    def transmit(self, msg):
+        self.sent.append(msg)
+
+    def update_scores(self, scores):
+        pass
+
+
+def battle_result(source, target, won):
+    return {
+        'type': 'battle',
+        'result': {
+            'atk': {'name': source, 'dice': 1, 'owner': 1, 'pwr': 10},
+            'def': {'name': target, 'dice': 4 if won else 5, 'owner': 1 if won else 2, 'pwr': 5},
+        },
+        'score': {},
+    }
+
+
+class PlanningAI(object):
+    def __init__(self, player_name, board, players_order):
+        self.nb_calls = 0
+        self.outcomes = []
+
+    def ai_turn(self, board, nb_moves_this_turn, nb_turns_this_game, time_left):
+        self.nb_calls += 1
+        if nb_moves_this_turn == 0:
+            return TurnPlan([BattleCommand(1, 2), BattleCommand(3, 4), EndTurnCommand()])
+        return TurnPlan(self.generate(), replan_on_loss=False)
+
+    def generate(self):
+        self.outcomes.append((yield BattleCommand(3, 4)))
+        self.outcomes.append((yield EndTurnCommand()))
+
+
+class TurnPlanTests(unittest.TestCase):
+    def setUp(self):
+        self.game = Game()
+        self.driver = AIDriver(self.game, PlanningAI)
+
+    def test_plan_is_followed(self):
+        self.driver.make_turn()
+        self.driver.handle_server_message(battle_result(1, 2, True))
+        self.driver.make_turn()
+        self.driver.handle_server_message(battle_result(3, 4, True))
+        self.driver.make_turn()
+
+        self.assertEqual([msg['type'] for msg in self.game.sent], ['battle', 'battle', 'end_turn'])
+        self.assertEqual(self.driver.ai.nb_calls, 1)
+        self.assertIsNone(self.driver.plan)
+
+    def test_lost_battle_drops_plan(self):
+        self.driver.make_turn()
+        self.driver.handle_server_message(battle_result(1, 2, False))
+        self.driver.make_turn()
+        self.driver.handle_server_message(battle_result(3, 4, False))
+        self.driver.make_turn()
+
+        self.assertEqual(self.driver.ai.nb_calls, 2)
+        self.assertEqual(self.driver.ai.outcomes, [False])
+        self.assertEqual(self.game.sent[-1], {'type': 'end_turn'})
@@ -0,0 +1,34 @@
+import unittest
+
+from dicewars.ai.dt import wpm_c, wpm_d, wpm_s
+from dicewars.client.game.board import Board
+from dicewars.server.game.headless import LocalClient
+
+from games import play_game
+
+
+class WinProbabilityAITests(unittest.TestCase):
+    def test_game_is_finished(self):
+        clients = [
+            LocalClient('dt.wpm_c (AI)', wpm_c.AI, 1),
+            LocalClient('dt.wpm_d (AI)', wpm_d.AI, 1),
+            LocalClient('dt.wpm_s (AI)', wpm_s.AI, 1),
+        ]
+        summary = play_game(11, clients)
+        self.assertIn(summary.winner, ['dt.wpm_c (AI)', 'dt.wpm_d (AI)', 'dt.wpm_s (AI)'])
+        self.assertGreater(summary.nb_battles, 0)
+
+    def test_equal_attacks_are_scored_equally(self):
+        # a star of areas 2..9 around area 1, attacked by all of them
+        areas = {'1': {'owner': 2, 'dice': 3}}
+        board = {'1': {'neighbours': list(range(2, 10)), 'hexes': [[0, 0]]}}
+        for name in range(2, 10):
+            areas[str(name)] = {'owner': 1, 'dice': 5}
+            board[str(name)] = {'neighbours': [1], 'hexes': [[name, 0]]}
+
+        for module in [wpm_c, wpm_d]:
+            ai = module.AI(1, Board(areas, board), [1, 2])
+            ai.board = Board(areas, board)
+            turns = [turn for turn in ai.possible_turns() if turn[0] != 'end']
+            self.assertEqual([turn[0] for turn in turns], list(range(2, 10)))
+            self.assertEqual(len({turn[2] for turn in turns}), 1)
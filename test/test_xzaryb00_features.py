@@ -0,0 +1,44 @@
+import unittest
+
+import numpy
+
+from dicewars.ai.xzaryb00.utils import get_features, get_features_batch, get_features_client
+from dicewars.client.game.board import Board
+from dicewars.server.game.initialization import create_board
+
+
+def boards(nb_players, board_seed):
+    """Server and client board of the same position
+    """
+    server_board, ownership = create_board(nb_players, board_seed, board_seed + 1, board_seed + 2)
+    for name, area in server_board.areas.items():
+        area.set_owner_name(ownership[name])
+    client_board = Board(
+        {str(name): {'owner': ownership[name], 'dice': area.get_dice()} for name, area in server_board.areas.items()},
+        {str(name): area for name, area in server_board.get_board().items()},
+    )
+    return server_board, client_board
+
+
+def all_attacks(server_board):
+    return [
+        (name, adjacent.name)
+        for name, area in sorted(server_board.areas.items())
+        for adjacent in area.adjacent_areas
+        if adjacent.owner_name != area.owner_name
+    ]
+
+
+class FeaturesBatchTests(unittest.TestCase):
+    def test_batch_matches_features_of_single_attacks(self):
+        for nb_players, board_seed in [(2, 11), (3, 12), (4, 13), (8, 14)]:
+            server_board, client_board = boards(nb_players, board_seed)
+            attacks = all_attacks(server_board)
+            self.assertGreater(len(attacks), 0)
+
+            batch = get_features_batch(client_board, attacks)
+            self.assertEqual(batch.shape, (len(attacks), 21))
+            client = numpy.array([get_features_client(client_board, *attack)[0] for attack in attacks])
+            server = numpy.array([get_features(server_board, *attack)[0] for attack in attacks])
+            numpy.testing.assert_allclose(batch, client, atol=1e-12)
+            numpy.testing.assert_allclose(batch, server, atol=1e-12)